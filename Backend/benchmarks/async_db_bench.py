@@ -0,0 +1,123 @@
+"""Throughput of a sync (threadpool) vs. async (aiosqlite) read endpoint under concurrent load.
+
+Both routes run the same assignment-list query against the same SQLite file;
+requests are driven concurrently through raw ASGI calls so the only
+difference is how the handler reaches the database.
+
+Usage (from repo root):
+    python -m Backend.benchmarks.async_db_bench --requests 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=50)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="polylab-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import Session
+
+    from Backend import schemas
+    from Backend.database import Base, SessionLocal, async_engine, engine, get_async_db, get_db
+    from Backend.models import Assignment, Classroom, User
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        teacher = User(email="t@example.com", password_hash="x")
+        db.add(teacher)
+        db.flush()
+        classroom = Classroom(name="C", code="BENCH1", instructor_id=teacher.id)
+        db.add(classroom)
+        db.flush()
+        db.add_all(
+            Assignment(title=f"HW {i}", classroom_id=classroom.id) for i in range(args.rows)
+        )
+        db.commit()
+        classroom_id = classroom.id
+
+    app = FastAPI()
+
+    @app.get("/sync", response_model=list[schemas.AssignmentOut])
+    def sync_list(db: Session = Depends(get_db)):
+        return db.scalars(
+            select(Assignment)
+            .where(Assignment.classroom_id == classroom_id)
+            .order_by(Assignment.created_at.desc())
+        ).all()
+
+    @app.get("/async", response_model=list[schemas.AssignmentOut])
+    async def async_list(db: AsyncSession = Depends(get_async_db)):
+        result = await db.scalars(
+            select(Assignment)
+            .where(Assignment.classroom_id == classroom_id)
+            .order_by(Assignment.created_at.desc())
+        )
+        return result.all()
+
+    async def call(path: str) -> float:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 5000),
+            "server": ("bench", 80),
+        }
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            pass
+
+        start = time.perf_counter()
+        await app(scope, receive, send)
+        return time.perf_counter() - start
+
+    async def load(path: str) -> tuple[float, float, float]:
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one() -> float:
+            async with semaphore:
+                return await call(path)
+
+        await asyncio.gather(*(one() for _ in range(100)))  # warm pools
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - start
+        p50 = statistics.median(latencies) * 1000
+        p95 = statistics.quantiles(latencies, n=20)[-1] * 1000
+        return args.requests / elapsed, p50, p95
+
+    async def run() -> None:
+        print(f"{args.requests} requests, concurrency {args.concurrency}, {args.rows} rows each")
+        for label, path in (("sync + threadpool", "/sync"), ("async + aiosqlite", "/async")):
+            rps, p50, p95 = await load(path)
+            print(f"{label:<18} {rps:8.0f} req/s   p50 {p50:7.1f} ms   p95 {p95:7.1f} ms")
+        await async_engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Query plans and latency of the hot list queries before and after migration 0004.
+
+Builds a synthetic SQLite database (1M submissions by default) at schema
+version 3, times each list query and records its EXPLAIN QUERY PLAN, then
+applies the index migration and repeats.
+
+Usage (from repo root):
+    python -m Backend.benchmarks.index_plan_bench --submissions 1000000
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.engine import Connection
+
+from Backend import models
+from Backend.migrations import upgrade
+
+INDEX_MIGRATION = 4
+NOW = datetime(2025, 1, 1)
+
+
+def ts(minutes_ago: int) -> datetime:
+    return NOW - timedelta(minutes=minutes_ago)
+
+
+def _seed(conn: Connection, submissions: int) -> None:
+    rng = random.Random(0)
+    users = max(submissions // 50, 100)
+    classrooms = max(submissions // 2000, 10)
+    assignments = classrooms * 10
+    inserts = {
+        "users (id, email, password_hash, role, totp_enabled)": [
+            (i, f"u{i}@example.com", "x", "student", 0) for i in range(1, users + 1)
+        ],
+        "classrooms (id, name, code, instructor_id, created_at)": [
+            (i, f"C{i}", f"CODE{i}", 1, ts(i)) for i in range(1, classrooms + 1)
+        ],
+        "assignments (id, title, classroom_id, created_at)": [
+            (i, f"A{i}", rng.randint(1, classrooms), ts(i)) for i in range(1, assignments + 1)
+        ],
+        "materials (id, title, classroom_id, created_at)": [
+            (i, f"M{i}", rng.randint(1, classrooms), ts(i)) for i in range(1, assignments + 1)
+        ],
+        "quizzes (id, title, classroom_id, created_at)": [
+            (i, f"Q{i}", rng.randint(1, classrooms), ts(i)) for i in range(1, assignments // 2 + 1)
+        ],
+        "classroom_members (classroom_id, user_id, joined_at)": [
+            (c, u, NOW) for u in range(1, users + 1) for c in rng.sample(range(1, classrooms + 1), 5)
+        ],
+        "sessions (id, user_id, created_at, expires_at)": [
+            (f"s{i}", rng.randint(1, users), NOW, ts(-rng.randint(-600, 600)))
+            for i in range(users * 2)
+        ],
+        "tokens (user_id, token_hash, purpose, expires_at)": [
+            (rng.randint(1, users), f"h{i}", "verify", ts(-rng.randint(-600, 600)))
+            for i in range(users * 2)
+        ],
+        "instructor_requests (user_id, file_path, status, created_at)": [
+            (rng.randint(1, users), "x.pdf", rng.choice(("pending", "approved", "rejected")), ts(i))
+            for i in range(users // 2)
+        ],
+        "submissions (user_id, assignment_id, content, submitted_at)": [
+            (rng.randint(1, users), rng.randint(1, assignments), "answer", ts(i))
+            for i in range(submissions)
+        ],
+    }
+    for target, rows in inserts.items():
+        placeholders = ", ".join("?" * len(rows[0]))
+        conn.exec_driver_sql(f"INSERT INTO {target} VALUES ({placeholders})", rows)
+    conn.commit()
+
+
+def _queries() -> dict:
+    classroom_id, assignment_id, user_id = 3, 7, 42
+    return {
+        "submissions by assignment": select(models.Submission)
+        .where(models.Submission.assignment_id == assignment_id)
+        .order_by(models.Submission.submitted_at.desc()),
+        "submissions by user": select(models.Submission)
+        .where(models.Submission.user_id == user_id),
+        "assignments by classroom": select(models.Assignment)
+        .where(models.Assignment.classroom_id == classroom_id)
+        .order_by(models.Assignment.created_at.desc()),
+        "materials by classroom": select(models.Material)
+        .where(models.Material.classroom_id == classroom_id)
+        .order_by(models.Material.created_at.desc()),
+        "memberships by user": select(models.ClassroomMember.classroom_id)
+        .where(models.ClassroomMember.user_id == user_id),
+        "quizzes by classroom": select(models.Quiz)
+        .where(models.Quiz.classroom_id == classroom_id),
+        "live sessions by user": select(models.Session.id)
+        .where(models.Session.user_id == user_id, models.Session.expires_at > NOW),
+        "expired tokens": select(models.Token.id)
+        .where(models.Token.expires_at < NOW - timedelta(hours=9)).limit(500),
+        "pending instructor requests": select(models.InstructorRequest)
+        .where(models.InstructorRequest.status == "pending")
+        .order_by(models.InstructorRequest.created_at.desc()),
+    }
+
+
+def measure(conn: Connection, stmt, rounds: int) -> tuple[float, str]:
+    compiled = stmt.compile(conn)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        conn.execute(stmt).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), "; ".join(row[-1] for row in plan)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submissions", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    path = Path(tempfile.mkdtemp(prefix="polylab-bench-")) / "index.db"
+    engine = create_engine(f"sqlite:///{path}")
+    upgrade(engine, target=INDEX_MIGRATION - 1)
+    start = time.perf_counter()
+    with engine.connect() as conn:
+        _seed(conn, args.submissions)
+    print(f"Seeded {args.submissions} submissions in {time.perf_counter() - start:.1f}s ({path})")
+
+    queries = _queries()
+    with engine.connect() as conn:
+        before = {name: measure(conn, stmt, args.rounds) for name, stmt in queries.items()}
+    start = time.perf_counter()
+    upgrade(engine, target=INDEX_MIGRATION)
+    print(f"Migration {INDEX_MIGRATION:04d} took {time.perf_counter() - start:.1f}s")
+    with engine.connect() as conn:
+        after = {name: measure(conn, stmt, args.rounds) for name, stmt in queries.items()}
+
+    for name in queries:
+        (old_ms, old_plan), (new_ms, new_plan) = before[name], after[name]
+        print(f"\n{name}: {old_ms:.2f} ms -> {new_ms:.2f} ms")
+        print(f"  before: {old_plan}")
+        print(f"  after:  {new_plan}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
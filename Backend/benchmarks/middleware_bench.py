@@ -0,0 +1,120 @@
+"""Per-request overhead of the old BaseHTTPMiddleware stack vs SecurityMiddleware.
+
+Both apps expose the same /health and JSON GET routes and are driven through
+raw ASGI calls, so the numbers isolate middleware cost from HTTP parsing.
+
+Usage (from repo root):
+    python -m Backend.benchmarks.middleware_bench --requests 5000
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from Backend.core.csrf import csrf_protect
+from Backend.core.ratelimit import GcraLimiter
+from Backend.middleware import security
+from Backend.middleware.security import SecurityMiddleware, security_headers
+
+ROWS = [{"id": i, "title": f"Assignment {i}", "classroom_id": 1} for i in range(20)]
+
+
+def _routes(app: FastAPI) -> FastAPI:
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    @app.get("/assignments/classroom/1")
+    def assignments():
+        return ROWS
+
+    return app
+
+
+def legacy_app(limiter: GcraLimiter) -> FastAPI:
+    app = _routes(FastAPI())
+    headers = [(k.decode(), v.decode()) for k, v in security_headers()]
+
+    class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            response = await call_next(request)
+            for key, value in headers:
+                response.headers[key] = value
+            return response
+
+    app.add_middleware(SecurityHeadersMiddleware)
+
+    @app.middleware("http")
+    async def _rate_limit(request, call_next):
+        if limiter.hit(request.client.host if request.client else "unknown") > 0:
+            return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded"})
+        return await call_next(request)
+
+    @app.middleware("http")
+    async def _csrf(request, call_next):
+        if request.method in ("GET", "HEAD", "OPTIONS"):
+            return await call_next(request)
+        try:
+            csrf_protect(request)
+        except HTTPException as exc:
+            return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+        return await call_next(request)
+
+    return app
+
+
+def new_app() -> FastAPI:
+    app = _routes(FastAPI())
+    app.add_middleware(SecurityMiddleware)
+    return app
+
+
+async def drive(app, path: str, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 5000),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) * 1e6 / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    unlimited = GcraLimiter(limit=10**9, window=60, max_keys=10)
+    security.limiter = unlimited
+    apps = (("BaseHTTPMiddleware stack", legacy_app(unlimited)), ("pure ASGI", new_app()))
+    for path in ("/health", "/assignments/classroom/1"):
+        for label, app in apps:
+            us = asyncio.run(drive(app, path, args.requests))
+            print(f"{path:<26} {label:<26} {us:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
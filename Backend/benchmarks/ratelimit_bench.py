@@ -0,0 +1,69 @@
+"""Compare the old deque-per-IP limiter with the GCRA limiter.
+
+Usage (from repo root):
+    python -m Backend.benchmarks.ratelimit_bench --clients 5000 --hits 100
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections import defaultdict, deque
+
+from Backend.core.ratelimit import GcraLimiter
+
+LIMIT = 120
+WINDOW = 60
+
+
+class DequeLimiter:
+    """The previous implementation: every timestamp kept per client, never evicted."""
+
+    def __init__(self) -> None:
+        self._buckets: dict[str, deque[float]] = defaultdict(deque)
+
+    def hit(self, key: str, cost: int = 1, now: float | None = None) -> float:
+        dq = self._buckets[key]
+        while dq and now - dq[0] > WINDOW:
+            dq.popleft()
+        dq.append(now)
+        return 1.0 if len(dq) > LIMIT else 0.0
+
+
+def drive(limiter, keys: list[str], hits: int) -> None:
+    now = 0.0
+    for _ in range(hits):
+        for key in keys:
+            limiter.hit(key, 1, now)
+        now += 0.25
+
+
+def run(make_limiter, clients: int, hits: int) -> tuple[float, int]:
+    keys = [f"10.0.{i // 256}.{i % 256}" for i in range(clients)]
+    start = time.perf_counter()
+    drive(make_limiter(), keys, hits)
+    elapsed = time.perf_counter() - start
+    # Memory is measured on a separate run; tracemalloc skews timings.
+    tracemalloc.start()
+    limiter = make_limiter()
+    drive(limiter, keys, hits)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed * 1e9 / (clients * hits), retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--hits", type=int, default=100)
+    args = parser.parse_args()
+    cases = (
+        ("deque per IP (old)", DequeLimiter),
+        ("GCRA + LRU (new)", lambda: GcraLimiter(LIMIT, WINDOW, max_keys=args.clients)),
+    )
+    for label, make_limiter in cases:
+        ns, retained = run(make_limiter, args.clients, args.hits)
+        print(f"{label:<20} {ns:7.0f} ns/hit  state {retained / 1024 / 1024:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
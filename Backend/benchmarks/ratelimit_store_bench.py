@@ -0,0 +1,65 @@
+"""Per-request overhead of the rate-limit stores, and cross-worker accuracy.
+
+Usage (from repo root):
+    python -m Backend.benchmarks.ratelimit_store_bench --hits 20000 --workers 4
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from Backend.core.ratelimit import GcraLimiter, SqliteGcraLimiter
+
+LIMIT = 120
+WINDOW = 60
+
+
+def overhead_ns(limiter, hits: int) -> float:
+    keys = [f"10.0.0.{i % 200}" for i in range(hits)]
+    start = time.perf_counter()
+    for key in keys:
+        limiter.hit(key)
+    return (time.perf_counter() - start) * 1e9 / hits
+
+
+def _worker(path: str, attempts: int, results) -> None:
+    limiter = SqliteGcraLimiter(path, limit=LIMIT, window=WINDOW)
+    allowed = sum(1 for _ in range(attempts) if limiter.hit("shared-ip") == 0)
+    results.put(allowed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hits", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    tmp = Path(tempfile.mkdtemp(prefix="polylab-bench-"))
+
+    memory = GcraLimiter(LIMIT, WINDOW, max_keys=100000)
+    sqlite = SqliteGcraLimiter(str(tmp / "overhead.db"), LIMIT, WINDOW)
+    print(f"memory store  {overhead_ns(memory, args.hits):9.0f} ns/request")
+    print(f"sqlite store  {overhead_ns(sqlite, args.hits):9.0f} ns/request")
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    path = str(tmp / "shared.db")
+    SqliteGcraLimiter(path, LIMIT, WINDOW).hit("warmup")
+    procs = [
+        ctx.Process(target=_worker, args=(path, LIMIT, results))
+        for _ in range(args.workers)
+    ]
+    for proc in procs:
+        proc.start()
+    allowed = sum(results.get() for _ in procs)
+    for proc in procs:
+        proc.join()
+    print(
+        f"{args.workers} workers x {LIMIT} requests from one IP: {allowed} allowed "
+        f"(limit {LIMIT}; a per-process store would allow {LIMIT * args.workers})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Concurrent write throughput on SQLite with default vs. tuned connection pragmas.
+
+Simulates a submission deadline: writer threads each insert submissions in
+their own short transactions while reader threads list them.
+
+Usage (from repo root):
+    python -m Backend.benchmarks.sqlite_write_bench --writers 8 --writes 200
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from Backend.database import Base, apply_sqlite_pragmas, sqlite_pragmas
+from Backend.models import Assignment, Classroom, Submission, User
+
+
+def _seed(engine, students: int) -> tuple[int, list[int]]:
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        teacher = User(email="t@example.com", password_hash="x")
+        db.add(teacher)
+        db.flush()
+        classroom = Classroom(name="C", code="BENCH1", instructor_id=teacher.id)
+        db.add(classroom)
+        db.flush()
+        assignment = Assignment(title="HW", classroom_id=classroom.id)
+        users = [User(email=f"s{i}@example.com", password_hash="x") for i in range(students)]
+        db.add_all([assignment, *users])
+        db.commit()
+        return assignment.id, [u.id for u in users]
+    finally:
+        db.close()
+
+
+def run(engine, writers: int, writes: int, readers: int) -> dict:
+    assignment_id, user_ids = _seed(engine, writers)
+    Session = sessionmaker(bind=engine)
+    errors = 0
+    reads = 0
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def writer(user_id: int) -> None:
+        nonlocal errors
+        for i in range(writes):
+            db = Session()
+            try:
+                db.add(Submission(user_id=user_id, assignment_id=assignment_id, content=f"v{i}"))
+                db.commit()
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    errors += 1
+            finally:
+                db.close()
+
+    def reader() -> None:
+        nonlocal reads
+        while not done.is_set():
+            db = Session()
+            try:
+                db.execute(
+                    select(Submission.id, Submission.user_id)
+                    .where(Submission.assignment_id == assignment_id)
+                    .order_by(Submission.id.desc())
+                    .limit(50)
+                ).all()
+                with lock:
+                    reads += 1
+            except OperationalError:
+                with lock:
+                    errors += 1
+            finally:
+                db.close()
+
+    read_threads = [threading.Thread(target=reader) for _ in range(readers)]
+    write_threads = [threading.Thread(target=writer, args=(uid,)) for uid in user_ids]
+    for t in read_threads:
+        t.start()
+    start = time.perf_counter()
+    for t in write_threads:
+        t.start()
+    for t in write_threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    for t in read_threads:
+        t.join()
+
+    with Session() as db:
+        committed = db.scalar(select(func.count(Submission.id)))
+    return {
+        "committed": committed,
+        "errors": errors,
+        "writes_per_s": committed / elapsed,
+        "reads_per_s": reads / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--readers", type=int, default=2)
+    args = parser.parse_args()
+    tmp = Path(tempfile.mkdtemp(prefix="polylab-bench-"))
+
+    for label, tuned in (("default pragmas", False), ("tuned pragmas", True)):
+        engine = create_engine(
+            f"sqlite:///{tmp / f'{label[0]}.db'}",
+            connect_args={"check_same_thread": False},
+            pool_size=args.writers + args.readers,
+        )
+        if tuned:
+            apply_sqlite_pragmas(engine, sqlite_pragmas())
+        result = run(engine, args.writers, args.writes, args.readers)
+        engine.dispose()
+        print(
+            f"{label:<16} {result['writes_per_s']:8.0f} commits/s  "
+            f"{result['reads_per_s']:8.0f} reads/s  "
+            f"{result['committed']:>6} committed  {result['errors']:>4} lock errors"
+        )
+
+
+if __name__ == "__main__":
+    main()
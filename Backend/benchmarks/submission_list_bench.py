@@ -0,0 +1,119 @@
+"""Time and peak memory of building a classroom submission listing.
+
+Compares the previous read path (ORM entities with the user eager-loaded,
+validated into SubmissionOut, dumped, rebuilt as SubmissionWithUser and
+validated again as the response model) with the current one (a Core select
+of plain rows, built once and serialized by a prebuilt TypeAdapter).
+
+Usage (from repo root):
+    python -m Backend.benchmarks.submission_list_bench --rows 10000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="polylab-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+
+    from pydantic import TypeAdapter
+    from sqlalchemy import select
+    from sqlalchemy.orm import contains_eager
+
+    from Backend import models, schemas
+    from Backend.database import SessionLocal, engine
+    from Backend.migrations import upgrade
+    from Backend.routers.submission import (
+        _public_content,
+        _submission_list_response,
+        _submission_rows,
+    )
+
+    upgrade(engine)
+    students = 200
+    with SessionLocal() as db:
+        teacher = models.User(email="t@example.com", password_hash="x")
+        db.add(teacher)
+        db.flush()
+        classroom = models.Classroom(name="C", code="BENCH1", instructor_id=teacher.id)
+        db.add(classroom)
+        db.flush()
+        users = [models.User(email=f"s{i}@example.com", password_hash="x") for i in range(students)]
+        assignments = [
+            models.Assignment(title=f"HW{i}", classroom_id=classroom.id)
+            for i in range(max(args.rows // students, 1))
+        ]
+        db.add_all([*users, *assignments])
+        db.flush()
+        db.add_all(
+            models.Submission(
+                user_id=users[i % students].id,
+                assignment_id=assignments[i // students % len(assignments)].id,
+                content=f"/uploads/submissions/file{i}.pdf",
+            )
+            for i in range(args.rows)
+        )
+        db.commit()
+        classroom_id = classroom.id
+
+    response_adapter = TypeAdapter(list[schemas.SubmissionWithUser])
+
+    def previous() -> bytes:
+        with SessionLocal() as db:
+            submissions = db.scalars(
+                select(models.Submission)
+                .join(models.Assignment)
+                .join(models.User, models.Submission.user_id == models.User.id)
+                .options(contains_eager(models.Submission.user))
+                .where(models.Assignment.classroom_id == classroom_id)
+                .order_by(models.Submission.assignment_id, models.Submission.submitted_at.desc())
+            ).all()
+            items = []
+            for sub in submissions:
+                data = schemas.SubmissionOut.model_validate(sub, from_attributes=True).model_dump()
+                data["content"] = _public_content(data["content"])
+                items.append(schemas.SubmissionWithUser(**data, user_email=sub.user.email))
+            # FastAPI validates the return value against response_model again.
+            return response_adapter.dump_json(response_adapter.validate_python(items))
+
+    def current() -> bytes:
+        with SessionLocal() as db:
+            rows = db.execute(
+                _submission_rows()
+                .join(models.Assignment)
+                .where(models.Assignment.classroom_id == classroom_id)
+                .order_by(models.Submission.assignment_id, models.Submission.submitted_at.desc())
+            )
+            return _submission_list_response(rows).body
+
+    assert len(previous()) == len(current())
+    print(f"{args.rows} submissions, median of {args.rounds} rounds:")
+    for name, build in (("previous", previous), ("current", current)):
+        samples = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            build()
+            samples.append(time.perf_counter() - start)
+        tracemalloc.start()
+        build()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            f"  {name:<8} {statistics.median(samples) * 1000:8.1f} ms"
+            f"   peak {peak / 2**20:6.1f} MiB"
+        )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare the old three-round-trip token consumption with the atomic one.
+
+Usage (from repo root):
+    python -m Backend.benchmarks.token_consume_bench --tokens 2000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=2000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="polylab-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+
+    from sqlalchemy import Column, DateTime, Integer, String, event
+
+    from Backend.database import Base, SessionLocal, engine
+    from Backend.models import Token, User
+    from Backend.utils.tokens import consume_token, hash_token
+
+    class LegacyToken(Base):
+        __tablename__ = "legacy_tokens"
+
+        id = Column(Integer, primary_key=True, index=True)
+        user_id = Column(Integer, nullable=False)
+        token = Column(String, unique=True, index=True, nullable=False)
+        purpose = Column(String, nullable=False)
+        expires_at = Column(DateTime, nullable=False)
+
+    def legacy_consume(db, token, purpose):
+        row = (
+            db.query(LegacyToken)
+            .filter(LegacyToken.token == token, LegacyToken.purpose == purpose)
+            .first()
+        )
+        if not row or row.expires_at < datetime.utcnow():
+            return None
+        user = db.query(User).filter(User.id == row.user_id).first()
+        db.delete(row)
+        db.commit()
+        return user
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(email="bench@example.com", password_hash="x", email_verified=True)
+    db.add(user)
+    db.commit()
+    expires = datetime.utcnow() + timedelta(hours=1)
+    values = [f"bench-token-{i}" for i in range(args.tokens)]
+    db.add_all(
+        LegacyToken(user_id=user.id, token=v, purpose="verify", expires_at=expires)
+        for v in values
+    )
+    db.add_all(
+        Token(user_id=user.id, token_hash=hash_token(v), purpose="verify", expires_at=expires)
+        for v in values
+    )
+    db.commit()
+    db.close()
+
+    statements = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements[0] += 1
+
+    cases = (
+        ("legacy select/select/delete", legacy_consume),
+        ("atomic delete-returning", consume_token),
+    )
+    for label, fn in cases:
+        db = SessionLocal()
+        statements[0] = 0
+        start = time.perf_counter()
+        for v in values:
+            db.expunge_all()
+            user = fn(db, v, "verify")
+            # Callers read the user right away (e.g. to set email_verified)
+            assert user.email
+        elapsed = time.perf_counter() - start
+        db.close()
+        print(
+            f"{label:<28} {elapsed * 1e6 / len(values):8.1f} us/token  "
+            f"{statements[0] / len(values):.1f} statements/token"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models import Classroom, ClassroomMember, UserRole
+from .config import settings
+
+
+class AclCache:
+    """Bounded LRU cache of user id -> {classroom id: role in that classroom}.
+
+    A user's whole map is loaded in one query on the first check and then
+    answers every classroom check without touching the database. Only
+    grants are trusted: a classroom missing from the map is re-read before
+    access is denied, so a join or new classroom seen by another worker
+    process is never refused. Joins, classroom creation and role changes
+    also drop the affected user's map in this process.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[int, tuple[float, dict[int, UserRole]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int) -> dict[int, UserRole] | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, roles = entry
+            if now - stored_at > self.ttl_seconds:
+                del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return roles
+
+    def put(self, user_id: int, roles: dict[int, UserRole]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._entries[user_id] = (time.monotonic(), roles)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+acl_cache = AclCache(
+    max_entries=settings.ACL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ACL_CACHE_TTL_SECONDS,
+)
+
+
+def _roles_query(user_id: int):
+    # Owned and joined classrooms in one round trip; owners are usually members too.
+    return (
+        select(Classroom.id, Classroom.instructor_id)
+        .outerjoin(
+            ClassroomMember,
+            (ClassroomMember.classroom_id == Classroom.id)
+            & (ClassroomMember.user_id == user_id),
+        )
+        .where(or_(Classroom.instructor_id == user_id, ClassroomMember.id.is_not(None)))
+    )
+
+
+def _roles(rows, user_id: int) -> dict[int, UserRole]:
+    return {
+        classroom_id: UserRole.instructor if instructor_id == user_id else UserRole.student
+        for classroom_id, instructor_id in rows
+    }
+
+
+def _denied(classroom_exists: bool) -> HTTPException:
+    if not classroom_exists:
+        return HTTPException(status_code=404, detail="Classroom not found")
+    return HTTPException(status_code=403, detail="You are not enrolled in this class")
+
+
+def classroom_role(db: Session, classroom_id: int, user) -> UserRole:
+    """The caller's role in the classroom: admin, instructor (owner) or student.
+
+    Raises 404 for an unknown classroom and 403 when the caller is neither
+    its owner nor a member. Only the first check per user (per TTL) and
+    denials hit the database.
+    """
+    if user.role == UserRole.admin:
+        return UserRole.admin
+    roles = acl_cache.get(user.id)
+    if roles is None or classroom_id not in roles:
+        roles = _roles(db.execute(_roles_query(user.id)), user.id)
+        acl_cache.put(user.id, roles)
+    role = roles.get(classroom_id)
+    if role is None:
+        exists = db.scalar(select(Classroom.id).where(Classroom.id == classroom_id))
+        raise _denied(exists is not None)
+    return role
+
+
+async def classroom_role_async(db: AsyncSession, classroom_id: int, user) -> UserRole:
+    """Async twin of :func:`classroom_role` for ``get_async_db`` routes."""
+    if user.role == UserRole.admin:
+        return UserRole.admin
+    roles = acl_cache.get(user.id)
+    if roles is None or classroom_id not in roles:
+        roles = _roles(await db.execute(_roles_query(user.id)), user.id)
+        acl_cache.put(user.id, roles)
+    role = roles.get(classroom_id)
+    if role is None:
+        exists = await db.scalar(select(Classroom.id).where(Classroom.id == classroom_id))
+        raise _denied(exists is not None)
+    return role
@@ -0,0 +1,41 @@
+import abc
+import asyncio
+
+
+class PeriodicTask(abc.ABC):
+    """Runs ``run_once`` in a worker thread every ``interval_seconds``.
+
+    Started and stopped from the app lifespan; ``interval_seconds <= 0``
+    disables the task.
+    """
+
+    name = "periodic task"
+
+    def __init__(self, interval_seconds: float) -> None:
+        self.interval_seconds = interval_seconds
+        self._task: asyncio.Task | None = None
+
+    @abc.abstractmethod
+    def run_once(self):
+        """One blocking pass; called from a worker thread."""
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as exc:  # keep running on transient DB errors
+                print(f"[WARN] {self.name} failed: {exc}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None and self.interval_seconds > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
@@ -1,9 +1,13 @@
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import EmailStr
+from pydantic import EmailStr, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+DEFAULT_SECRET_KEY = "change-me"
+# HMAC-SHA256 key floor for signed session cookies
+MIN_SECRET_KEY_BYTES = 32
+
 
 class Settings(BaseSettings):
     # App
@@ -12,13 +16,74 @@ class Settings(BaseSettings):
     BACKEND_BASE_URL: str = "http://127.0.0.1:8000"
 
     # Security / Sessions
-    SECRET_KEY: str = "change-me"
+    SECRET_KEY: str = DEFAULT_SECRET_KEY
     SESSION_COOKIE_NAME: str = "session_id"
     SESSION_TTL_MINUTES: int = 120
+    # "db" keeps a row per session; "signed" uses HMAC-signed stateless cookies
+    SESSION_MODE: Literal["db", "signed"] = "db"
+    # Per-process cache in front of the shared signed-session denylist; a
+    # revocation reaches other workers within this many seconds
+    REVOCATION_CACHE_TTL_SECONDS: int = 5
+    REVOCATION_CACHE_MAX_ENTRIES: int = 10000
+    # Sliding expiry for "db" sessions; extensions are flushed in batches
+    SESSION_SLIDING: bool = True
+    SESSION_FLUSH_INTERVAL_SECONDS: int = 30
     CSRF_COOKIE_NAME: str = "csrf_token"
+    SESSION_CACHE_TTL_SECONDS: int = 30
+    SESSION_CACHE_MAX_ENTRIES: int = 10000
+    # Per-process cache of user -> {classroom: role} for classroom access checks
+    ACL_CACHE_TTL_SECONDS: int = 60
+    ACL_CACHE_MAX_ENTRIES: int = 10000
+
+    # Password hashing (argon2 runs in a dedicated process pool; 0 = inline)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_DEPTH: int = 16
+    # argon2 parameters; unset keeps passlib defaults (see Backend/tools/tune_argon2.py)
+    ARGON2_TIME_COST: Optional[int] = None
+    ARGON2_MEMORY_COST: Optional[int] = None  # KiB
+    ARGON2_PARALLELISM: Optional[int] = None
+
+    # Background cleanup of expired sessions/tokens (0 disables)
+    SWEEP_INTERVAL_SECONDS: int = 300
+    SWEEP_BATCH_SIZE: int = 500
+
+    # Login brute-force guard (in-memory, per process)
+    LOGIN_GUARD_MAX_KEYS: int = 50000
+    LOGIN_GUARD_ACCOUNT_THRESHOLD: int = 5
+    LOGIN_GUARD_IP_THRESHOLD: int = 20
+    LOGIN_GUARD_BASE_DELAY_SECONDS: float = 1.0
+    LOGIN_GUARD_MAX_DELAY_SECONDS: float = 900.0
+    LOGIN_GUARD_HALF_LIFE_SECONDS: float = 600.0
+
+    # Keyset-paginated listings (opt-in): page size for a cursor sent without
+    # `limit`, and the cap on `limit`
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 500
 
     # Database
     DATABASE_URL: str = "sqlite:///./polylab.db"
+    # Apply pending migrations when the app starts; turn off when migrations
+    # run as a deploy step (`python -m Backend.migrations upgrade`).
+    MIGRATE_ON_STARTUP: bool = True
+    # SQLite connection pragmas, applied to every pooled connection.
+    # cache_size < 0 is KiB (SQLite convention), > 0 is pages.
+    SQLITE_JOURNAL_MODE: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY"] = "WAL"
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268_435_456
+    SQLITE_CACHE_SIZE: int = -65_536
+    SQLITE_TEMP_STORE: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    # Sync SQLite pool: sized to Starlette's 40-thread pool, plus a bounded
+    # overflow for handlers still waiting on their get_db teardown
+    SQLITE_POOL_SIZE: int = 40
+    SQLITE_MAX_OVERFLOW: int = 40
+    # Connection pool for server databases (ignored for SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Seconds to wait for a free connection (SQLite pool too) before failing
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
 
     # Networking
     FRONTEND_ORIGIN: str = "http://localhost:5173"
@@ -31,6 +96,19 @@ class Settings(BaseSettings):
     ]
     HSTS_ENABLED: bool = False
     RATE_LIMIT_PER_MINUTE: int = 120
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    # "memory" is per process; "sqlite" shares limits across --workers on one host
+    RATE_LIMIT_BACKEND: Literal["memory", "sqlite"] = "memory"
+    RATE_LIMIT_SQLITE_PATH: str = "./ratelimit.db"
+
+    # Diagnostics: statements repeated this many times in one request are
+    # reported as N+1 suspects (0 disables)
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+    # Queries slower than this are written to a rotating JSONL log (0 disables)
+    SLOW_QUERY_MS: float = 200.0
+    SLOW_QUERY_LOG_PATH: str = "./slow_queries.jsonl"
+    SLOW_QUERY_LOG_MAX_BYTES: int = 5_000_000
+    SLOW_QUERY_LOG_BACKUPS: int = 3
 
     # Files
     UPLOAD_DIR: str = "./uploads"
@@ -46,6 +124,31 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     MAIL_FROM: Optional[EmailStr] = None
 
+    @model_validator(mode="after")
+    def _check_session_flush(self) -> "Settings":
+        # Sliding expiry only reaches the DB through the periodic flush; with
+        # no flush task, recorded activity would pile up in memory forever.
+        if self.SESSION_SLIDING and self.SESSION_FLUSH_INTERVAL_SECONDS <= 0:
+            raise ValueError(
+                "SESSION_FLUSH_INTERVAL_SECONDS must be > 0 while SESSION_SLIDING is on; "
+                "set SESSION_SLIDING=false to turn sliding expiry off"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def _check_secret_key(self) -> "Settings":
+        # Signed cookies are trusted without a DB lookup, so a guessable key
+        # lets any client mint a session for any user and role.
+        if self.SESSION_MODE == "signed" and (
+            self.SECRET_KEY == DEFAULT_SECRET_KEY
+            or len(self.SECRET_KEY.encode()) < MIN_SECRET_KEY_BYTES
+        ):
+            raise ValueError(
+                f"SESSION_MODE=signed needs a random SECRET_KEY of at least "
+                f"{MIN_SECRET_KEY_BYTES} bytes, not the default"
+            )
+        return self
+
     model_config = SettingsConfigDict(
         env_file=str(Path(__file__).resolve().parents[2] / ".env"),
         extra="ignore",
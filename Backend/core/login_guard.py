@@ -0,0 +1,109 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException, status
+
+from .config import settings
+
+
+class FailureTracker:
+    """Bounded, decaying failure counters with exponential backoff.
+
+    Each key holds a failure score that halves every ``half_life`` seconds.
+    The block is decided when a failure is recorded: once the failures add up
+    to more than ``threshold - 1`` (so the threshold-th failure blocks unless
+    earlier ones have decayed by a whole failure), the key is blocked for
+    ``base_delay * 2 ** (failures - threshold)`` seconds (capped at
+    ``max_delay``), where ``failures`` is the score rounded up. The least
+    recently touched keys are evicted first.
+    """
+
+    def __init__(
+        self,
+        max_keys: int,
+        threshold: int,
+        base_delay: float,
+        max_delay: float,
+        half_life: float,
+    ) -> None:
+        self.max_keys = max_keys
+        self.threshold = threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.half_life = half_life
+        # key -> (score, last failure, blocked until)
+        self._entries: OrderedDict[str, tuple[float, float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def retry_after(self, key: str, now: float | None = None) -> float:
+        """Seconds the key must still wait, or 0 if it may try now."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return 0.0
+        return max(entry[2] - now, 0.0)
+
+    def record_failure(self, key: str, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            score = (self._decayed(entry, now) if entry else 0.0) + 1
+            blocked_until = entry[2] if entry else 0.0
+            failures = math.ceil(score)
+            if failures >= self.threshold:
+                delay = min(self.base_delay * 2 ** (failures - self.threshold), self.max_delay)
+                blocked_until = max(blocked_until, now + delay)
+            self._entries[key] = (score, now, blocked_until)
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _decayed(self, entry: tuple[float, float, float], now: float) -> float:
+        score, last, _ = entry
+        return score * math.pow(0.5, (now - last) / self.half_life)
+
+
+def _tracker(threshold: int) -> FailureTracker:
+    return FailureTracker(
+        max_keys=settings.LOGIN_GUARD_MAX_KEYS,
+        threshold=threshold,
+        base_delay=settings.LOGIN_GUARD_BASE_DELAY_SECONDS,
+        max_delay=settings.LOGIN_GUARD_MAX_DELAY_SECONDS,
+        half_life=settings.LOGIN_GUARD_HALF_LIFE_SECONDS,
+    )
+
+
+account_failures = _tracker(settings.LOGIN_GUARD_ACCOUNT_THRESHOLD)
+ip_failures = _tracker(settings.LOGIN_GUARD_IP_THRESHOLD)
+
+
+def check_login_allowed(email: str, client_ip: str) -> None:
+    """Reject throttled accounts/IPs before any DB lookup or hashing."""
+    wait = max(
+        account_failures.retry_after(email.lower()),
+        ip_failures.retry_after(client_ip),
+    )
+    if wait > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts, try again later",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+
+
+def record_login_failure(email: str, client_ip: str) -> None:
+    account_failures.record_failure(email.lower())
+    ip_failures.record_failure(client_ip)
+
+
+def record_login_success(email: str) -> None:
+    account_failures.reset(email.lower())
@@ -0,0 +1,245 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+from .passwords import password_service
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency buckets; +Inf is implicit.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route label for requests that never reached a route (404s, middleware rejections).
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestStats:
+    """DB work done on behalf of the current request."""
+
+    __slots__ = ("scope", "queries", "db_seconds", "statements")
+
+    def __init__(self, scope: dict | None = None) -> None:
+        self.scope = scope
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements: dict[str, int] = {}
+
+    @property
+    def route(self) -> str:
+        """Route template once routing has happened, else the raw path."""
+        if self.scope is None:
+            return UNMATCHED_ROUTE
+        route = self.scope.get("route")
+        return route.path if route is not None else self.scope.get("path", UNMATCHED_ROUTE)
+
+    def repeated_statements(self, threshold: int) -> dict[str, int]:
+        """Statements run at least ``threshold`` times: likely N+1 lazy loads."""
+        if threshold <= 0:
+            return {}
+        return {sql: n for sql, n in self.statements.items() if n >= threshold}
+
+
+# Set by the middleware for the duration of a request. Sync endpoints and
+# dependencies run in a threadpool with a copy of the context, so they see
+# (and mutate) the same RequestStats object.
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+class Histogram:
+    """Fixed-bucket histogram: one int per bucket plus a running sum."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RouteMetrics:
+    __slots__ = ("latency", "db_seconds", "db_queries", "n_plus_one")
+
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.db_seconds = 0.0
+        self.db_queries = 0
+        self.n_plus_one = 0
+
+
+class Metrics:
+    """Process-wide request and query counters rendered in Prometheus text format.
+
+    Recording a request is a dict lookup and a bisect under a lock, cheap
+    enough to stay on in production. Series are keyed by route template
+    (``/classrooms/{classroom_id}``), never the raw path, so the number of
+    series is bounded by the route table.
+    """
+
+    def __init__(self, n_plus_one_threshold: int) -> None:
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._lock = threading.Lock()
+        self._routes: dict[tuple[str, str, int], RouteMetrics] = {}
+        self.in_flight = 0
+        self.queries_total = 0
+        self.query_seconds = Histogram()
+
+    def observe_request(
+        self, method: str, route: str, status: int, seconds: float, stats: RequestStats
+    ) -> None:
+        key = (method, route, status)
+        suspects = stats.repeated_statements(self.n_plus_one_threshold)
+        with self._lock:
+            entry = self._routes.get(key)
+            if entry is None:
+                entry = self._routes[key] = RouteMetrics()
+            entry.latency.observe(seconds)
+            entry.db_seconds += stats.db_seconds
+            entry.db_queries += stats.queries
+            if suspects:
+                entry.n_plus_one += 1
+        for sql, count in suspects.items():
+            logger.warning(
+                "Possible N+1 on %s %s: statement ran %d times: %s",
+                method, route, count, " ".join(sql.split())[:300],
+            )
+
+    def observe_query(self, seconds: float) -> None:
+        with self._lock:
+            self.queries_total += 1
+            self.query_seconds.observe(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self.queries_total = 0
+            self.query_seconds = Histogram()
+
+    def render(self) -> str:
+        with self._lock:
+            routes = [
+                (_route_labels(*key), entry.latency.counts[:], entry.latency.sum,
+                 entry.latency.count, entry.db_seconds, entry.db_queries, entry.n_plus_one)
+                for key, entry in sorted(self._routes.items())
+            ]
+            query_hist = (self.query_seconds.counts[:], self.query_seconds.sum,
+                          self.query_seconds.count)
+            in_flight = self.in_flight
+        lines: list[str] = []
+
+        lines += _help("http_requests_in_flight", "gauge", "Requests currently being served.")
+        lines.append(f"http_requests_in_flight {in_flight}")
+
+        lines += _help(
+            "http_request_duration_seconds", "histogram",
+            "Request latency by route template, method and status.",
+        )
+        for labels, counts, total, count, *_ in routes:
+            lines += _histogram_lines("http_request_duration_seconds", labels, counts, total, count)
+
+        lines += _help(
+            "http_request_db_seconds_total", "counter",
+            "Time spent in database queries on behalf of requests.",
+        )
+        lines += [f"http_request_db_seconds_total{{{r[0]}}} {r[4]:.6f}" for r in routes]
+
+        lines += _help(
+            "http_request_db_queries_total", "counter",
+            "Database queries issued on behalf of requests.",
+        )
+        lines += [f"http_request_db_queries_total{{{r[0]}}} {r[5]}" for r in routes]
+
+        lines += _help(
+            "http_request_n_plus_one_total", "counter",
+            "Requests that repeated one statement SQL_N_PLUS_ONE_THRESHOLD+ times.",
+        )
+        lines += [f"http_request_n_plus_one_total{{{r[0]}}} {r[6]}" for r in routes if r[6]]
+
+        lines += _help(
+            "db_query_duration_seconds", "histogram",
+            "Latency of every database query, including background tasks.",
+        )
+        lines += _histogram_lines("db_query_duration_seconds", "", *query_hist)
+
+        pw = password_service.stats()
+        for name, kind, help_text, value in (
+            ("password_hash_seconds_total", "counter",
+             "CPU time spent in argon2 hash/verify.", pw["hash_seconds_total"]),
+            ("password_hash_operations_total", "counter",
+             "Completed argon2 hash/verify operations.", pw["completed"]),
+            ("password_hash_rejected_total", "counter",
+             "Hash requests rejected with 503 because the queue was full.", pw["rejected"]),
+            ("password_hash_queue_wait_seconds_total", "counter",
+             "Time hash requests spent waiting for a worker.", pw["queue_wait_seconds_total"]),
+            ("password_hash_in_flight", "gauge",
+             "Hash operations running or queued.", pw["in_flight"]),
+        ):
+            lines += _help(name, kind, help_text)
+            lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def server_timing(stats: RequestStats, elapsed: float) -> bytes:
+    """``Server-Timing`` value showing DB vs. total time in browser devtools."""
+    return (
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+        f"app;dur={elapsed * 1000:.1f}"
+    ).encode("latin-1")
+
+
+def _help(name: str, kind: str, text: str) -> list[str]:
+    return [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+
+
+def _histogram_lines(name: str, labels: str, counts: list[int], total: float, count: int) -> list[str]:
+    sep = "," if labels else ""
+    lines = []
+    cumulative = 0
+    for bound, n in zip(LATENCY_BUCKETS, counts):
+        cumulative += n
+        lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {count}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {total:.6f}")
+    lines.append(f"{name}_count{suffix} {count}")
+    return lines
+
+
+def _route_labels(method: str, route: str, status: int) -> str:
+    return f'method="{method}",route="{_escape(route)}",status="{status}"'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = Metrics(n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every cursor execution and attribute it to the current request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start
+        metrics.observe_query(elapsed)
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+            stats.statements[statement] = stats.statements.get(statement, 0) + 1
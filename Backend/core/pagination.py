@@ -0,0 +1,126 @@
+import base64
+import enum
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from fastapi import HTTPException, Query
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+from .config import settings
+
+# Response header carrying the cursor of the next page; absent on the last page.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass(frozen=True)
+class PageParams:
+    # None: the client did not ask for pages and gets the whole list.
+    limit: int | None
+    cursor: str | None
+
+
+def page_params(
+    limit: int | None = Query(
+        None, ge=1, le=settings.PAGE_SIZE_MAX,
+        description="Page size; omit both limit and cursor for the full list",
+    ),
+    cursor: str | None = Query(None, description=f"Value of the previous page's {NEXT_CURSOR_HEADER}"),
+) -> PageParams:
+    # Paging is opt-in so clients written before it still get every row.
+    if limit is None and cursor is not None:
+        limit = settings.PAGE_SIZE_DEFAULT
+    return PageParams(limit=limit, cursor=cursor)
+
+
+class Keyset:
+    """Keyset (seek) pagination over a fixed ORDER BY.
+
+    Built from the same expressions as ``order_by`` (``col`` or
+    ``col.desc()``); the last key must be unique, e.g. the primary key.
+    Each page resumes strictly after the previous page's last key, so the
+    database seeks in the index instead of counting past an OFFSET, and
+    page cost stays flat however many rows precede it. Cursors are the
+    last key, JSON in URL-safe base64: opaque to clients, and harmless if
+    tampered with since they only choose a starting point.
+    """
+
+    def __init__(self, *order) -> None:
+        self.order = order
+        self.columns = []
+        self.descending = []
+        for expr in order:
+            desc = isinstance(expr, UnaryExpression) and expr.modifier is operators.desc_op
+            self.columns.append(expr.element if isinstance(expr, UnaryExpression) else expr)
+            self.descending.append(desc)
+
+    def apply(self, query, params: PageParams):
+        """Order ``query``, resume after the cursor and fetch one extra row."""
+        if params.limit is None:
+            return query.order_by(*self.order)
+        if params.cursor is not None:
+            query = query.where(self._after(self.decode(params.cursor)))
+        return query.order_by(*self.order).limit(params.limit + 1)
+
+    def page(self, rows, params: PageParams) -> tuple[list, dict[str, str]]:
+        """Trim the extra row; return the page and its ``X-Next-Cursor`` header."""
+        rows = list(rows)
+        if params.limit is None or len(rows) <= params.limit:
+            return rows, {}
+        rows = rows[: params.limit]
+        last = rows[-1]
+        key = [getattr(last, column.key) for column in self.columns]
+        return rows, {NEXT_CURSOR_HEADER: self.encode(key)}
+
+    def encode(self, key: list) -> str:
+        data = json.dumps(
+            [value.isoformat() if isinstance(value, datetime) else value for value in key],
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> list:
+        try:
+            raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            if not isinstance(raw, list) or len(raw) != len(self.columns):
+                raise ValueError(cursor)
+            return [_coerce(column, value) for column, value in zip(self.columns, raw)]
+        except (ValueError, TypeError, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    def _after(self, key: list):
+        if len(set(self.descending)) == 1:
+            # One direction: a row-value comparison the planner can seek on.
+            before = tuple_(*self.columns) < tuple_(*key)
+            after = tuple_(*self.columns) > tuple_(*key)
+            return before if self.descending[0] else after
+        # Mixed directions: (a > x) OR (a = x AND b < y) OR ...
+        clauses = []
+        for i, (column, desc) in enumerate(zip(self.columns, self.descending)):
+            equal = [c == v for c, v in zip(self.columns[:i], key[:i])]
+            clauses.append(and_(*equal, column < key[i] if desc else column > key[i]))
+        return or_(*clauses)
+
+
+def _coerce(column, value):
+    # Cursors come back from clients: a value of the wrong type would reach
+    # the database as a bind parameter (a DataError, i.e. a 500, on Postgres),
+    # so check it against the column's Python type first.
+    if value is None:
+        return None
+    expected = column.type.python_type
+    if expected is datetime:
+        if not isinstance(value, str):
+            raise TypeError(value)
+        return datetime.fromisoformat(value)
+    if issubclass(expected, enum.Enum):
+        return expected(value)
+    if isinstance(value, bool) and expected is not bool:
+        raise TypeError(value)
+    if expected is float and isinstance(value, int):
+        return float(value)
+    if not isinstance(value, expected):
+        raise TypeError(value)
+    return value
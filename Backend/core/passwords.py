@@ -0,0 +1,148 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from .config import settings
+
+
+def _argon2_options() -> dict:
+    options = {
+        "argon2__time_cost": settings.ARGON2_TIME_COST,
+        "argon2__memory_cost": settings.ARGON2_MEMORY_COST,
+        "argon2__parallelism": settings.ARGON2_PARALLELISM,
+    }
+    return {key: value for key, value in options.items() if value is not None}
+
+
+# Hashes made with other parameters report needs_update() and are upgraded
+# on the next successful login.
+pwd_context = CryptContext(schemes=["argon2"], deprecated="auto", **_argon2_options())
+
+
+# Worker entry points run in the pool processes; each reports its own CPU time
+# so the caller can split end-to-end latency into queue wait and hashing.
+def _hash(password: str) -> tuple[str, float]:
+    start = time.perf_counter()
+    hashed = pwd_context.hash(password)
+    return hashed, time.perf_counter() - start
+
+
+def _verify(password: str, hashed: str) -> tuple[bool, float]:
+    start = time.perf_counter()
+    ok = pwd_context.verify(password, hashed)
+    return ok, time.perf_counter() - start
+
+
+def _verify_and_update(password: str, hashed: str) -> tuple[tuple[bool, str | None], float]:
+    start = time.perf_counter()
+    result = pwd_context.verify_and_update(password, hashed)
+    return result, time.perf_counter() - start
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server busy, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
+class PasswordService:
+    """Runs argon2 hash/verify in a dedicated, bounded process pool.
+
+    At most ``workers + queue_depth`` operations may be outstanding; beyond
+    that callers get an immediate 503 instead of queueing behind a login
+    storm. ``workers=0`` hashes inline in the calling thread.
+    """
+
+    def __init__(self, workers: int, queue_depth: int) -> None:
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self._slots = threading.BoundedSemaphore(max(workers + queue_depth, 1))
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_seconds_total = 0.0
+        self.queue_wait_seconds_max = 0.0
+        self.hash_seconds_total = 0.0
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self._run(_verify, password, hashed)
+
+    def verify_and_update(self, password: str, hashed: str) -> tuple[bool, str | None]:
+        """Verify, and return a replacement hash if ``hashed`` uses old parameters."""
+        return self._run(_verify_and_update, password, hashed)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_depth": self.queue_depth,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_wait_seconds_total": round(self.queue_wait_seconds_total, 6),
+                "queue_wait_seconds_max": round(self.queue_wait_seconds_max, 6),
+                "hash_seconds_total": round(self.hash_seconds_total, 6),
+            }
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise _busy()
+        submitted = time.perf_counter()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            if self.workers <= 0:
+                result, elapsed = fn(*args)
+            else:
+                try:
+                    result, elapsed = self._pool().submit(fn, *args).result()
+                except BrokenProcessPool:
+                    # A worker died (e.g. OOM-killed); the next call starts a fresh pool.
+                    self.shutdown()
+                    raise _busy()
+        finally:
+            self._slots.release()
+            with self._lock:
+                self.in_flight -= 1
+        wait = max(time.perf_counter() - submitted - elapsed, 0.0)
+        with self._lock:
+            self.completed += 1
+            self.queue_wait_seconds_total += wait
+            self.queue_wait_seconds_max = max(self.queue_wait_seconds_max, wait)
+            self.hash_seconds_total += elapsed
+        return result
+
+
+password_service = PasswordService(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_depth=settings.PASSWORD_HASH_QUEUE_DEPTH,
+)
@@ -1,24 +1,165 @@
+import sqlite3
+import threading
 import time
-from collections import defaultdict, deque
 
-from fastapi import HTTPException, Request, status
+import anyio
 
 from .config import settings
 
 WINDOW_SECONDS = 60
-_buckets: dict[str, deque[float]] = defaultdict(deque)
-
-
-async def rate_limit(request: Request) -> None:
-    client = request.client.host if request.client else "unknown"
-    now = time.time()
-    dq = _buckets[client]
-    while dq and now - dq[0] > WINDOW_SECONDS:
-        dq.popleft()
-    dq.append(now)
-    if len(dq) > settings.RATE_LIMIT_PER_MINUTE:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Rate limit exceeded",
+
+# Requests that never count against the limit (built frontend assets).
+EXEMPT_PREFIXES = ("/assets/",)
+EXEMPT_PATHS = {"/favicon.ico", "/health"}
+
+# (method, path prefix, path suffix, cost): first match wins, default cost 1.
+ROUTE_COSTS: list[tuple[str, str, str, int]] = [
+    ("POST", "/auth/login", "", 5),
+    ("POST", "/auth/signup", "", 5),
+    ("POST", "/auth/reset", "", 5),
+    ("POST", "/roles/requests", "", 5),
+    ("POST", "/", "/upload", 5),
+    ("POST", "/", "/attachment", 5),
+]
+
+
+class GcraLimiter:
+    """In-process GCRA (generic cell rate algorithm) store with an LRU-bounded key table.
+
+    Each key stores a single float, its theoretical arrival time (TAT), so
+    memory is constant per key no matter how many requests it makes. A key
+    may spend up to ``limit`` units per ``window`` seconds, in bursts or
+    spread out; once the table is full the least recently seen key is
+    forgotten. Only called from the event loop, so it takes no lock.
+    """
+
+    def __init__(self, limit: int, window: float, max_keys: int) -> None:
+        self.window = window
+        self.emission = window / max(limit, 1)
+        self.max_keys = max_keys
+        # dicts keep insertion order: re-inserting a key moves it to the end,
+        # so the first key is always the least recently used one.
+        self._tat: dict[str, float] = {}
+
+    def hit(self, key: str, cost: int = 1, now: float | None = None) -> float:
+        """Spend ``cost`` units; return 0 if allowed, else seconds to wait."""
+        if now is None:
+            now = time.monotonic()
+        tat = self._tat.pop(key, now)
+        if tat < now:
+            tat = now
+        new_tat = tat + self.emission * cost
+        wait = new_tat - now - self.window
+        if wait > 0:
+            self._tat[key] = tat
+            return wait
+        self._tat[key] = new_tat
+        if len(self._tat) > self.max_keys:
+            del self._tat[next(iter(self._tat))]
+        return 0.0
+
+    async def hit_async(self, key: str, cost: int = 1) -> float:
+        # Pure memory, no I/O: cheaper inline than a thread hop.
+        return self.hit(key, cost)
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+
+class SqliteGcraLimiter:
+    """GCRA store shared by every worker process on one host.
+
+    State lives in a WAL-mode SQLite file; each hit is one atomic UPSERT that
+    only advances the key's TAT when the request fits, so concurrent workers
+    never double-spend. Rows whose TAT is in the past carry no state and are
+    pruned periodically, which bounds the table to recently active keys.
+    """
+
+    PRUNE_EVERY = 1000
+    # Threads hitting the store at once; kept apart from the shared pool
+    THREADS = 4
+
+    def __init__(self, path: str, limit: int, window: float) -> None:
+        self.path = path
+        self.window = window
+        self.emission = window / max(limit, 1)
+        self._local = threading.local()
+        self._hits = 0
+        self._threads = anyio.CapacityLimiter(self.THREADS)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key: str, cost: int = 1, now: float | None = None) -> float:
+        """Spend ``cost`` units; return 0 if allowed, else seconds to wait."""
+        if now is None:
+            now = time.time()  # wall clock: shared across processes
+        conn = self._conn()
+        increment = self.emission * cost
+        row = conn.execute(
+            "INSERT INTO rate_limits (key, tat) VALUES (?1, ?2 + ?3) "
+            "ON CONFLICT(key) DO UPDATE SET tat = MAX(tat, ?2) + ?3 "
+            "WHERE MAX(tat, ?2) + ?3 - ?2 <= ?4 "
+            "RETURNING tat",
+            (key, now, increment, self.window),
+        ).fetchone()
+        self._hits += 1
+        if self._hits % self.PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM rate_limits WHERE tat < ?", (now,))
+        if row is not None:
+            return 0.0
+        # Rejected: report how long until the request would fit.
+        current = conn.execute(
+            "SELECT tat FROM rate_limits WHERE key = ?", (key,)
+        ).fetchone()
+        tat = current[0] if current else now
+        return max(max(tat, now) + increment - now - self.window, 0.001)
+
+    async def hit_async(self, key: str, cost: int = 1) -> float:
+        """:meth:`hit` on a worker thread.
+
+        The UPSERT can wait up to the 5 s busy timeout while another worker
+        holds the write lock; on the event loop that would stall every
+        in-flight request in the process. The store has its own capacity
+        limiter, so a threadpool saturated by sync endpoints does not also
+        queue every request (async routes included) just to be rate-limited.
+        """
+        return await anyio.to_thread.run_sync(self.hit, key, cost, limiter=self._threads)
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+
+def _make_limiter():
+    if settings.RATE_LIMIT_BACKEND == "sqlite":
+        return SqliteGcraLimiter(
+            settings.RATE_LIMIT_SQLITE_PATH,
+            limit=settings.RATE_LIMIT_PER_MINUTE,
+            window=WINDOW_SECONDS,
         )
+    return GcraLimiter(
+        limit=settings.RATE_LIMIT_PER_MINUTE,
+        window=WINDOW_SECONDS,
+        max_keys=settings.RATE_LIMIT_MAX_KEYS,
+    )
+
+
+limiter = _make_limiter()
+
 
+def request_cost(method: str, path: str) -> int:
+    if path in EXEMPT_PATHS or path.startswith(EXEMPT_PREFIXES):
+        return 0
+    for route_method, prefix, suffix, cost in ROUTE_COSTS:
+        if method == route_method and path.startswith(prefix) and path.endswith(suffix):
+            return cost
+    return 1
@@ -1,26 +1,46 @@
+import dataclasses
 import secrets
 import uuid
 from datetime import datetime, timedelta
 from typing import Iterable, Sequence
 
 from fastapi import Depends, HTTPException, Request, Response, status
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
-from ..database import get_db
+from ..database import get_async_db, get_db
 from ..models import Session as DBSession
 from ..models import User, UserRole
+from .acl import acl_cache
 from .config import settings
-
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+from .passwords import password_service
+from .session_activity import session_activity
+from .session_cache import CachedUser, session_cache
+from .signed_sessions import decode_token, issue_token, revocations
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_service.hash(password)
 
 
 def verify_password(password: str, hashed: str) -> bool:
-    return pwd_context.verify(password, hashed)
+    return password_service.verify(password, hashed)
+
+
+def verify_and_update_password(password: str, hashed: str) -> tuple[bool, str | None]:
+    return password_service.verify_and_update(password, hashed)
+
+
+_dummy_hash: str | None = None
+
+
+def verify_dummy_password(password: str) -> None:
+    """Spend one real argon2 verify so unknown emails take as long as known ones."""
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password(secrets.token_urlsafe(16))
+    verify_password(password, _dummy_hash)
 
 
 def set_session_cookie(response: Response, session_id: str) -> None:
@@ -43,13 +63,12 @@ def clear_session_cookie(response: Response) -> None:
 
 
 def create_session(db: Session, user: User) -> str:
+    if settings.SESSION_MODE == "signed":
+        return issue_token(user.id, user.role)
     now = datetime.utcnow()
     sid = str(uuid.uuid4())
     expires = now + timedelta(minutes=settings.SESSION_TTL_MINUTES)
-    # Optionally prune expired sessions for this user
-    db.query(DBSession).filter(
-        DBSession.user_id == user.id, DBSession.expires_at < now
-    ).delete()
+    # Expired rows are pruned by the background sweeper (core/sweeper.py)
     db.add(
         DBSession(
             id=sid,
@@ -62,6 +81,26 @@ def create_session(db: Session, user: User) -> str:
     return sid
 
 
+def end_session(db: Session, sid: str) -> None:
+    if settings.SESSION_MODE == "signed":
+        claims = decode_token(sid)
+        if claims:
+            revocations.revoke_token(db, claims.sid, claims.expires_at)
+        return
+    db.query(DBSession).filter(DBSession.id == sid).delete()
+    db.commit()
+    session_cache.invalidate_session(sid)
+    session_activity.forget(sid)
+
+
+def revoke_user_sessions(db: Session, user_id: int) -> None:
+    """Force the user's existing sessions to pick up a role/credential change."""
+    session_cache.invalidate_user(user_id)
+    acl_cache.invalidate_user(user_id)
+    if settings.SESSION_MODE == "signed":
+        revocations.revoke_user(db, user_id)
+
+
 def _normalize_roles(roles: Sequence[str | UserRole]) -> set[str]:
     normalized: set[str] = set()
     for role in roles:
@@ -69,27 +108,170 @@ def _normalize_roles(roles: Sequence[str | UserRole]) -> set[str]:
     return normalized
 
 
-def require_user(
-    request: Request, db: Session = Depends(get_db)
-) -> User:
+def _attach_user(db: Session, **columns) -> User:
+    # Rebuild a persistent User from known columns without touching the DB;
+    # the remaining columns are expired and lazy-load on first access.
+    user = User(**columns)
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
+
+def _require_signed_user(db: Session, token: str) -> User:
+    claims = decode_token(token)
+    if not claims or revocations.is_revoked(db, claims):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired"
+        )
+    return _attach_user(db, id=claims.user_id, role=claims.role)
+
+
+def _record_activity(request: Request, sid: str) -> None:
+    # Sliding expiry: the DB row is extended by the write-behind flusher. The
+    # cookie is re-issued by SecurityMiddleware on the way out, so handlers
+    # returning their own Response (exports, listings) refresh it too.
+    if settings.SESSION_SLIDING:
+        session_activity.touch(sid)
+        request.state.session_refresh = sid
+
+
+def session_refresh_cookie(state: dict) -> tuple[bytes, bytes] | None:
+    """Set-Cookie header re-issuing the request's session cookie, if one is due."""
+    sid = state.get("session_refresh")
+    if sid is None or not session_activity.claim_refresh(sid):
+        return None
+    response = Response()
+    set_session_cookie(response, sid)
+    return next(header for header in response.raw_headers if header[0] == b"set-cookie")
+
+
+def require_user(request: Request, db: Session = Depends(get_db)) -> User:
     sid = request.cookies.get(settings.SESSION_COOKIE_NAME)
     if not sid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
         )
-    session = db.query(DBSession).filter(DBSession.id == sid).first()
-    if not session or session.expires_at < datetime.utcnow():
+    if settings.SESSION_MODE == "signed":
+        return _require_signed_user(db, sid)
+    now = datetime.utcnow()
+    cached = session_cache.get(sid)
+    # A cached expiry may predate a flushed extension; fall back to the DB then.
+    if (
+        cached is not None
+        and session_activity.expires_at(sid, cached.session_expires_at) >= now
+    ):
+        _record_activity(request, sid)
+        return _attach_user(
+            db,
+            id=cached.id,
+            email=cached.email,
+            role=cached.role,
+            email_verified=cached.email_verified,
+            totp_enabled=cached.totp_enabled,
+        )
+    row = (
+        db.query(DBSession, User)
+        .outerjoin(User, User.id == DBSession.user_id)
+        .filter(DBSession.id == sid)
+        .first()
+    )
+    if not row or session_activity.expires_at(sid, row[0].expires_at) < now:
+        session_cache.invalidate_session(sid)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired"
         )
-    user = db.query(User).filter(User.id == session.user_id).first()
+    session, user = row
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
         )
+    session_cache.put(sid, _snapshot(user, session.expires_at))
+    _record_activity(request, sid)
     return user
 
 
+def _snapshot(user: User, expires_at: datetime) -> CachedUser:
+    return CachedUser(
+        id=user.id,
+        email=user.email,
+        role=user.role,
+        email_verified=bool(user.email_verified),
+        totp_enabled=bool(user.totp_enabled),
+        session_expires_at=expires_at,
+        has_totp=bool(user.totp_enabled and user.totp_secret),
+    )
+
+
+async def require_user_async(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+) -> CachedUser:
+    """``require_user`` for async routes: same checks, returns a read-only snapshot.
+
+    Lazy loads are not possible under asyncio, so async handlers get the
+    cached ``CachedUser`` (id, email, role, flags) instead of an ORM object.
+    """
+    sid = request.cookies.get(settings.SESSION_COOKIE_NAME)
+    if not sid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
+        )
+    if settings.SESSION_MODE == "signed":
+        return await _require_signed_user_async(db, sid)
+    now = datetime.utcnow()
+    cached = session_cache.get(sid)
+    if (
+        cached is not None
+        and session_activity.expires_at(sid, cached.session_expires_at) >= now
+    ):
+        _record_activity(request, sid)
+        return cached
+    row = (
+        await db.execute(
+            select(DBSession, User)
+            .outerjoin(User, User.id == DBSession.user_id)
+            .where(DBSession.id == sid)
+        )
+    ).first()
+    if not row or session_activity.expires_at(sid, row[0].expires_at) < now:
+        session_cache.invalidate_session(sid)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired"
+        )
+    session, user = row
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
+        )
+    snapshot = _snapshot(user, session.expires_at)
+    session_cache.put(sid, snapshot)
+    _record_activity(request, sid)
+    return snapshot
+
+
+async def _require_signed_user_async(db: AsyncSession, token: str) -> CachedUser:
+    # Claims carry id and role; the rest of the snapshot (email, MFA flags)
+    # is loaded once per token and then served from session_cache, which
+    # role and MFA changes already invalidate, so a warm request does no I/O.
+    claims = decode_token(token)
+    if not claims or await revocations.is_revoked_async(db, claims):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired"
+        )
+    cached = session_cache.get(claims.sid)
+    if cached is not None:
+        return cached
+    user = await db.get(User, claims.user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired"
+        )
+    snapshot = _snapshot(user, datetime.utcfromtimestamp(claims.expires_at))
+    # The signed role is authoritative until the token is revoked.
+    snapshot = dataclasses.replace(snapshot, role=claims.role)
+    session_cache.put(claims.sid, snapshot)
+    return snapshot
+
+
 def require_role(*roles: str | UserRole):
     allowed = _normalize_roles(roles or (UserRole.student,))
 
@@ -105,6 +287,20 @@ def require_role(*roles: str | UserRole):
     return _dep
 
 
+def require_role_async(*roles: str | UserRole):
+    allowed = _normalize_roles(roles or (UserRole.student,))
+
+    async def _dep(user: CachedUser = Depends(require_user_async)) -> CachedUser:
+        if user.role.value not in allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions",
+            )
+        return user
+
+    return _dep
+
+
 PASSWORD_POLICY = {
     "min_len": 8,
     "max_len": 256,
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from ..database import SessionLocal
+from ..models import Session as DBSession
+from .background import PeriodicTask
+from .config import settings
+
+FLUSH_CHUNK_SIZE = 500
+
+
+class SessionActivity(PeriodicTask):
+    """Write-behind sliding expiry for DB-backed sessions.
+
+    ``require_user`` records activity in memory; every flush interval the
+    touched sessions get ``expires_at = flush time + TTL`` in a single UPDATE
+    (per chunk of ids). A crash loses at most one interval of extensions.
+    The session cookie is re-issued at most once per interval, when a
+    response actually carries it (see ``claim_refresh``).
+    """
+
+    name = "Session activity flush"
+
+    def __init__(self, interval_seconds: float) -> None:
+        super().__init__(interval_seconds)
+        self._pending: dict[str, datetime] = {}
+        self._refreshed: set[str] = set()
+        self._lock = threading.Lock()
+        self.flushes = 0
+        self.sessions_extended = 0
+        self.last_duration_seconds = 0.0
+
+    def touch(self, sid: str) -> None:
+        with self._lock:
+            self._pending[sid] = datetime.utcnow()
+
+    def claim_refresh(self, sid: str) -> bool:
+        """True if a response going out now should re-issue ``sid``'s cookie.
+
+        Only sessions with pending activity qualify, each once per interval;
+        call this when the cookie is about to be sent, not when it is decided.
+        """
+        with self._lock:
+            if sid not in self._pending or sid in self._refreshed:
+                return False
+            self._refreshed.add(sid)
+            return True
+
+    def forget(self, sid: str) -> None:
+        with self._lock:
+            self._pending.pop(sid, None)
+            self._refreshed.discard(sid)
+
+    def expires_at(self, sid: str, stored: datetime) -> datetime:
+        """Effective expiry including activity that is not flushed yet."""
+        with self._lock:
+            last_seen = self._pending.get(sid)
+        if last_seen is None:
+            return stored
+        return max(stored, last_seen + timedelta(minutes=settings.SESSION_TTL_MINUTES))
+
+    def run_once(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._refreshed = set()
+        if not pending:
+            return 0
+        start = time.perf_counter()
+        expires = datetime.utcnow() + timedelta(minutes=settings.SESSION_TTL_MINUTES)
+        ids = list(pending)
+        extended = 0
+        db = SessionLocal()
+        try:
+            for i in range(0, len(ids), FLUSH_CHUNK_SIZE):
+                result = db.execute(
+                    update(DBSession)
+                    .where(
+                        DBSession.id.in_(ids[i : i + FLUSH_CHUNK_SIZE]),
+                        DBSession.expires_at < expires,
+                    )
+                    .values(expires_at=expires)
+                )
+                extended += result.rowcount
+            db.commit()
+        finally:
+            db.close()
+        with self._lock:
+            self.flushes += 1
+            self.sessions_extended += extended
+            self.last_duration_seconds = time.perf_counter() - start
+        return extended
+
+    async def stop(self) -> None:
+        await super().stop()
+        # Final flush of pending extensions, off the event loop like the others.
+        await asyncio.to_thread(self.run_once)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "flushes": self.flushes,
+                "sessions_extended": self.sessions_extended,
+                "last_duration_seconds": round(self.last_duration_seconds, 6),
+            }
+
+
+session_activity = SessionActivity(
+    interval_seconds=(
+        settings.SESSION_FLUSH_INTERVAL_SECONDS if settings.SESSION_SLIDING else 0
+    ),
+)
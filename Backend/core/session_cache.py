@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from ..models import UserRole
+from .config import settings
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Lightweight snapshot of the user behind a session."""
+
+    id: int
+    email: str
+    role: UserRole
+    email_verified: bool
+    totp_enabled: bool
+    session_expires_at: datetime
+    # totp_enabled with a verified secret: what login and /me treat as MFA on
+    has_totp: bool = False
+
+
+class SessionCache:
+    """Bounded LRU cache of session id -> user snapshot with a per-entry TTL.
+
+    Entries are dropped explicitly on logout, role and MFA changes. Each
+    worker process keeps its own cache, so the TTL bounds how long another
+    worker can serve a stale snapshot.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, CachedUser]] = OrderedDict()
+        self._by_user: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, sid: str) -> CachedUser | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(sid)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, snapshot = entry
+            if now - stored_at > self.ttl_seconds:
+                self._drop(sid)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(sid)
+            self.hits += 1
+            return snapshot
+
+    def put(self, sid: str, snapshot: CachedUser) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if sid in self._entries:
+                self._drop(sid)
+            self._entries[sid] = (time.monotonic(), snapshot)
+            self._by_user.setdefault(snapshot.id, set()).add(sid)
+            while len(self._entries) > self.max_entries:
+                oldest, _ = next(iter(self._entries.items()))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate_session(self, sid: str) -> None:
+        with self._lock:
+            if sid in self._entries:
+                self._drop(sid)
+                self.invalidations += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for sid in list(self._by_user.get(user_id, ())):
+                self._drop(sid)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop(self, sid: str) -> None:
+        _, snapshot = self._entries.pop(sid)
+        sids = self._by_user.get(snapshot.id)
+        if sids is not None:
+            sids.discard(sid)
+            if not sids:
+                del self._by_user[snapshot.id]
+
+
+session_cache = SessionCache(
+    max_entries=settings.SESSION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SESSION_CACHE_TTL_SECONDS,
+)
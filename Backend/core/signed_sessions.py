@@ -0,0 +1,209 @@
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models import SessionRevocation, UserRole
+from .config import settings
+
+
+@dataclass(frozen=True)
+class SessionClaims:
+    sid: str
+    user_id: int
+    role: UserRole
+    issued_at_ms: int
+    expires_at: int
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _sign(payload: str) -> str:
+    digest = hmac.new(
+        settings.SECRET_KEY.encode(), payload.encode(), hashlib.sha256
+    ).digest()
+    return _b64encode(digest)
+
+
+class RevocationStore:
+    """Denylist for signed sessions, shared through the session_revocations table.
+
+    Single tokens are revoked by session id until their own expiry; a user can
+    also be revoked wholesale, which rejects every token issued at or before
+    that moment for one session TTL. Rows live in the database, so every
+    worker sees them and a restart forgets nothing. Lookups sit behind a
+    bounded per-process cache: a revocation applies at once in the worker
+    that made it and within ``ttl_seconds`` everywhere else.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # sid -> (checked at, revoked); user id -> (checked at, not-before ms)
+        self._tokens: OrderedDict[str, tuple[float, bool]] = OrderedDict()
+        self._users: OrderedDict[int, tuple[float, int | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def revoke_token(self, db: Session, sid: str, expires_at: float) -> None:
+        db.add(SessionRevocation(sid=sid, expires_at=datetime.utcfromtimestamp(expires_at)))
+        db.commit()
+        with self._lock:
+            self._put(self._tokens, sid, True)
+
+    def revoke_user(self, db: Session, user_id: int) -> None:
+        now = time.time()
+        not_before_ms = int(now * 1000)
+        db.add(
+            SessionRevocation(
+                user_id=user_id,
+                not_before_ms=not_before_ms,
+                expires_at=datetime.utcfromtimestamp(now + settings.SESSION_TTL_MINUTES * 60),
+            )
+        )
+        db.commit()
+        with self._lock:
+            self._put(self._users, user_id, not_before_ms)
+
+    def is_revoked(self, db: Session, claims: SessionClaims) -> bool:
+        cached = self._cached(claims)
+        if cached is None:
+            cached = self._store(claims, db.execute(self._query(claims)))
+        return cached
+
+    async def is_revoked_async(self, db: AsyncSession, claims: SessionClaims) -> bool:
+        """Async twin of :meth:`is_revoked` for ``get_async_db`` routes."""
+        cached = self._cached(claims)
+        if cached is None:
+            cached = self._store(claims, await db.execute(self._query(claims)))
+        return cached
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+            self._users.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "cached_tokens": len(self._tokens),
+                "cached_users": len(self._users),
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _cached(self, claims: SessionClaims) -> bool | None:
+        now = time.monotonic()
+        with self._lock:
+            token = self._tokens.get(claims.sid)
+            user = self._users.get(claims.user_id)
+            if (
+                token is None
+                or user is None
+                or now - token[0] > self.ttl_seconds
+                or now - user[0] > self.ttl_seconds
+            ):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._revoked(claims, token[1], user[1])
+
+    def _query(self, claims: SessionClaims):
+        return select(
+            SessionRevocation.sid, SessionRevocation.not_before_ms
+        ).where(
+            or_(
+                SessionRevocation.sid == claims.sid,
+                SessionRevocation.user_id == claims.user_id,
+            ),
+            SessionRevocation.expires_at > datetime.utcnow(),
+        )
+
+    def _store(self, claims: SessionClaims, rows) -> bool:
+        token_revoked = False
+        not_before_ms = None
+        for sid, row_not_before in rows:
+            if sid == claims.sid:
+                token_revoked = True
+            elif row_not_before is not None:
+                not_before_ms = max(not_before_ms or 0, row_not_before)
+        with self._lock:
+            self._put(self._tokens, claims.sid, token_revoked)
+            self._put(self._users, claims.user_id, not_before_ms)
+        return self._revoked(claims, token_revoked, not_before_ms)
+
+    @staticmethod
+    def _revoked(claims: SessionClaims, token_revoked: bool, not_before_ms: int | None) -> bool:
+        return token_revoked or (
+            not_before_ms is not None and claims.issued_at_ms <= not_before_ms
+        )
+
+    def _put(self, entries: OrderedDict, key, value) -> None:
+        # Caller holds the lock.
+        entries.pop(key, None)
+        entries[key] = (time.monotonic(), value)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+
+revocations = RevocationStore(
+    ttl_seconds=settings.REVOCATION_CACHE_TTL_SECONDS,
+    max_entries=settings.REVOCATION_CACHE_MAX_ENTRIES,
+)
+
+
+def issue_token(user_id: int, role: UserRole | str) -> str:
+    now = time.time()
+    claims = {
+        "sid": uuid.uuid4().hex,
+        "uid": user_id,
+        "role": role.value if isinstance(role, UserRole) else role,
+        "iat": int(now * 1000),
+        "exp": int(now + settings.SESSION_TTL_MINUTES * 60),
+    }
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    return f"{payload}.{_sign(payload)}"
+
+
+def decode_token(token: str) -> SessionClaims | None:
+    """Return the claims of a validly signed, unexpired token.
+
+    Revocation needs a database lookup; check it with ``revocations``.
+    """
+    payload, _, signature = token.partition(".")
+    if not payload or not signature:
+        return None
+    if not hmac.compare_digest(signature, _sign(payload)):
+        return None
+    try:
+        data = json.loads(_b64decode(payload))
+        claims = SessionClaims(
+            sid=data["sid"],
+            user_id=int(data["uid"]),
+            role=UserRole(data["role"]),
+            issued_at_ms=int(data["iat"]),
+            expires_at=int(data["exp"]),
+        )
+    except (ValueError, KeyError, TypeError):
+        return None
+    if claims.expires_at < time.time():
+        return None
+    return claims
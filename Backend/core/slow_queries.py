@@ -0,0 +1,160 @@
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+from .metrics import current_request
+
+# Statements worth running EXPLAIN QUERY PLAN on (SQLite only).
+EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+def parameter_shape(parameters, executemany: bool = False):
+    """Parameter types without their values, so the log never holds user data."""
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "row": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class SlowQueryLog:
+    """Records queries slower than ``threshold_ms`` with their plan and route.
+
+    Each slow query becomes one JSON line in a size-rotated log; a bounded
+    in-memory table aggregates them per statement for the admin top-N view.
+    Fast queries only pay a timer read and one comparison.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        path: str,
+        max_bytes: int,
+        backups: int,
+        max_statements: int = 500,
+    ) -> None:
+        self.threshold_seconds = threshold_ms / 1000
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.max_statements = max_statements
+        self._lock = threading.Lock()
+        self._logger: logging.Logger | None = None
+        self._offenders: dict[str, dict] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_seconds > 0
+
+    def record(self, statement: str, parameters, executemany: bool, seconds: float,
+               route: str, plan: list[str] | None) -> None:
+        entry = {
+            "at": datetime.utcnow().isoformat(timespec="milliseconds") + "Z",
+            "duration_ms": round(seconds * 1000, 3),
+            "route": route,
+            "statement": statement,
+            "parameters": parameter_shape(parameters, executemany),
+            "plan": plan,
+        }
+        with self._lock:
+            self._log().info(json.dumps(entry, default=str))
+            offender = self._offenders.get(statement)
+            if offender is None:
+                if len(self._offenders) >= self.max_statements:
+                    # Forget the statement with the least total time.
+                    least = min(self._offenders, key=lambda k: self._offenders[k]["total_ms"])
+                    del self._offenders[least]
+                offender = self._offenders[statement] = {
+                    "statement": statement,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                }
+            offender["count"] += 1
+            offender["total_ms"] += entry["duration_ms"]
+            offender["max_ms"] = max(offender["max_ms"], entry["duration_ms"])
+            offender["last_route"] = route
+            offender["last_seen"] = entry["at"]
+            offender["parameters"] = entry["parameters"]
+            if plan is not None:
+                offender["plan"] = plan
+
+    def top(self, limit: int) -> list[dict]:
+        with self._lock:
+            offenders = [dict(o) for o in self._offenders.values()]
+        offenders.sort(key=lambda o: o["total_ms"], reverse=True)
+        for offender in offenders:
+            offender["total_ms"] = round(offender["total_ms"], 3)
+            offender["avg_ms"] = round(offender["total_ms"] / offender["count"], 3)
+        return offenders[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._offenders.clear()
+
+    def _log(self) -> logging.Logger:
+        # Opened on the first slow query so idle deployments create no file.
+        if self._logger is None:
+            logger = logging.getLogger(f"{__name__}.jsonl")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            handler = RotatingFileHandler(
+                self.path, maxBytes=self.max_bytes, backupCount=self.backups, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            self._logger = logger
+        return self._logger
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_MS,
+    path=settings.SLOW_QUERY_LOG_PATH,
+    max_bytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+    backups=settings.SLOW_QUERY_LOG_BACKUPS,
+)
+
+
+def _explain(conn, statement: str, parameters) -> list[str] | None:
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+    # Raw DBAPI cursor: bypasses engine events, so the EXPLAIN is not itself timed.
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in cursor.fetchall()]
+    except Exception as exc:  # plan capture must never break the query path
+        return [f"unavailable: {exc}"]
+    finally:
+        cursor.close()
+
+
+def watch_engine(engine: Engine) -> None:
+    """Log statements slower than SLOW_QUERY_MS, with EXPLAIN QUERY PLAN on SQLite."""
+    sqlite = engine.dialect.name == "sqlite"
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end(conn, cursor, statement, parameters, context, executemany):
+        if not slow_query_log.enabled:
+            return
+        elapsed = time.perf_counter() - context._slow_query_start
+        if elapsed < slow_query_log.threshold_seconds:
+            return
+        stats = current_request.get()
+        route = stats.route if stats is not None else "background"
+        plan = _explain(conn, statement, parameters) if sqlite and not executemany else None
+        slow_query_log.record(statement, parameters, executemany, elapsed, route, plan)
@@ -0,0 +1,85 @@
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import delete, select
+
+from ..database import SessionLocal
+from ..models import Session as DBSession
+from ..models import SessionRevocation, Token
+from .background import PeriodicTask
+from .config import settings
+from .session_activity import session_activity
+
+
+class ExpirySweeper(PeriodicTask):
+    """Periodically deletes expired sessions, tokens and revocations in bounded batches.
+
+    Each batch is its own short transaction so the sweep never holds the
+    SQLite write lock for long. Pending sliding-expiry activity is flushed
+    first, so a session whose stored expiry lags its last use is not purged.
+    """
+
+    name = "Expiry sweep"
+
+    def __init__(self, interval_seconds: float, batch_size: int) -> None:
+        super().__init__(interval_seconds)
+        self.batch_size = max(batch_size, 1)
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.sessions_deleted = 0
+        self.tokens_deleted = 0
+        self.revocations_deleted = 0
+        self.last_duration_seconds = 0.0
+        self.last_run_at: datetime | None = None
+
+    def run_once(self) -> dict[str, int]:
+        start = time.perf_counter()
+        session_activity.run_once()
+        now = datetime.utcnow()
+        counts = {
+            "sessions": self._purge(DBSession, now),
+            "tokens": self._purge(Token, now),
+            "revocations": self._purge(SessionRevocation, now),
+        }
+        with self._lock:
+            self.runs += 1
+            self.sessions_deleted += counts["sessions"]
+            self.tokens_deleted += counts["tokens"]
+            self.revocations_deleted += counts["revocations"]
+            self.last_duration_seconds = time.perf_counter() - start
+            self.last_run_at = now
+        return counts
+
+    def _purge(self, model, now: datetime) -> int:
+        expired_ids = (
+            select(model.id).where(model.expires_at < now).limit(self.batch_size)
+        )
+        total = 0
+        while True:
+            db = SessionLocal()
+            try:
+                result = db.execute(delete(model).where(model.id.in_(expired_ids)))
+                db.commit()
+            finally:
+                db.close()
+            total += result.rowcount
+            if result.rowcount < self.batch_size:
+                return total
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "sessions_deleted": self.sessions_deleted,
+                "tokens_deleted": self.tokens_deleted,
+                "revocations_deleted": self.revocations_deleted,
+                "last_duration_seconds": round(self.last_duration_seconds, 6),
+                "last_run_at": self.last_run_at,
+            }
+
+
+sweeper = ExpirySweeper(
+    interval_seconds=settings.SWEEP_INTERVAL_SECONDS,
+    batch_size=settings.SWEEP_BATCH_SIZE,
+)
@@ -1,15 +1,111 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from .core.config import settings
+from .core.metrics import instrument_engine
+from .core.slow_queries import watch_engine
 
-connect_args = (
-    {"check_same_thread": False}
-    if settings.DATABASE_URL.startswith("sqlite")
-    else {}
-)
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+
+def sqlite_pragmas() -> dict[str, object]:
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: dict[str, object]) -> None:
+    """Run the PRAGMAs on every new DBAPI connection before the pool hands it out.
+
+    WAL lets readers proceed while one writer commits, synchronous=NORMAL
+    drops the fsync per commit (still durable across application crashes),
+    and busy_timeout makes writers wait for the lock instead of failing
+    with "database is locked".
+    """
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def make_engine(url: str) -> Engine:
+    if url.startswith("sqlite"):
+        # A sync request holds its pooled connection until the get_db
+        # teardown runs on the threadpool after the response, so under load
+        # more requests wait on teardown than a threadpool-sized pool allows.
+        # Keep that many warm, allow a bounded overflow, and past that wait
+        # at most DB_POOL_TIMEOUT_SECONDS instead of opening handles forever.
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            pool_size=settings.SQLITE_POOL_SIZE,
+            max_overflow=settings.SQLITE_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        )
+        apply_sqlite_pragmas(engine, sqlite_pragmas())
+    else:
+        engine = create_engine(
+            url,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    instrument_engine(engine)
+    watch_engine(engine)
+    return engine
+
+
+# Async drivers for the same database: aiosqlite in dev, asyncpg for Postgres.
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No async driver configured for {backend!r} URLs")
+    return parsed.set(drivername=f"{backend}+{driver}").render_as_string(hide_password=False)
+
+
+def make_async_engine(url: str) -> AsyncEngine:
+    if url.startswith("sqlite"):
+        async_engine = create_async_engine(async_database_url(url))
+        apply_sqlite_pragmas(async_engine.sync_engine, sqlite_pragmas())
+    else:
+        async_engine = create_async_engine(
+            async_database_url(url),
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    # Events fire on the sync facade, so metrics and the slow-query log see
+    # async queries too.
+    instrument_engine(async_engine.sync_engine)
+    watch_engine(async_engine.sync_engine)
+    return async_engine
+
+
+engine = make_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+async_engine = make_async_engine(settings.DATABASE_URL)
+# expire_on_commit=False: attributes stay readable after commit without an
+# implicit (and, under asyncio, forbidden) lazy refresh.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 
@@ -19,3 +115,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
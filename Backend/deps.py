@@ -1,6 +1,7 @@
 from fastapi import Depends
 
-from .core.security import require_role, require_user
+from .core.security import require_role, require_role_async, require_user, require_user_async
+from .core.session_cache import CachedUser
 from .database import get_db as _get_db
 from .models import User, UserRole
 
@@ -13,6 +14,10 @@ def get_current_user(user: User = Depends(require_user)) -> User:
     return user
 
 
+async def get_current_user_async(user: CachedUser = Depends(require_user_async)) -> CachedUser:
+    return user
+
+
 require_admin = require_role(UserRole.admin)
 require_instructor = require_role(UserRole.instructor, UserRole.admin)
-
+require_instructor_async = require_role_async(UserRole.instructor, UserRole.admin)
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 import sys
 
@@ -12,11 +13,14 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 
 from .core.config import settings
-from .core.csrf import csrf_protect
-from .core.ratelimit import rate_limit
+from .core.pagination import NEXT_CURSOR_HEADER
+from .core.passwords import password_service
+from .core.session_activity import session_activity
+from .core.sweeper import sweeper
 from .core.security import hash_password, password_policy_ok
-from .database import Base, SessionLocal, engine
-from .middleware.security_headers import SecurityHeadersMiddleware
+from .database import SessionLocal, async_engine, engine
+from .middleware.security import SecurityMiddleware
+from .migrations import ensure_current
 from .routers import (
     admin,
     assignment,
@@ -25,13 +29,14 @@ from .routers import (
     materials,
     instructor_requests,
     me,
+    metrics,
     mfa,
     quiz,
     submission,
 )
 from .models import User, UserRole
 
-Base.metadata.create_all(bind=engine)
+ensure_current(engine, migrate=settings.MIGRATE_ON_STARTUP)
 
 
 def ensure_seed_admin() -> None:
@@ -67,16 +72,31 @@ def ensure_seed_admin() -> None:
 
 ensure_seed_admin()
 
-app = FastAPI(title=settings.APP_NAME)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    sweeper.start()
+    session_activity.start()
+    yield
+    await session_activity.stop()
+    await sweeper.stop()
+    password_service.shutdown()
+    await async_engine.dispose()
+
+
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
+
+# Rate limiting, CSRF and security headers run inside CORS so that
+# rejections still carry CORS headers the frontend can read.
+app.add_middleware(SecurityMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
-app.add_middleware(SecurityHeadersMiddleware)
 # Serve uploaded files (assignments/submissions)
 Path(settings.UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
 app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
@@ -86,37 +106,6 @@ INDEX_FILE = STATIC_DIR / "index.html"
 SERVE_FRONTEND = STATIC_DIR.exists() and INDEX_FILE.exists()
 
 
-@app.middleware("http")
-async def _rate_limit(request, call_next):
-    await rate_limit(request)
-    return await call_next(request)
-
-
-@app.middleware("http")
-async def _csrf(request, call_next):
-    path = request.url.path
-    if (
-        request.method in ("GET", "HEAD", "OPTIONS")
-        or path.endswith("/auth/csrf")
-        or path.startswith("/auth/login")
-        or path.startswith("/auth/signup")
-        or path.startswith("/auth/verify-email")
-        or path.startswith("/auth/reset")
-        or path.startswith("/auth/logout")
-    ):
-        return await call_next(request)
-    try:
-        csrf_protect(request)
-    except Exception as exc:  # return a clean 403 instead of crashing the middleware stack
-        from fastapi.responses import JSONResponse
-        from fastapi import HTTPException
-
-        if isinstance(exc, HTTPException):
-            return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
-        return JSONResponse(status_code=403, content={"detail": "CSRF check failed"})
-    return await call_next(request)
-
-
 app.include_router(auth.router)
 app.include_router(mfa.router)
 app.include_router(me.router)
@@ -127,6 +116,7 @@ app.include_router(materials.router)
 app.include_router(quiz.router)
 app.include_router(submission.router)
 app.include_router(admin.router)
+app.include_router(metrics.router)
 
 
 @app.get("/health")
@@ -0,0 +1,166 @@
+import hmac
+import math
+import time
+
+from starlette.requests import cookie_parser
+from starlette.responses import JSONResponse
+
+from ..core.config import settings
+from ..core.csrf import SAFE_METHODS
+from ..core.metrics import (
+    UNMATCHED_ROUTE,
+    RequestStats,
+    current_request,
+    metrics,
+    server_timing,
+)
+from ..core.ratelimit import limiter, request_cost
+from ..core.security import session_refresh_cookie
+
+# Unsafe requests that may skip the double-submit check (no session yet).
+CSRF_EXEMPT_PREFIXES = (
+    "/auth/login",
+    "/auth/signup",
+    "/auth/verify-email",
+    "/auth/reset",
+    "/auth/logout",
+)
+CSRF_EXEMPT_SUFFIXES = ("/auth/csrf",)
+
+
+def security_headers() -> list[tuple[bytes, bytes]]:
+    fe = settings.FRONTEND_ORIGIN
+    headers = [
+        (b"x-frame-options", b"DENY"),
+        (b"x-content-type-options", b"nosniff"),
+        (b"referrer-policy", b"no-referrer"),
+        (
+            b"content-security-policy",
+            (
+                "default-src 'self'; "
+                "script-src 'self' 'unsafe-inline'; "
+                "style-src 'self' 'unsafe-inline'; "
+                "img-src 'self' data: blob:; "
+                f"connect-src 'self' {fe}; "
+                "frame-ancestors 'none';"
+            ).encode("latin-1"),
+        ),
+    ]
+    if settings.HSTS_ENABLED:
+        headers.append(
+            (b"strict-transport-security", b"max-age=63072000; includeSubDomains; preload")
+        )
+    return headers
+
+
+class SecurityMiddleware:
+    """Rate limiting, CSRF double-submit check and security headers in one pure ASGI layer.
+
+    Unlike BaseHTTPMiddleware this does not wrap the request/response in
+    extra tasks or streams; it only inspects the scope and appends
+    precomputed header pairs to ``http.response.start``. It also records
+    per-route request metrics (see ``core/metrics.py``) and, in DEBUG,
+    adds a ``Server-Timing`` header with the request's DB time and query count.
+    Sliding sessions get their cookie re-issued here rather than on the
+    dependency's ``Response``, which FastAPI drops when a handler returns its own.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.headers = security_headers()
+        self.csrf_cookie = settings.CSRF_COOKIE_NAME
+        self.session_cookie_prefix = f"{settings.SESSION_COOKIE_NAME}=".encode("latin-1")
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        extra_headers = self.headers
+        debug = settings.DEBUG
+        status_code = 500
+        stats = RequestStats(scope)
+        start = time.perf_counter()
+        # Shared with request.state, where require_user flags a cookie refresh.
+        state = scope.setdefault("state", {})
+
+        async def send_with_headers(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = [*message.get("headers", ()), *extra_headers]
+                if not self._sets_session_cookie(headers):
+                    refresh = session_refresh_cookie(state)
+                    if refresh is not None:
+                        headers.append(refresh)
+                if debug:
+                    elapsed = time.perf_counter() - start
+                    headers.append((b"server-timing", server_timing(stats, elapsed)))
+                message["headers"] = headers
+            await send(message)
+
+        token = current_request.set(stats)
+        metrics.in_flight += 1
+        try:
+            await self._dispatch(scope, receive, send_with_headers)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.in_flight -= 1
+            current_request.reset(token)
+            route = scope.get("route")
+            metrics.observe_request(
+                scope["method"],
+                route.path if route is not None else UNMATCHED_ROUTE,
+                status_code,
+                elapsed,
+                stats,
+            )
+
+    async def _dispatch(self, scope, receive, send_with_headers) -> None:
+        method = scope["method"]
+        path = scope["path"]
+
+        cost = request_cost(method, path)
+        if cost:
+            client = scope.get("client")
+            wait = await limiter.hit_async(client[0] if client else "unknown", cost)
+            if wait > 0:
+                response = JSONResponse(
+                    {"detail": "Rate limit exceeded"},
+                    status_code=429,
+                    headers={"Retry-After": str(math.ceil(wait))},
+                )
+                await response(scope, receive, send_with_headers)
+                return
+
+        if method not in SAFE_METHODS and not self._csrf_exempt(path):
+            if not self._csrf_ok(scope):
+                response = JSONResponse({"detail": "CSRF check failed"}, status_code=403)
+                await response(scope, receive, send_with_headers)
+                return
+
+        await self.app(scope, receive, send_with_headers)
+
+    def _sets_session_cookie(self, headers) -> bool:
+        # Login/logout set or clear the cookie themselves; leave those alone.
+        return any(
+            name == b"set-cookie" and value.startswith(self.session_cookie_prefix)
+            for name, value in headers
+        )
+
+    @staticmethod
+    def _csrf_exempt(path: str) -> bool:
+        return path.startswith(CSRF_EXEMPT_PREFIXES) or path.endswith(CSRF_EXEMPT_SUFFIXES)
+
+    def _csrf_ok(self, scope) -> bool:
+        cookies: list[str] = []
+        header = None
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                cookies.append(value.decode("latin-1"))
+            elif name == b"x-csrf-token":
+                header = value.decode("latin-1")
+        if not cookies or not header:
+            return False
+        cookie = cookie_parser("; ".join(cookies)).get(self.csrf_cookie)
+        return bool(cookie) and hmac.compare_digest(cookie, header)
@@ -0,0 +1,155 @@
+"""Versioned schema migrations.
+
+Each module in ``versions/`` is named ``vNNNN_description`` and defines
+``upgrade(conn)``. Applied versions are recorded in ``schema_version``, so a
+database is brought forward exactly once per migration and request handlers
+never have to inspect the schema. Run ``python -m Backend.migrations`` to
+check or upgrade a database by hand.
+"""
+
+import importlib
+import pkgutil
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from types import ModuleType
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, insert, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from . import versions
+
+MODULE_PATTERN = re.compile(r"^v(\d{4})_(\w+)$")
+
+# Key of the Postgres advisory lock that serializes migration runs.
+MIGRATION_LOCK_ID = 0x504F4C59  # "POLY"
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    module: ModuleType
+
+    def upgrade(self, conn: Connection) -> None:
+        self.module.upgrade(conn)
+
+
+def discover() -> list[Migration]:
+    """Every migration in ``versions/``, ordered by version."""
+    found = []
+    for info in pkgutil.iter_modules(versions.__path__):
+        match = MODULE_PATTERN.match(info.name)
+        if match is None:
+            continue
+        module = importlib.import_module(f"{versions.__name__}.{info.name}")
+        found.append(Migration(int(match.group(1)), match.group(2), module))
+    found.sort(key=lambda m: m.version)
+    numbers = [m.version for m in found]
+    if len(set(numbers)) != len(numbers):
+        raise RuntimeError(f"Duplicate migration versions: {numbers}")
+    return found
+
+
+def head() -> int:
+    migrations = discover()
+    return migrations[-1].version if migrations else 0
+
+
+def current_version(conn: Connection) -> int:
+    """Highest applied version; 0 for a database that has never been migrated."""
+    try:
+        return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+    except (OperationalError, ProgrammingError):
+        # No schema_version table yet. Postgres aborts the transaction on
+        # the failed statement, so roll it back before the caller continues.
+        conn.rollback()
+        return 0
+
+
+@contextmanager
+def _migration_lock(engine: Engine):
+    """A transaction that holds the database-wide migration lock.
+
+    Every worker may run migrations at startup, so two processes can reach
+    the same pending step together. SQLite serializes on ``BEGIN IMMEDIATE``
+    (the write lock, taken up front instead of at the first write) and
+    Postgres on a transaction-scoped advisory lock; both are released when
+    the transaction ends.
+    """
+    if engine.dialect.name == "sqlite":
+        # Driver-level autocommit so pysqlite does not issue its own BEGIN.
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.exec_driver_sql("ROLLBACK")
+                raise
+            conn.exec_driver_sql("COMMIT")
+        return
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(select(func.pg_advisory_xact_lock(MIGRATION_LOCK_ID)))
+        yield conn
+
+
+def upgrade(engine: Engine, target: int | None = None) -> list[Migration]:
+    """Apply pending migrations up to ``target`` (default: all); return those applied.
+
+    Each migration commits in its own locked transaction together with its
+    ``schema_version`` row, so a failure leaves the database at the last
+    version that completed. The version is re-read under the lock, so a
+    step another process applied meanwhile is skipped rather than repeated.
+    """
+    applied = []
+    for migration in discover():
+        if target is not None and migration.version > target:
+            break
+        with _migration_lock(engine) as conn:
+            schema_version.create(conn, checkfirst=True)
+            if migration.version <= current_version(conn):
+                continue
+            migration.upgrade(conn)
+            conn.execute(
+                insert(schema_version).values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.utcnow(),
+                )
+            )
+        applied.append(migration)
+    return applied
+
+
+def ensure_current(engine: Engine, migrate: bool) -> None:
+    """Startup check: one query when the schema is already up to date.
+
+    With ``migrate`` the pending migrations are applied; otherwise a stale
+    database is an error, for deployments that migrate as a separate step.
+    """
+    with engine.connect() as conn:
+        current = current_version(conn)
+    latest = head()
+    if current == latest:
+        return
+    if current > latest:
+        raise RuntimeError(
+            f"Database schema version {current} is newer than this release ({latest})"
+        )
+    if not migrate:
+        raise RuntimeError(
+            f"Database schema is at version {current}, expected {latest}; "
+            "run `python -m Backend.migrations upgrade`"
+        )
+    upgrade(engine)
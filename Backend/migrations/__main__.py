@@ -0,0 +1,51 @@
+"""Show or apply schema migrations for DATABASE_URL.
+
+Usage (from repo root):
+    python -m Backend.migrations status
+    python -m Backend.migrations upgrade            # to the latest version
+    python -m Backend.migrations upgrade --to 2
+"""
+
+import argparse
+
+from sqlalchemy import select
+
+from ..database import engine
+from . import current_version, discover, schema_version, upgrade
+
+
+def status() -> None:
+    with engine.connect() as conn:
+        current = current_version(conn)
+        applied = {}
+        if current:
+            rows = conn.execute(select(schema_version.c.version, schema_version.c.applied_at))
+            applied = {version: applied_at for version, applied_at in rows}
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    print(f"Current version: {current}")
+    for migration in discover():
+        when = applied.get(migration.version)
+        state = f"applied {when:%Y-%m-%d %H:%M:%S}" if when else "pending"
+        print(f"  {migration.version:04d} {migration.name:<32} {state}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status")
+    up = commands.add_parser("upgrade")
+    up.add_argument("--to", type=int, default=None, help="stop after this version")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        status()
+        return
+    applied = upgrade(engine, target=args.to)
+    for migration in applied:
+        print(f"Applied {migration.version:04d} {migration.name}")
+    if not applied:
+        print("Already up to date.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Baseline schema (tables as originally created by Base.metadata.create_all)."""
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.engine import Connection
+
+# Frozen copy of the original models: later migrations must not change it, or
+# fresh databases and upgraded ones would diverge.
+metadata = MetaData()
+
+Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("email", String, unique=True, index=True, nullable=False),
+    Column("password_hash", String, nullable=False),
+    Column("email_verified", Boolean),
+    Column("role", Enum("student", "instructor", "admin", name="userrole"), nullable=False),
+    Column("totp_secret", String),
+    Column("pending_totp_secret", String),
+    Column("totp_enabled", Boolean, nullable=False),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+)
+Table(
+    "sessions",
+    metadata,
+    Column("id", String, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("expires_at", DateTime, nullable=False),
+)
+Table(
+    "tokens",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("token", String, unique=True, index=True, nullable=False),
+    Column("purpose", String, nullable=False),
+    Column("expires_at", DateTime, nullable=False),
+)
+Table(
+    "instructor_requests",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("note", Text),
+    Column("file_path", String, nullable=False),
+    Column("status", String, nullable=False),
+    Column("decision_by", Integer, ForeignKey("users.id")),
+    Column("decided_at", DateTime),
+    Column("created_at", DateTime),
+)
+Table(
+    "classrooms",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=False),
+    Column("code", String, unique=True, index=True, nullable=False),
+    Column("instructor_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("created_at", DateTime),
+)
+Table(
+    "classroom_members",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("classroom_id", Integer, ForeignKey("classrooms.id"), nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("joined_at", DateTime),
+    UniqueConstraint("classroom_id", "user_id", name="uq_classroom_user"),
+)
+Table(
+    "quizzes",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("title", String, nullable=False),
+    Column("description", Text),
+    Column("classroom_id", Integer, ForeignKey("classrooms.id"), nullable=False),
+    Column("due_date", DateTime),
+    Column("created_at", DateTime),
+)
+Table(
+    "assignments",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("title", String, nullable=False),
+    Column("description", Text),
+    Column("classroom_id", Integer, ForeignKey("classrooms.id"), nullable=False),
+    Column("due_date", DateTime),
+    Column("created_at", DateTime),
+)
+Table(
+    "submissions",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("assignment_id", Integer, ForeignKey("assignments.id"), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("grade", Float),
+    Column("submitted_at", DateTime),
+)
+Table(
+    "materials",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("classroom_id", Integer, ForeignKey("classrooms.id"), nullable=False),
+    Column("title", String, nullable=False),
+    Column("description", Text),
+    Column("file_url", String),
+    Column("created_at", DateTime),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    # checkfirst: databases created before migrations existed already have these.
+    metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,10 @@
+"""Add assignments.attachment_url (previously patched in at request time)."""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+
+def upgrade(conn: Connection) -> None:
+    columns = {col["name"] for col in inspect(conn).get_columns("assignments")}
+    if "attachment_url" not in columns:
+        conn.execute(text("ALTER TABLE assignments ADD COLUMN attachment_url VARCHAR"))
@@ -0,0 +1,39 @@
+"""Store only SHA-256 digests of emailed tokens.
+
+Tokens live at most an hour, so the table is rebuilt rather than migrated;
+outstanding links from before the upgrade stop working.
+"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    inspect,
+)
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+Table("users", metadata, Column("id", Integer, primary_key=True))
+tokens = Table(
+    "tokens",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("token_hash", String, nullable=False),
+    Column("purpose", String, nullable=False),
+    Column("expires_at", DateTime, nullable=False),
+    Index("ix_tokens_purpose_token_hash", "purpose", "token_hash", unique=True),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    columns = {col["name"] for col in inspect(conn).get_columns("tokens")}
+    if "token_hash" in columns:
+        return
+    tokens.drop(conn)
+    tokens.create(conn)
@@ -0,0 +1,21 @@
+"""Indexes for the hot list queries (filter column first, sort column second)."""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+INDEXES = {
+    "ix_submissions_assignment_id_submitted_at": ("submissions", "assignment_id, submitted_at"),
+    "ix_submissions_user_id": ("submissions", "user_id"),
+    "ix_assignments_classroom_id_created_at": ("assignments", "classroom_id, created_at"),
+    "ix_materials_classroom_id_created_at": ("materials", "classroom_id, created_at"),
+    "ix_classroom_members_user_id": ("classroom_members", "user_id"),
+    "ix_quizzes_classroom_id": ("quizzes", "classroom_id"),
+    "ix_sessions_user_id_expires_at": ("sessions", "user_id, expires_at"),
+    "ix_tokens_expires_at": ("tokens", "expires_at"),
+    "ix_instructor_requests_status_created_at": ("instructor_requests", "status, created_at"),
+}
+
+
+def upgrade(conn: Connection) -> None:
+    for name, (table, columns) in INDEXES.items():
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
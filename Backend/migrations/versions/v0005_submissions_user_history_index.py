@@ -0,0 +1,19 @@
+"""Extend the submissions user_id index with submitted_at.
+
+A student's history (``/submissions/mine``) filters on user_id and sorts by
+submitted_at, so the composite index returns it in order without a sort
+step. It still covers plain user_id lookups, so the old index is dropped.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_submissions_user_id_submitted_at "
+            "ON submissions (user_id, submitted_at)"
+        )
+    )
+    conn.execute(text("DROP INDEX IF EXISTS ix_submissions_user_id"))
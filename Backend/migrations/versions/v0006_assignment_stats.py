@@ -0,0 +1,45 @@
+"""Add the denormalized assignment_stats table and fill it from submissions.
+
+From here on the submission and grading endpoints keep each row current;
+``python -m Backend.tools.rebuild_assignment_stats`` recomputes them.
+"""
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, MetaData, Table, text
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+Table("assignments", metadata, Column("id", Integer, primary_key=True))
+assignment_stats = Table(
+    "assignment_stats",
+    metadata,
+    Column("assignment_id", Integer, ForeignKey("assignments.id"), primary_key=True),
+    Column("submission_count", Integer, nullable=False),
+    Column("submitter_count", Integer, nullable=False),
+    Column("graded_count", Integer, nullable=False),
+    Column("grade_sum", Float, nullable=False),
+    Column("min_grade", Float, nullable=True),
+    Column("max_grade", Float, nullable=True),
+    Column("last_submitted_at", DateTime, nullable=True),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    assignment_stats.create(conn, checkfirst=True)
+    conn.execute(text("DELETE FROM assignment_stats"))
+    # Grade columns cover each student's latest attempt only, as in the gradebook.
+    conn.execute(
+        text(
+            "INSERT INTO assignment_stats (assignment_id, submission_count, submitter_count, "
+            "graded_count, grade_sum, min_grade, max_grade, last_submitted_at) "
+            "SELECT a.id, COUNT(s.id), COUNT(DISTINCT s.user_id), "
+            "COUNT(CASE WHEN s.rank = 1 THEN s.grade END), "
+            "COALESCE(SUM(CASE WHEN s.rank = 1 THEN s.grade END), 0), "
+            "MIN(CASE WHEN s.rank = 1 THEN s.grade END), "
+            "MAX(CASE WHEN s.rank = 1 THEN s.grade END), MAX(s.submitted_at) "
+            "FROM assignments a LEFT JOIN ("
+            "SELECT id, assignment_id, user_id, grade, submitted_at, ROW_NUMBER() OVER ("
+            "PARTITION BY assignment_id, user_id ORDER BY submitted_at DESC, id DESC) AS rank "
+            "FROM submissions) s ON s.assignment_id = a.id "
+            "GROUP BY a.id"
+        )
+    )
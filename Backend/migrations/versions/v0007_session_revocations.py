@@ -0,0 +1,26 @@
+"""Move the signed-session denylist from process memory into a shared table.
+
+Every worker checks it (behind a short in-process cache), so a logout,
+password reset or role change applies to all workers and survives restarts.
+"""
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+session_revocations = Table(
+    "session_revocations",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("sid", String, nullable=True),
+    Column("user_id", Integer, nullable=True),
+    Column("not_before_ms", BigInteger, nullable=True),
+    Column("expires_at", DateTime, nullable=False),
+    Index("ix_session_revocations_sid", "sid"),
+    Index("ix_session_revocations_user_id", "user_id"),
+    Index("ix_session_revocations_expires_at", "expires_at"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    session_revocations.create(conn, checkfirst=True)
@@ -2,12 +2,14 @@ import enum
 from datetime import datetime
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -51,16 +53,42 @@ class Session(Base):
     created_at = Column(DateTime, nullable=False)
     expires_at = Column(DateTime, nullable=False)
 
+    __table_args__ = (Index("ix_sessions_user_id_expires_at", "user_id", "expires_at"),)
+
 
 class Token(Base):
     __tablename__ = "tokens"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    token = Column(String, unique=True, index=True, nullable=False)
+    token_hash = Column(String, nullable=False)  # sha256 of the emailed value
     purpose = Column(String, nullable=False)
     expires_at = Column(DateTime, nullable=False)
 
+    __table_args__ = (
+        Index("ix_tokens_purpose_token_hash", "purpose", "token_hash", unique=True),
+        Index("ix_tokens_expires_at", "expires_at"),
+    )
+
+
+# Denylist for signed sessions, shared by every worker: a row with ``sid``
+# revokes that token; a row with ``user_id`` revokes the user's tokens
+# issued at or before ``not_before_ms``. Rows are swept after ``expires_at``.
+class SessionRevocation(Base):
+    __tablename__ = "session_revocations"
+
+    id = Column(Integer, primary_key=True)
+    sid = Column(String, nullable=True)
+    user_id = Column(Integer, nullable=True)
+    not_before_ms = Column(BigInteger, nullable=True)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_session_revocations_sid", "sid"),
+        Index("ix_session_revocations_user_id", "user_id"),
+        Index("ix_session_revocations_expires_at", "expires_at"),
+    )
+
 
 class InstructorRequest(Base):
     __tablename__ = "instructor_requests"
@@ -77,6 +105,10 @@ class InstructorRequest(Base):
     user = relationship("User", foreign_keys=[user_id])
     decided_by_user = relationship("User", foreign_keys=[decision_by], post_update=True)
 
+    __table_args__ = (
+        Index("ix_instructor_requests_status_created_at", "status", "created_at"),
+    )
+
 
 class Classroom(Base):
     __tablename__ = "classrooms"
@@ -110,6 +142,7 @@ class ClassroomMember(Base):
 
     __table_args__ = (
         UniqueConstraint("classroom_id", "user_id", name="uq_classroom_user"),
+        Index("ix_classroom_members_user_id", "user_id"),
     )
 
 
@@ -125,6 +158,8 @@ class Quiz(Base):
 
     classroom = relationship("Classroom", back_populates="quizzes")
 
+    __table_args__ = (Index("ix_quizzes_classroom_id", "classroom_id"),)
+
 
 class Assignment(Base):
     __tablename__ = "assignments"
@@ -139,6 +174,11 @@ class Assignment(Base):
 
     classroom = relationship("Classroom", back_populates="assignments")
     submissions = relationship("Submission", back_populates="assignment")
+    stats = relationship("AssignmentStats", uselist=False, cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_assignments_classroom_id_created_at", "classroom_id", "created_at"),
+    )
 
 
 class Submission(Base):
@@ -154,6 +194,28 @@ class Submission(Base):
     assignment = relationship("Assignment", back_populates="submissions")
     user = relationship("User", back_populates="submissions")
 
+    __table_args__ = (
+        Index("ix_submissions_assignment_id_submitted_at", "assignment_id", "submitted_at"),
+        # Serves both the per-student filter and /submissions/mine ordering.
+        Index("ix_submissions_user_id_submitted_at", "user_id", "submitted_at"),
+    )
+
+
+# Running totals over an assignment's submissions (grade columns: latest
+# attempt per student), updated in the same transaction as each submission
+# and grade (utils/assignment_stats.py).
+class AssignmentStats(Base):
+    __tablename__ = "assignment_stats"
+
+    assignment_id = Column(Integer, ForeignKey("assignments.id"), primary_key=True)
+    submission_count = Column(Integer, nullable=False, default=0)
+    submitter_count = Column(Integer, nullable=False, default=0)
+    graded_count = Column(Integer, nullable=False, default=0)
+    grade_sum = Column(Float, nullable=False, default=0)
+    min_grade = Column(Float, nullable=True)
+    max_grade = Column(Float, nullable=True)
+    last_submitted_at = Column(DateTime, nullable=True)
+
 
 class Material(Base):
     __tablename__ = "materials"
@@ -166,3 +228,7 @@ class Material(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     classroom = relationship("Classroom")
+
+    __table_args__ = (
+        Index("ix_materials_classroom_id_created_at", "classroom_id", "created_at"),
+    )
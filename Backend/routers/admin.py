@@ -1,6 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from ..core.acl import acl_cache
+from ..core.exports import ListFormat, export_response
+from ..core.login_guard import account_failures, ip_failures
+from ..core.pagination import Keyset, PageParams, page_params
+from ..core.passwords import password_service
+from ..core.security import revoke_user_sessions
+from ..core.session_activity import session_activity
+from ..core.session_cache import session_cache
+from ..core.signed_sessions import revocations
+from ..core.slow_queries import slow_query_log
+from ..core.sweeper import sweeper
 from ..database import get_db
 from ..deps import require_admin
 from ..models import User, UserRole
@@ -8,10 +20,25 @@ from ..schemas import BasicOK, UserOut
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
+USER_PAGES = Keyset(User.id)
+# Columns of UserOut, for ?format=ndjson|csv exports
+USER_EXPORT_COLUMNS = (User.id, User.email, User.role, User.email_verified, User.totp_enabled)
+
 
 @router.get("/users", response_model=list[UserOut])
-def list_users(admin=Depends(require_admin), db: Session = Depends(get_db)):
-    return db.query(User).order_by(User.id).all()
+def list_users(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fmt: ListFormat = Query("json", alias="format"),
+    admin=Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    if fmt != "json":
+        export = select(*USER_EXPORT_COLUMNS).order_by(*USER_PAGES.order)
+        return export_response(export, fmt, "users")
+    users, headers = USER_PAGES.page(USER_PAGES.apply(db.query(User), page), page)
+    response.headers.update(headers)
+    return users
 
 
 @router.post("/users/{user_id}/role", response_model=BasicOK)
@@ -27,5 +54,29 @@ def update_role(
     user.role = role
     db.add(user)
     db.commit()
+    revoke_user_sessions(db, user_id)
     return {"ok": True}
 
+
+@router.get("/stats")
+def read_stats(admin=Depends(require_admin)):
+    return {
+        "session_cache": session_cache.stats(),
+        "acl_cache": acl_cache.stats(),
+        "session_revocations": revocations.stats(),
+        "password_service": password_service.stats(),
+        "session_activity": session_activity.stats(),
+        "sweeper": sweeper.stats(),
+        "login_guard": {
+            "tracked_accounts": len(account_failures),
+            "tracked_ips": len(ip_failures),
+        },
+    }
+
+
+@router.get("/slow-queries")
+def read_slow_queries(limit: int = 20, admin=Depends(require_admin)):
+    return {
+        "threshold_ms": slow_query_log.threshold_seconds * 1000,
+        "offenders": slow_query_log.top(max(1, min(limit, 200))),
+    }
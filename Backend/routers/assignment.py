@@ -1,16 +1,22 @@
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy import text
+from fastapi import APIRouter, Depends, HTTPException, Response, status, UploadFile, File
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
-from ..database import get_db
-from ..deps import get_current_user, require_instructor
+from ..core.acl import classroom_role_async
+from ..core.pagination import Keyset, PageParams, page_params
+from ..core.session_cache import CachedUser
+from ..database import get_async_db, get_db
+from ..deps import get_current_user_async, require_instructor
 from ..core.config import settings
 
 router = APIRouter(prefix="/assignments", tags=["Assignments"])
 
+ASSIGNMENT_PAGES = Keyset(models.Assignment.created_at.desc(), models.Assignment.id.desc())
+
 POLY_TEMPLATES: list[schemas.AssignmentTemplate] = [
     schemas.AssignmentTemplate(
         id="gf-addition",
@@ -49,23 +55,6 @@ def _get_assignment(db: Session, assignment_id: int) -> models.Assignment:
     return assignment
 
 
-def _ensure_membership(db: Session, classroom_id: int, user: models.User):
-    if user.role == models.UserRole.admin:
-        return
-    classroom = db.query(models.Classroom).filter_by(id=classroom_id).first()
-    if not classroom:
-        raise HTTPException(status_code=404, detail="Classroom not found")
-    if classroom.instructor_id == user.id:
-        return
-    membership = (
-        db.query(models.ClassroomMember)
-        .filter_by(classroom_id=classroom_id, user_id=user.id)
-        .first()
-    )
-    if not membership:
-        raise HTTPException(status_code=403, detail="You are not enrolled in this class")
-
-
 def _store_attachment(assignment_id: int, filename: str, content: bytes) -> str:
     base_dir = Path(settings.UPLOAD_DIR) / "assignments" / f"assignment_{assignment_id}"
     base_dir.mkdir(parents=True, exist_ok=True)
@@ -76,29 +65,24 @@ def _store_attachment(assignment_id: int, filename: str, content: bytes) -> str:
     return f"/uploads/assignments/assignment_{assignment_id}/{safe_name}"
 
 
-def _ensure_attachment_column(db: Session) -> None:
-    # Adds attachment_url column on existing DBs that predate the change.
-    result = db.execute(text("PRAGMA table_info(assignments)")).fetchall()
-    has_col = any(row[1] == "attachment_url" for row in result)
-    if not has_col:
-        db.execute(text("ALTER TABLE assignments ADD COLUMN attachment_url TEXT"))
-        db.commit()
-
-
 @router.get("/classroom/{classroom_id}", response_model=list[schemas.AssignmentOut])
-def list_assignments_for_classroom(
+async def list_assignments_for_classroom(
     classroom_id: int,
-    db: Session = Depends(get_db),
-    user=Depends(get_current_user),
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
+    user: CachedUser = Depends(get_current_user_async),
 ):
-    _ensure_membership(db, classroom_id, user)
-    assignments = (
-        db.query(models.Assignment)
-        .filter(models.Assignment.classroom_id == classroom_id)
-        .order_by(models.Assignment.created_at.desc())
-        .all()
+    await classroom_role_async(db, classroom_id, user)
+    assignments = await db.scalars(
+        ASSIGNMENT_PAGES.apply(
+            select(models.Assignment).where(models.Assignment.classroom_id == classroom_id),
+            page,
+        )
     )
-    return assignments
+    items, headers = ASSIGNMENT_PAGES.page(assignments, page)
+    response.headers.update(headers)
+    return items
 
 
 @router.get("/templates", response_model=list[schemas.AssignmentTemplate])
@@ -113,7 +97,6 @@ async def create_assignment(
     db: Session = Depends(get_db),
     user=Depends(require_instructor),
 ):
-    _ensure_attachment_column(db)
     classroom = db.query(models.Classroom).filter_by(id=payload.classroom_id).first()
     if not classroom:
         raise HTTPException(status_code=404, detail="Classroom not found")
@@ -135,7 +118,6 @@ async def upload_assignment_attachment(
     db: Session = Depends(get_db),
     user=Depends(require_instructor),
 ):
-    _ensure_attachment_column(db)
     assignment = _get_assignment(db, assignment_id)
     _ensure_can_manage(assignment.classroom, user)
     content = await file.read()
@@ -148,15 +130,52 @@ async def upload_assignment_attachment(
 
 
 @router.get("/{assignment_id}", response_model=schemas.AssignmentOut)
-def get_assignment(
+async def get_assignment(
     assignment_id: int,
-    db: Session = Depends(get_db),
-    user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    user: CachedUser = Depends(get_current_user_async),
 ):
-    assignment = _get_assignment(db, assignment_id)
+    assignment = await db.get(models.Assignment, assignment_id)
+    if not assignment:
+        raise HTTPException(status_code=404, detail="Assignment not found")
     return assignment
 
 
+@router.get("/{assignment_id}/stats", response_model=schemas.AssignmentStatsOut)
+async def get_assignment_stats(
+    assignment_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: CachedUser = Depends(get_current_user_async),
+):
+    # Two primary-key lookups in one query; the totals are maintained on
+    # write, so this never scans submissions.
+    row = (
+        await db.execute(
+            select(models.Assignment.classroom_id, models.AssignmentStats)
+            .outerjoin(models.AssignmentStats)
+            .where(models.Assignment.id == assignment_id)
+        )
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+    role = await classroom_role_async(db, row.classroom_id, user)
+    if role == models.UserRole.student:
+        raise HTTPException(status_code=403, detail="Not allowed for this classroom")
+    stats = row.AssignmentStats
+    if stats is None:
+        return schemas.AssignmentStatsOut(assignment_id=assignment_id)
+    return schemas.AssignmentStatsOut(
+        assignment_id=assignment_id,
+        submission_count=stats.submission_count,
+        submitter_count=stats.submitter_count,
+        graded_count=stats.graded_count,
+        mean_grade=stats.grade_sum / stats.graded_count if stats.graded_count else None,
+        min_grade=stats.min_grade,
+        max_grade=stats.max_grade,
+        last_submitted_at=stats.last_submitted_at,
+    )
+
+
 @router.put(
     "/{assignment_id}",
     response_model=schemas.AssignmentOut,
@@ -167,7 +186,6 @@ def update_assignment(
     db: Session = Depends(get_db),
     user=Depends(require_instructor),
 ):
-    _ensure_attachment_column(db)
     assignment = _get_assignment(db, assignment_id)
     _ensure_can_manage(assignment.classroom, user)
     for key, value in payload.dict().items():
@@ -4,16 +4,24 @@ from sqlalchemy.orm import Session
 
 from ..core.config import settings
 from ..core.csrf import issue_csrf
+from ..core.login_guard import (
+    check_login_allowed,
+    record_login_failure,
+    record_login_success,
+)
 from ..core.security import (
     clear_session_cookie,
     create_session,
+    end_session,
     hash_password,
     password_policy_ok,
+    revoke_user_sessions,
     set_session_cookie,
-    verify_password,
+    verify_and_update_password,
+    verify_dummy_password,
 )
+from ..core.session_cache import session_cache
 from ..database import get_db
-from ..models import Session as DBSession
 from ..models import User
 from ..schemas import BasicOK, LoginIn, SignupIn
 from ..utils.email import send_reset_email, send_verification_email
@@ -51,6 +59,7 @@ def _verify_email_token(token: str, db: Session) -> None:
     user.email_verified = True
     db.add(user)
     db.commit()
+    session_cache.invalidate_user(user.id)
 
 
 @router.post("/verify-email", response_model=BasicOK)
@@ -78,17 +87,37 @@ def verify_email_page(token: str, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=BasicOK)
-def login(payload: LoginIn, response: Response, db: Session = Depends(get_db)):
+def login(
+    payload: LoginIn,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    client_ip = request.client.host if request.client else "unknown"
+    check_login_allowed(payload.email, client_ip)
     user = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+    if not user:
+        verify_dummy_password(payload.password)
+        record_login_failure(payload.email, client_ip)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    ok, new_hash = verify_and_update_password(payload.password, user.password_hash)
+    if not ok:
+        record_login_failure(payload.email, client_ip)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if new_hash:
+        # Transparently migrate hashes made with older argon2 parameters
+        user.password_hash = new_hash
+        db.add(user)
+        db.commit()
     if not user.email_verified:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Email not verified")
     if user.totp_enabled and user.totp_secret:
         if not payload.totp:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="MFA TOTP required")
         if not verify_totp(user.totp_secret, payload.totp):
+            record_login_failure(payload.email, client_ip)
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid TOTP code")
+    record_login_success(payload.email)
     sid = create_session(db, user)
     set_session_cookie(response, sid)
     issue_csrf(response)
@@ -99,8 +128,7 @@ def login(payload: LoginIn, response: Response, db: Session = Depends(get_db)):
 def logout(response: Response, request: Request, db: Session = Depends(get_db)):
     sid = request.cookies.get(settings.SESSION_COOKIE_NAME)
     if sid:
-        db.query(DBSession).filter(DBSession.id == sid).delete()
-        db.commit()
+        end_session(db, sid)
     clear_session_cookie(response)
     return {"ok": True}
 
@@ -156,5 +184,6 @@ def reset_confirm(
     user.password_hash = hash_password(new_password)
     db.add(user)
     db.commit()
+    revoke_user_sessions(db, user.id)
     return {"ok": True}
 
@@ -1,11 +1,17 @@
 import secrets
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
-from ..database import get_db
-from ..deps import get_current_user, require_instructor
+from ..core.acl import acl_cache, classroom_role_async
+from ..core.exports import csv_response
+from ..core.session_cache import CachedUser
+from ..database import get_async_db, get_db
+from ..deps import get_current_user, get_current_user_async, require_instructor
 
 router = APIRouter(prefix="/classrooms", tags=["Classrooms"])
 
@@ -39,6 +45,7 @@ def create_classroom(
     # Instructor automatically joins their classroom
     db.add(models.ClassroomMember(classroom_id=classroom.id, user_id=instructor.id))
     db.commit()
+    acl_cache.invalidate_user(instructor.id)
     return classroom
 
 
@@ -60,24 +67,131 @@ def join_classroom(
         return {"ok": True}
     db.add(models.ClassroomMember(classroom_id=classroom.id, user_id=user.id))
     db.commit()
+    acl_cache.invalidate_user(user.id)
     return {"ok": True}
 
 
 # Accept both /classrooms and /classrooms/ for GET
 @router.get("", response_model=list[schemas.ClassroomOut])
 @router.get("/", response_model=list[schemas.ClassroomOut])
-def list_classrooms(
-    db: Session = Depends(get_db), user=Depends(get_current_user)
+async def list_classrooms(
+    db: AsyncSession = Depends(get_async_db),
+    user: CachedUser = Depends(get_current_user_async),
 ):
-    owned = db.query(models.Classroom).filter_by(instructor_id=user.id).all()
-    member = (
-        db.query(models.Classroom)
-        .join(
-            models.ClassroomMember,
-            models.Classroom.id == models.ClassroomMember.classroom_id,
+    # Owned and joined classrooms in one query; owners are usually members too.
+    member_of = select(models.ClassroomMember.classroom_id).where(
+        models.ClassroomMember.user_id == user.id
+    )
+    result = await db.scalars(
+        select(models.Classroom).where(
+            or_(
+                models.Classroom.instructor_id == user.id,
+                models.Classroom.id.in_(member_of),
+            )
+        ).order_by(models.Classroom.id)
+    )
+    return result.all()
+
+
+def _latest_grades(classroom_id: int):
+    # Rank each student's submissions per assignment newest first and keep
+    # rank 1, so the database does the "latest per (student, assignment)"
+    # reduction instead of the client pivoting the whole submission history.
+    ranked = (
+        select(
+            models.Submission.user_id,
+            models.Submission.assignment_id,
+            models.Submission.id,
+            models.Submission.grade,
+            func.row_number()
+            .over(
+                partition_by=(models.Submission.user_id, models.Submission.assignment_id),
+                order_by=(models.Submission.submitted_at.desc(), models.Submission.id.desc()),
+            )
+            .label("rank"),
+        )
+        .join(models.Assignment, models.Submission.assignment_id == models.Assignment.id)
+        .where(models.Assignment.classroom_id == classroom_id)
+        .subquery()
+    )
+    return select(ranked.c.user_id, ranked.c.assignment_id, ranked.c.id, ranked.c.grade).where(
+        ranked.c.rank == 1
+    )
+
+
+def _assignment_stats(assignment_id: int, column: list, ids: list) -> schemas.AssignmentGradeStats:
+    graded = [grade for grade in column if grade is not None]
+    return schemas.AssignmentGradeStats(
+        assignment_id=assignment_id,
+        submitted=sum(sub_id is not None for sub_id in ids),
+        graded=len(graded),
+        mean=sum(graded) / len(graded) if graded else None,
+        min=min(graded, default=None),
+        max=max(graded, default=None),
+    )
+
+
+@router.get("/{classroom_id}/gradebook", response_model=schemas.Gradebook)
+async def get_gradebook(
+    classroom_id: int,
+    fmt: Literal["json", "csv"] = Query("json", alias="format"),
+    db: AsyncSession = Depends(get_async_db),
+    user: CachedUser = Depends(get_current_user_async),
+):
+    role = await classroom_role_async(db, classroom_id, user)
+    if role == models.UserRole.student:
+        raise HTTPException(status_code=403, detail="Not allowed for this classroom")
+
+    assignments = (
+        await db.execute(
+            select(models.Assignment.id, models.Assignment.title, models.Assignment.due_date)
+            .where(models.Assignment.classroom_id == classroom_id)
+            .order_by(models.Assignment.created_at, models.Assignment.id)
         )
-        .filter(models.ClassroomMember.user_id == user.id)
-        .all()
+    ).all()
+    students = (
+        await db.execute(
+            select(models.User.id, models.User.email)
+            .join(models.ClassroomMember, models.ClassroomMember.user_id == models.User.id)
+            .join(models.Classroom, models.Classroom.id == models.ClassroomMember.classroom_id)
+            .where(
+                models.ClassroomMember.classroom_id == classroom_id,
+                models.User.id != models.Classroom.instructor_id,
+            )
+            .order_by(models.User.email)
+        )
+    ).all()
+
+    row_of = {student.id: i for i, student in enumerate(students)}
+    col_of = {assignment.id: j for j, assignment in enumerate(assignments)}
+    grades = [[None] * len(assignments) for _ in students]
+    submission_ids = [[None] * len(assignments) for _ in students]
+    for user_id, assignment_id, submission_id, grade in await db.execute(_latest_grades(classroom_id)):
+        i = row_of.get(user_id)
+        j = col_of.get(assignment_id)
+        if i is None or j is None:
+            # Not on the roster (e.g. the instructor testing their own
+            # assignment), or an assignment created after the list was read.
+            continue
+        grades[i][j] = grade
+        submission_ids[i][j] = submission_id
+
+    if fmt == "csv":
+        header = ["student_id", "email", *(f"{a.title} (#{a.id})" for a in assignments)]
+        rows = ([s.id, s.email, *grades[i]] for i, s in enumerate(students))
+        return csv_response(header, rows, f"gradebook-classroom-{classroom_id}")
+
+    return schemas.Gradebook(
+        classroom_id=classroom_id,
+        students=[schemas.GradebookStudent(id=s.id, email=s.email) for s in students],
+        assignments=[
+            schemas.GradebookAssignment(id=a.id, title=a.title, due_date=a.due_date)
+            for a in assignments
+        ],
+        grades=grades,
+        submission_ids=submission_ids,
+        stats=[
+            _assignment_stats(a.id, [row[j] for row in grades], [row[j] for row in submission_ids])
+            for j, a in enumerate(assignments)
+        ],
     )
-    dedup = {cls.id: cls for cls in [*owned, *member]}
-    return list(dedup.values())
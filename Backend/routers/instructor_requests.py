@@ -2,10 +2,14 @@ import uuid
 from datetime import datetime
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Response, UploadFile
+from sqlalchemy import select
+from sqlalchemy.orm import Session, contains_eager
 
 from ..core.config import settings
+from ..core.exports import ListFormat, export_response
+from ..core.pagination import Keyset, PageParams, page_params
+from ..core.security import revoke_user_sessions
 from ..database import get_db
 from ..deps import get_current_user, require_admin
 from ..models import InstructorRequest, User, UserRole
@@ -19,6 +23,21 @@ router = APIRouter(tags=["Instructor Requests"])
 
 UPLOAD_DIR = Path(settings.UPLOAD_DIR)
 
+REQUEST_PAGES = Keyset(InstructorRequest.created_at.desc(), InstructorRequest.id.desc())
+REQUEST_STATUSES = {"pending", "approved", "rejected"}
+# Columns of InstructorRequestAdminOut, for ?format=ndjson|csv exports
+REQUEST_EXPORT_COLUMNS = (
+    InstructorRequest.id,
+    InstructorRequest.status,
+    InstructorRequest.note,
+    InstructorRequest.file_path,
+    InstructorRequest.user_id,
+    User.email.label("user_email"),
+    InstructorRequest.created_at,
+    InstructorRequest.decision_by,
+    InstructorRequest.decided_at,
+)
+
 
 @router.post("/roles/requests", response_model=InstructorRequestOut)
 def submit_request(
@@ -58,14 +77,31 @@ def submit_request(
     response_model=list[InstructorRequestAdminOut],
 )
 def list_requests(
+    response: Response,
     status: str | None = None,
+    page: PageParams = Depends(page_params),
+    fmt: ListFormat = Query("json", alias="format"),
     admin: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
-    query = db.query(InstructorRequest).join(User, InstructorRequest.user_id == User.id)
-    if status in {"pending", "approved", "rejected"}:
+    if fmt != "json":
+        export = (
+            select(*REQUEST_EXPORT_COLUMNS)
+            .join(User, InstructorRequest.user_id == User.id)
+            .order_by(*REQUEST_PAGES.order)
+        )
+        if status in REQUEST_STATUSES:
+            export = export.where(InstructorRequest.status == status)
+        return export_response(export, fmt, "instructor-requests")
+    query = (
+        db.query(InstructorRequest)
+        .join(User, InstructorRequest.user_id == User.id)
+        .options(contains_eager(InstructorRequest.user))
+    )
+    if status in REQUEST_STATUSES:
         query = query.filter(InstructorRequest.status == status)
-    results = query.order_by(InstructorRequest.created_at.desc()).all()
+    results, headers = REQUEST_PAGES.page(REQUEST_PAGES.apply(query, page), page)
+    response.headers.update(headers)
     output: list[InstructorRequestAdminOut] = []
     for req in results:
         obj = InstructorRequestAdminOut(
@@ -95,6 +131,7 @@ def get_request(
     req = (
         db.query(InstructorRequest)
         .join(User, InstructorRequest.user_id == User.id)
+        .options(contains_eager(InstructorRequest.user))
         .filter(InstructorRequest.id == request_id)
         .first()
     )
@@ -134,6 +171,8 @@ def approve_request(
         db.add(user)
     db.add(req)
     db.commit()
+    if user:
+        revoke_user_sessions(db, user.id)
     return {"ok": True}
 
 
@@ -1,15 +1,22 @@
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Response, UploadFile, File
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
-from ..database import get_db
-from ..deps import get_current_user, require_instructor
+from ..core.acl import classroom_role_async
+from ..core.pagination import Keyset, PageParams, page_params
+from ..core.session_cache import CachedUser
+from ..database import get_async_db, get_db
+from ..deps import get_current_user_async, require_instructor
 from ..core.config import settings
 
 router = APIRouter(prefix="/materials", tags=["Materials"])
 
+MATERIAL_PAGES = Keyset(models.Material.created_at.desc(), models.Material.id.desc())
+
 
 def _ensure_classroom(db: Session, classroom_id: int) -> models.Classroom:
     classroom = db.query(models.Classroom).filter_by(id=classroom_id).first()
@@ -19,28 +26,23 @@ def _ensure_classroom(db: Session, classroom_id: int) -> models.Classroom:
 
 
 @router.get("/classroom/{classroom_id}", response_model=list[schemas.MaterialOut])
-def list_materials(
+async def list_materials(
     classroom_id: int,
-    db: Session = Depends(get_db),
-    user=Depends(get_current_user),
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
+    user: CachedUser = Depends(get_current_user_async),
 ):
-    # membership check: students must belong; instructors/admin allowed
-    classroom = _ensure_classroom(db, classroom_id)
-    if user.role not in (models.UserRole.admin, models.UserRole.instructor):
-        member = (
-            db.query(models.ClassroomMember)
-            .filter_by(classroom_id=classroom_id, user_id=user.id)
-            .first()
+    await classroom_role_async(db, classroom_id, user)
+    materials = await db.scalars(
+        MATERIAL_PAGES.apply(
+            select(models.Material).where(models.Material.classroom_id == classroom_id),
+            page,
         )
-        if not member:
-            raise HTTPException(status_code=403, detail="You are not enrolled in this class")
-    materials = (
-        db.query(models.Material)
-        .filter_by(classroom_id=classroom_id)
-        .order_by(models.Material.created_at.desc())
-        .all()
     )
-    return materials
+    items, headers = MATERIAL_PAGES.page(materials, page)
+    response.headers.update(headers)
+    return items
 
 
 @router.post("", response_model=schemas.MaterialOut)
@@ -1,19 +1,18 @@
 from fastapi import APIRouter, Depends
 
-from ..deps import get_current_user
-from ..models import User
+from ..core.session_cache import CachedUser
+from ..deps import get_current_user_async
 from ..schemas import UserOut
 
 router = APIRouter(prefix="/me", tags=["Me"])
 
 
 @router.get("", response_model=UserOut)
-def read_profile(user: User = Depends(get_current_user)):
+async def read_profile(user: CachedUser = Depends(get_current_user_async)):
     return {
         "id": user.id,
         "email": user.email,
         "role": user.role,
         "email_verified": user.email_verified,
-        "totp_enabled": bool(user.totp_enabled and user.totp_secret),
+        "totp_enabled": user.has_totp,
     }
-
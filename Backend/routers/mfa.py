@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from ..core.session_cache import session_cache
 from ..database import get_db
 from ..deps import get_current_user
 from ..models import User
@@ -43,6 +44,7 @@ def verify(body: MFAVerifyIn, db: Session = Depends(get_db)):
     user.totp_enabled = True
     db.add(user)
     db.commit()
+    session_cache.invalidate_user(user.id)
     return {"ok": True}
 
 
@@ -62,5 +64,6 @@ def disable(
     user.totp_enabled = False
     db.add(user)
     db.commit()
+    session_cache.invalidate_user(user.id)
     return {"ok": True}
 
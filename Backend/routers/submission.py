@@ -1,14 +1,28 @@
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 import re
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
-from ..database import get_db
-from ..deps import get_current_user, require_instructor
+from ..core.acl import classroom_role, classroom_role_async
+from ..core.exports import ListFormat, export_response
+from ..core.pagination import Keyset, PageParams, page_params
+from ..core.session_cache import CachedUser
+from ..database import get_async_db, get_db
+from ..deps import (
+    get_current_user,
+    get_current_user_async,
+    require_instructor,
+    require_instructor_async,
+)
 from ..core.config import settings
+from ..utils.assignment_stats import record_grade, record_submission
 
 router = APIRouter(prefix="/submissions", tags=["Submissions"])
 
@@ -20,23 +34,67 @@ def _get_assignment(db: Session, assignment_id: int) -> models.Assignment:
     return assignment
 
 
-def _ensure_membership(
-    db: Session, classroom_id: int, user: models.User, *, allow_instructor=True
-):
-    if user.role == models.UserRole.admin:
-        return
-    classroom = db.query(models.Classroom).filter_by(id=classroom_id).first()
-    if not classroom:
-        raise HTTPException(status_code=404, detail="Classroom not found")
-    if allow_instructor and classroom.instructor_id == user.id:
-        return
-    member = (
-        db.query(models.ClassroomMember)
-        .filter_by(classroom_id=classroom_id, user_id=user.id)
-        .first()
+# Submission listings skip the ORM: one Core select returns plain rows that
+# are turned into response models once and serialized by a prebuilt adapter,
+# instead of being validated three times (ORM -> SubmissionOut -> dict ->
+# SubmissionWithUser -> response_model).
+SUBMISSION_ROW_COLUMNS = (
+    models.Submission.id,
+    models.Submission.assignment_id,
+    models.Submission.user_id,
+    models.Submission.content,
+    models.Submission.grade,
+    models.Submission.submitted_at,
+    models.User.email.label("user_email"),
+)
+SUBMISSION_LIST_ADAPTER = TypeAdapter(list[schemas.SubmissionWithUser])
+
+SUBMISSION_PAGES = Keyset(models.Submission.submitted_at.desc(), models.Submission.id.desc())
+CLASSROOM_SUBMISSION_PAGES = Keyset(
+    models.Submission.assignment_id,
+    models.Submission.submitted_at.desc(),
+    models.Submission.id.desc(),
+)
+
+
+def _submission_rows():
+    return select(*SUBMISSION_ROW_COLUMNS).join(
+        models.User, models.Submission.user_id == models.User.id
+    )
+
+
+def _submission_list_response(rows, headers: dict[str, str] | None = None) -> Response:
+    # Rows come straight from the database, so model_construct skips
+    # validation; the response_model on the route only documents the shape.
+    items = [
+        schemas.SubmissionWithUser.model_construct(
+            **{**row._mapping, "content": _public_content(row.content)}
+        )
+        for row in rows
+    ]
+    return Response(
+        SUBMISSION_LIST_ADAPTER.dump_json(items), media_type="application/json", headers=headers
     )
-    if not member:
-        raise HTTPException(status_code=403, detail="You are not enrolled in this class")
+
+
+def _public_row(row: dict) -> dict:
+    row["content"] = _public_content(row["content"])
+    return row
+
+
+async def _submission_listing(
+    db: AsyncSession, query, keyset: Keyset, page: PageParams, fmt: ListFormat, filename: str
+) -> Response:
+    """One page of JSON, or with ``?format=ndjson|csv`` every row streamed."""
+    if fmt != "json":
+        return export_response(query.order_by(*keyset.order), fmt, filename, _public_row)
+    rows = await db.execute(keyset.apply(query, page))
+    return _submission_list_response(*keyset.page(rows, page))
+
+
+@lru_cache(maxsize=1)
+def _upload_root() -> Path:
+    return Path(settings.UPLOAD_DIR).resolve()
 
 
 def _public_content(value: str) -> str:
@@ -48,7 +106,10 @@ def _public_content(value: str) -> str:
         except Exception:
             return ""
     # If stored as an absolute path under UPLOAD_DIR, convert to /uploads URL
-    upload_dir = Path(settings.UPLOAD_DIR).resolve()
+    upload_dir = _upload_root()
+    if not value.startswith(str(upload_dir)):
+        # Cheap string check first: listings call this for every row.
+        return value
     try:
         p = Path(value)
         if p.is_absolute() and upload_dir in p.parents:
@@ -72,89 +133,70 @@ def create_submission(
     assignment = _get_assignment(db, payload.assignment_id)
     if assignment.due_date and datetime.utcnow() > assignment.due_date:
         raise HTTPException(status_code=400, detail="Past due date")
-    _ensure_membership(db, assignment.classroom_id, user)
+    classroom_role(db, assignment.classroom_id, user)
     submission = models.Submission(
         user_id=user.id, assignment_id=assignment.id, content=payload.content
     )
     db.add(submission)
+    db.flush()
+    record_submission(db, submission)
     db.commit()
     db.refresh(submission)
     return submission
 
 
 @router.get("/assignment/{assignment_id}", response_model=list[schemas.SubmissionWithUser])
-def list_submissions_for_assignment(
+async def list_submissions_for_assignment(
     assignment_id: int,
-    db: Session = Depends(get_db),
-    user=Depends(get_current_user),
+    page: PageParams = Depends(page_params),
+    fmt: ListFormat = Query("json", alias="format"),
+    db: AsyncSession = Depends(get_async_db),
+    user: CachedUser = Depends(get_current_user_async),
 ):
-    assignment = _get_assignment(db, assignment_id)
-    classroom = assignment.classroom
-    submissions = (
-        db.query(models.Submission)
-        .filter(models.Submission.assignment_id == assignment_id)
-        .order_by(models.Submission.submitted_at.desc(), models.Submission.id.desc())
-        .all()
+    classroom_id = await db.scalar(
+        select(models.Assignment.classroom_id).where(models.Assignment.id == assignment_id)
+    )
+    if classroom_id is None:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+    role = await classroom_role_async(db, classroom_id, user)
+    query = _submission_rows().where(models.Submission.assignment_id == assignment_id)
+    # The classroom's instructor and admins see every submission; students
+    # only their own, filtered in SQL rather than after loading the whole class.
+    if role == models.UserRole.student:
+        query = query.where(models.Submission.user_id == user.id)
+    return await _submission_listing(
+        db, query, SUBMISSION_PAGES, page, fmt, f"submissions-assignment-{assignment_id}"
     )
-    if not submissions:
-        return []
-    # If instructor/admin, return all submissions
-    if user.role == models.UserRole.admin or classroom.instructor_id == user.id:
-        result: list[schemas.SubmissionWithUser] = []
-        for sub in submissions:
-            data = schemas.SubmissionOut.model_validate(sub, from_attributes=True).model_dump()
-            data["content"] = _public_content(data.get("content", ""))
-            result.append(
-                schemas.SubmissionWithUser(
-                    **data,
-                    user_email=sub.user.email,
-                )
-            )
-        return result
-    _ensure_membership(db, assignment.classroom_id, user, allow_instructor=False)
-    own = [sub for sub in submissions if sub.user_id == user.id]
-    result: list[schemas.SubmissionWithUser] = []
-    for sub in own:
-        data = schemas.SubmissionOut.model_validate(sub, from_attributes=True).model_dump()
-        data["content"] = _public_content(data.get("content", ""))
-        result.append(
-            schemas.SubmissionWithUser(
-                **data,
-                user_email=sub.user.email,
-            )
-        )
-    return result
+
+
+@router.get("/mine", response_model=list[schemas.SubmissionWithUser])
+async def list_my_submissions(
+    page: PageParams = Depends(page_params),
+    fmt: ListFormat = Query("json", alias="format"),
+    db: AsyncSession = Depends(get_async_db),
+    user: CachedUser = Depends(get_current_user_async),
+):
+    query = _submission_rows().where(models.Submission.user_id == user.id)
+    return await _submission_listing(db, query, SUBMISSION_PAGES, page, fmt, "my-submissions")
 
 
 @router.get("/classroom/{classroom_id}", response_model=list[schemas.SubmissionWithUser])
-def list_submissions_for_classroom(
+async def list_submissions_for_classroom(
     classroom_id: int,
-    db: Session = Depends(get_db),
-    user=Depends(require_instructor),
+    page: PageParams = Depends(page_params),
+    fmt: ListFormat = Query("json", alias="format"),
+    db: AsyncSession = Depends(get_async_db),
+    user: CachedUser = Depends(require_instructor_async),
 ):
-    _ensure_membership(db, classroom_id, user)
-    submissions = (
-        db.query(models.Submission)
+    await classroom_role_async(db, classroom_id, user)
+    query = (
+        _submission_rows()
         .join(models.Assignment, models.Submission.assignment_id == models.Assignment.id)
-        .filter(models.Assignment.classroom_id == classroom_id)
-        .order_by(
-            models.Submission.assignment_id,
-            models.Submission.submitted_at.desc(),
-            models.Submission.id.desc(),
-        )
-        .all()
+        .where(models.Assignment.classroom_id == classroom_id)
+    )
+    return await _submission_listing(
+        db, query, CLASSROOM_SUBMISSION_PAGES, page, fmt, f"submissions-classroom-{classroom_id}"
     )
-    result: list[schemas.SubmissionWithUser] = []
-    for sub in submissions:
-        data = schemas.SubmissionOut.model_validate(sub, from_attributes=True).model_dump()
-        data["content"] = _public_content(data.get("content", ""))
-        result.append(
-            schemas.SubmissionWithUser(
-                **data,
-                user_email=sub.user.email,
-            )
-        )
-    return result
 
 
 @router.post("/{assignment_id}/upload", response_model=schemas.SubmissionOut)
@@ -165,7 +207,7 @@ async def upload_submission_file(
     user=Depends(get_current_user),
 ):
     assignment = _get_assignment(db, assignment_id)
-    _ensure_membership(db, assignment.classroom_id, user)
+    classroom_role(db, assignment.classroom_id, user)
 
     safe_name = re.sub(r"[^A-Za-z0-9._-]", "_", file.filename or "upload.bin")
     base_dir = Path(settings.UPLOAD_DIR) / "submissions" / f"assignment_{assignment_id}"
@@ -182,6 +224,8 @@ async def upload_submission_file(
         content=public_url,
     )
     db.add(submission)
+    db.flush()
+    record_submission(db, submission)
     db.commit()
     db.refresh(submission)
     return submission
@@ -202,9 +246,12 @@ def grade_submission(
     assignment = submission.assignment
     if not assignment:
         raise HTTPException(status_code=404, detail="Assignment not found")
-    _ensure_membership(db, assignment.classroom_id, instructor, allow_instructor=True)
+    classroom_role(db, assignment.classroom_id, instructor)
+    previous = submission.grade
     submission.grade = grade
     db.add(submission)
+    db.flush()
+    record_grade(db, submission, previous)
     db.commit()
     db.refresh(submission)
     return {"ok": True, "grade": submission.grade}
@@ -120,6 +120,50 @@ class SubmissionWithUser(SubmissionOut):
     user_email: EmailStr
 
 
+# submission_count counts every attempt; graded_count and the grade figures
+# cover each student's latest attempt only, matching the gradebook.
+class AssignmentStatsOut(BaseModel):
+    assignment_id: int
+    submission_count: int = 0
+    submitter_count: int = 0
+    graded_count: int = 0
+    mean_grade: Optional[float] = None
+    min_grade: Optional[float] = None
+    max_grade: Optional[float] = None
+    last_submitted_at: Optional[datetime] = None
+
+
+class GradebookStudent(BaseModel):
+    id: int
+    email: EmailStr
+
+
+class GradebookAssignment(BaseModel):
+    id: int
+    title: str
+    due_date: Optional[datetime] = None
+
+
+class AssignmentGradeStats(BaseModel):
+    assignment_id: int
+    submitted: int
+    graded: int
+    mean: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+
+# grades[i][j] / submission_ids[i][j] are students[i]'s latest submission for
+# assignments[j]; no submission id = not handed in, no grade = not graded yet.
+class Gradebook(BaseModel):
+    classroom_id: int
+    students: list[GradebookStudent]
+    assignments: list[GradebookAssignment]
+    grades: list[list[Optional[float]]]
+    submission_ids: list[list[Optional[int]]]
+    stats: list[AssignmentGradeStats]
+
+
 class MaterialBase(BaseModel):
     classroom_id: int
     title: str
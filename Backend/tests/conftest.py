@@ -0,0 +1,93 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+# Point the app at a throwaway database before Backend is imported.
+_tmp = Path(tempfile.mkdtemp(prefix="polylab-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp / 'test.db'}"
+os.environ["UPLOAD_DIR"] = str(_tmp / "uploads")
+os.environ["RATE_LIMIT_PER_MINUTE"] = "100000"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["SLOW_QUERY_LOG_PATH"] = str(_tmp / "slow_queries.jsonl")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from Backend.core.metrics import current_request
+from Backend.core.security import hash_password
+from Backend.database import SessionLocal, async_engine, engine
+from Backend.main import app
+from Backend.models import User, UserRole
+
+PASSWORD = "GoodPass1!"
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def make_user():
+    def _make(email: str, role: UserRole = UserRole.student) -> User:
+        db = SessionLocal()
+        try:
+            user = User(
+                email=email,
+                password_hash=hash_password(PASSWORD),
+                role=role,
+                email_verified=True,
+            )
+            db.add(user)
+            db.commit()
+            db.refresh(user)
+            db.expunge(user)
+            return user
+        finally:
+            db.close()
+
+    return _make
+
+
+@pytest.fixture
+def login():
+    def _login(client: TestClient, email: str) -> None:
+        res = client.post("/auth/login", json={"email": email, "password": PASSWORD})
+        assert res.status_code == 200, res.text
+        client.headers["x-csrf-token"] = client.cookies.get("csrf_token")
+
+    return _login
+
+
+@pytest.fixture
+def assert_max_queries():
+    """``with assert_max_queries(n): client.get(...)`` fails if requests ran more than n queries.
+
+    Only statements issued on behalf of a request are counted, so background
+    flushes and fixture setup do not make the budget flaky.
+    """
+
+    @contextmanager
+    def _assert(limit: int):
+        executed: list[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            if current_request.get() is not None:
+                executed.append(statement)
+
+        engines = (engine, async_engine.sync_engine)
+        for target in engines:
+            event.listen(target, "after_cursor_execute", _record)
+        try:
+            yield executed
+        finally:
+            for target in engines:
+                event.remove(target, "after_cursor_execute", _record)
+        assert len(executed) <= limit, (
+            f"{len(executed)} queries, expected at most {limit}:\n" + "\n".join(executed)
+        )
+
+    return _assert
@@ -0,0 +1,44 @@
+from Backend.core.acl import AclCache, acl_cache
+from Backend.database import SessionLocal
+from Backend.models import ClassroomMember, UserRole
+
+
+def test_lru_eviction_ttl_and_invalidation():
+    cache = AclCache(max_entries=2, ttl_seconds=60)
+    cache.put(1, {10: UserRole.student})
+    cache.put(2, {})
+    cache.put(3, {11: UserRole.instructor})
+    assert cache.get(1) is None
+    assert cache.get(3) == {11: UserRole.instructor}
+    cache.invalidate_user(3)
+    assert cache.get(3) is None
+    assert cache.stats()["evictions"] == 1 and cache.stats()["invalidations"] == 1
+
+    expired = AclCache(max_entries=10, ttl_seconds=0)
+    expired.put(1, {})
+    assert expired.get(1) is None
+
+
+def test_grants_missing_from_cache_are_rechecked(client, make_user, login):
+    make_user("acl-teacher@example.com", UserRole.instructor)
+    student = make_user("acl-student@example.com")
+    login(client, "acl-teacher@example.com")
+    classroom = client.post("/classrooms", json={"name": "ACL"}).json()
+    url = f"/assignments/classroom/{classroom['id']}"
+    assert client.get(url).status_code == 200
+
+    client.cookies.clear()
+    login(client, "acl-student@example.com")
+    assert client.get(url).status_code == 403
+    assert client.get("/assignments/classroom/999999").status_code == 404
+    assert acl_cache.get(student.id) == {}
+
+    # A join handled by another worker never reaches this process's cache.
+    db = SessionLocal()
+    try:
+        db.add(ClassroomMember(classroom_id=classroom["id"], user_id=student.id))
+        db.commit()
+    finally:
+        db.close()
+    assert client.get(url).status_code == 200
+    assert acl_cache.get(student.id) == {classroom["id"]: UserRole.student}
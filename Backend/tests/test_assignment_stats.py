@@ -0,0 +1,120 @@
+from sqlalchemy import delete, select
+
+from Backend.database import SessionLocal
+from Backend.models import Assignment, AssignmentStats, Classroom, ClassroomMember, UserRole
+from Backend.utils.assignment_stats import rebuild_assignment_stats
+
+
+def _assignment(make_user, prefix: str) -> int:
+    teacher = make_user(f"{prefix}-teacher@example.com", UserRole.instructor)
+    students = [make_user(f"{prefix}-s{i}@example.com") for i in range(2)]
+    db = SessionLocal()
+    try:
+        classroom = Classroom(name="Stats", code=f"{prefix.upper()}1", instructor_id=teacher.id)
+        db.add(classroom)
+        db.flush()
+        assignment = Assignment(title="HW", classroom_id=classroom.id)
+        db.add(assignment)
+        db.flush()
+        for user in [teacher, *students]:
+            db.add(ClassroomMember(classroom_id=classroom.id, user_id=user.id))
+        db.commit()
+        return assignment.id
+    finally:
+        db.close()
+
+
+def _stored(assignment_id: int) -> dict:
+    db = SessionLocal()
+    try:
+        row = db.get(AssignmentStats, assignment_id)
+        return {column: getattr(row, column) for column in AssignmentStats.__table__.columns.keys()}
+    finally:
+        db.close()
+
+
+def _rebuilt(assignment_id: int) -> dict:
+    db = SessionLocal()
+    try:
+        rebuild_assignment_stats(db, [assignment_id])
+        db.commit()
+    finally:
+        db.close()
+    return _stored(assignment_id)
+
+
+def test_writes_keep_stats_in_step(client, make_user, login, assert_max_queries):
+    assignment_id = _assignment(make_user, "st")
+    login(client, "st-s0@example.com")
+    first = client.post("/submissions", json={"assignment_id": assignment_id, "content": "first"}).json()
+    login(client, "st-s1@example.com")
+    upload = client.post(f"/submissions/{assignment_id}/upload", files={"file": ("a.txt", b"x")}).json()
+
+    login(client, "st-teacher@example.com")
+    client.post(f"/submissions/{first['id']}/grade", params={"grade": 50})
+    client.post(f"/submissions/{upload['id']}/grade", params={"grade": 95})
+
+    # A resubmission takes the place of the graded attempt it supersedes.
+    login(client, "st-s0@example.com")
+    second = client.post("/submissions", json={"assignment_id": assignment_id, "content": "second"}).json()
+    stored = _stored(assignment_id)
+    assert stored == _rebuilt(assignment_id)
+    assert (stored["graded_count"], stored["grade_sum"], stored["min_grade"]) == (1, 95, 95)
+
+    login(client, "st-teacher@example.com")
+    client.post(f"/submissions/{second['id']}/grade", params={"grade": 90})
+    # Regrading the top score must lower the maximum; regrading a
+    # superseded attempt changes nothing.
+    client.post(f"/submissions/{upload['id']}/grade", params={"grade": 70})
+    client.post(f"/submissions/{first['id']}/grade", params={"grade": 10})
+
+    stored = _stored(assignment_id)
+    assert stored == _rebuilt(assignment_id)
+
+    client.get(f"/assignments/{assignment_id}/stats")  # warm the ACL cache
+    with assert_max_queries(2) as executed:
+        res = client.get(f"/assignments/{assignment_id}/stats")
+    assert not [sql for sql in executed if "FROM submissions" in sql]
+    assert res.json() | {"last_submitted_at": None} == {
+        "assignment_id": assignment_id,
+        "submission_count": 3,
+        "submitter_count": 2,
+        "graded_count": 2,
+        "mean_grade": 80,
+        "min_grade": 70,
+        "max_grade": 90,
+        "last_submitted_at": None,
+    }
+
+    # Same numbers as the gradebook, which also counts latest attempts only.
+    classroom_id = client.get(f"/assignments/{assignment_id}").json()["classroom_id"]
+    gradebook = client.get(f"/classrooms/{classroom_id}/gradebook").json()["stats"][0]
+    assert gradebook == {
+        "assignment_id": assignment_id,
+        "submitted": 2,
+        "graded": res.json()["graded_count"],
+        "mean": res.json()["mean_grade"],
+        "min": res.json()["min_grade"],
+        "max": res.json()["max_grade"],
+    }
+
+    login(client, "st-s0@example.com")
+    assert client.get(f"/assignments/{assignment_id}/stats").status_code == 403
+
+
+def test_missing_row_is_rebuilt_on_next_write(client, make_user, login):
+    assignment_id = _assignment(make_user, "stm")
+    login(client, "stm-s0@example.com")
+    client.post("/submissions", json={"assignment_id": assignment_id, "content": "a"})
+    db = SessionLocal()
+    try:
+        db.execute(delete(AssignmentStats).where(AssignmentStats.assignment_id == assignment_id))
+        db.commit()
+        assert db.scalar(select(AssignmentStats).where(AssignmentStats.assignment_id == assignment_id)) is None
+    finally:
+        db.close()
+
+    client.post("/submissions", json={"assignment_id": assignment_id, "content": "b"})
+
+    assert _stored(assignment_id)["submission_count"] == 2
+    assert _stored(assignment_id)["submitter_count"] == 1
@@ -0,0 +1,88 @@
+from pathlib import Path
+
+import pytest
+
+from Backend import schemas
+from Backend.core import security
+from Backend.core.config import settings
+from Backend.core.signed_sessions import issue_token
+from Backend.database import SessionLocal, async_database_url
+from Backend.models import Submission, UserRole
+
+
+def test_async_database_url_maps_drivers():
+    assert async_database_url("sqlite:///./polylab.db") == "sqlite+aiosqlite:///./polylab.db"
+    assert (
+        async_database_url("postgresql+psycopg2://u:p@db:5432/app")
+        == "postgresql+asyncpg://u:p@db:5432/app"
+    )
+    with pytest.raises(ValueError):
+        async_database_url("mssql+pyodbc://db/app")
+
+
+def test_async_read_endpoints(client, make_user, login):
+    make_user("async-teacher@example.com", UserRole.instructor)
+    make_user("async-student@example.com")
+    login(client, "async-teacher@example.com")
+    classroom = client.post("/classrooms", json={"name": "Async"}).json()
+    assignment = client.post(
+        "/assignments", json={"title": "HW", "classroom_id": classroom["id"]}
+    ).json()
+
+    me = client.get("/me").json()
+    assert me["email"] == "async-teacher@example.com" and me["totp_enabled"] is False
+    assert [c["id"] for c in client.get("/classrooms").json()] == [classroom["id"]]
+    listed = client.get(f"/assignments/classroom/{classroom['id']}").json()
+    assert [a["id"] for a in listed] == [assignment["id"]]
+    assert client.get(f"/assignments/{assignment['id']}").json()["title"] == "HW"
+    assert client.get(f"/materials/classroom/{classroom['id']}").json() == []
+    assert client.get(f"/submissions/classroom/{classroom['id']}").json() == []
+
+    client.cookies.clear()
+    login(client, "async-student@example.com")
+    assert client.get(f"/assignments/classroom/{classroom['id']}").status_code == 403
+    assert client.get(f"/materials/classroom/{classroom['id']}").status_code == 403
+    assert client.get(f"/submissions/classroom/{classroom['id']}").status_code == 403
+    assert client.get("/assignments/999999").status_code == 404
+    client.post("/classrooms/join", json={"code": classroom["code"]})
+    assert client.get(f"/materials/classroom/{classroom['id']}").status_code == 200
+    assert client.get(f"/submissions/assignment/{assignment['id']}").json() == []
+
+
+def test_async_me_with_signed_sessions(client, make_user, monkeypatch, assert_max_queries):
+    user = make_user("async-signed@example.com")
+    monkeypatch.setattr(security.settings, "SESSION_MODE", "signed")
+    client.cookies.set("session_id", issue_token(user.id, user.role))
+    res = client.get("/me")
+    assert res.status_code == 200 and res.json()["email"] == "async-signed@example.com"
+    # Warm: claims, cached revocation check and cached snapshot, no queries.
+    with assert_max_queries(0):
+        assert client.get("/me").status_code == 200
+    client.cookies.set("session_id", "forged.token")
+    assert client.get("/me").status_code == 401
+
+
+def test_submission_listing_rows(client, make_user, login):
+    make_user("rows-teacher@example.com", UserRole.instructor)
+    student = make_user("rows-student@example.com")
+    login(client, "rows-teacher@example.com")
+    classroom = client.post("/classrooms", json={"name": "Rows"}).json()
+    assignment = client.post(
+        "/assignments", json={"title": "HW", "classroom_id": classroom["id"]}
+    ).json()
+    stored = Path(settings.UPLOAD_DIR).resolve() / "submissions" / "a.pdf"
+    db = SessionLocal()
+    try:
+        db.add(Submission(user_id=student.id, assignment_id=assignment["id"], content=str(stored)))
+        db.commit()
+    finally:
+        db.close()
+
+    for url in (
+        f"/submissions/assignment/{assignment['id']}",
+        f"/submissions/classroom/{classroom['id']}",
+    ):
+        [row] = client.get(url).json()
+        parsed = schemas.SubmissionWithUser.model_validate(row)
+        assert parsed.user_email == "rows-student@example.com"
+        assert parsed.content == "/uploads/submissions/a.pdf" and parsed.grade is None
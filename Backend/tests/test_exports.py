@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+
+from Backend.database import SessionLocal
+from Backend.models import Assignment, Classroom, ClassroomMember, Submission, UserRole
+
+
+def _classroom(make_user) -> int:
+    teacher = make_user("export-teacher@example.com", UserRole.instructor)
+    students = [make_user(f"export-s{i}@example.com") for i in range(3)]
+    db = SessionLocal()
+    try:
+        classroom = Classroom(name="Export", code="EXPRT1", instructor_id=teacher.id)
+        db.add(classroom)
+        db.flush()
+        assignment = Assignment(title="HW", classroom_id=classroom.id)
+        db.add(assignment)
+        db.flush()
+        for student in students:
+            db.add(ClassroomMember(classroom_id=classroom.id, user_id=student.id))
+            db.add(Submission(user_id=student.id, assignment_id=assignment.id, content="=1+1"))
+        db.commit()
+        return classroom.id
+    finally:
+        db.close()
+
+
+def test_submission_exports_match_json_listing(client, make_user, login):
+    classroom_id = _classroom(make_user)
+    login(client, "export-teacher@example.com")
+    url = f"/submissions/classroom/{classroom_id}"
+    listing = client.get(url).json()
+
+    res = client.get(url, params={"format": "ndjson"})
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/x-ndjson"
+    assert "attachment" in res.headers["content-disposition"]
+    rows = [json.loads(line) for line in res.text.splitlines()]
+    assert rows == listing
+
+    res = client.get(url, params={"format": "csv"})
+    assert res.headers["content-type"].startswith("text/csv")
+    table = list(csv.DictReader(io.StringIO(res.text)))
+    assert [int(row["id"]) for row in table] == [row["id"] for row in listing]
+    assert table[0]["user_email"].startswith("export-s")
+    assert table[0]["grade"] == "" and table[0]["content"] == "'=1+1"
+
+    assert client.get(url, params={"format": "xml"}).status_code == 422
+
+
+def test_admin_exports(client, make_user, login):
+    make_user("export-admin@example.com", UserRole.admin)
+    login(client, "export-admin@example.com")
+
+    users = list(csv.DictReader(io.StringIO(client.get("/admin/users", params={"format": "csv"}).text)))
+    assert list(users[0]) == ["id", "email", "role", "email_verified", "totp_enabled"]
+    admin_row = next(row for row in users if row["email"] == "export-admin@example.com")
+    assert admin_row["role"] == "admin"
+
+    res = client.get("/admin/roles/requests", params={"format": "ndjson", "status": "pending"})
+    assert res.status_code == 200
+    for line in res.text.splitlines():
+        assert json.loads(line)["status"] == "pending"
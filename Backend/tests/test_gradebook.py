@@ -0,0 +1,71 @@
+import csv
+import io
+from datetime import datetime, timedelta
+
+from Backend.database import SessionLocal
+from Backend.models import Assignment, Classroom, ClassroomMember, Submission, UserRole
+
+
+def _gradebook_classroom(make_user, prefix: str) -> tuple[int, list[int]]:
+    teacher = make_user(f"{prefix}-teacher@example.com", UserRole.instructor)
+    students = [make_user(f"{prefix}-s{i}@example.com") for i in range(3)]
+    earlier = datetime.utcnow() - timedelta(days=1)
+    db = SessionLocal()
+    try:
+        classroom = Classroom(name="Gradebook", code=f"{prefix.upper()}1", instructor_id=teacher.id)
+        db.add(classroom)
+        db.flush()
+        hw1 = Assignment(title="HW1", classroom_id=classroom.id, created_at=earlier)
+        hw2 = Assignment(title="=HW2", classroom_id=classroom.id)
+        db.add_all([hw1, hw2])
+        db.flush()
+        for user in [teacher, *students]:
+            db.add(ClassroomMember(classroom_id=classroom.id, user_id=user.id))
+        db.add_all([
+            # A resubmission replaces the earlier graded attempt.
+            Submission(user_id=students[0].id, assignment_id=hw1.id, content="a", grade=50, submitted_at=earlier),
+            Submission(user_id=students[0].id, assignment_id=hw1.id, content="b", grade=90),
+            Submission(user_id=students[1].id, assignment_id=hw1.id, content="c", grade=70),
+            Submission(user_id=students[1].id, assignment_id=hw2.id, content="d"),
+            # The instructor is not on the roster.
+            Submission(user_id=teacher.id, assignment_id=hw2.id, content="e", grade=100),
+        ])
+        db.commit()
+        return classroom.id, [hw1.id, hw2.id]
+    finally:
+        db.close()
+
+
+def test_gradebook_matrix_and_stats(client, make_user, login, assert_max_queries):
+    classroom_id, (hw1, hw2) = _gradebook_classroom(make_user, "gb")
+    login(client, "gb-teacher@example.com")
+    url = f"/classrooms/{classroom_id}/gradebook"
+    client.get(url)  # warm the ACL cache
+
+    with assert_max_queries(4) as executed:
+        res = client.get(url)
+    assert res.status_code == 200
+    assert sum("row_number()" in sql.lower() for sql in executed) == 1
+    book = res.json()
+    assert [s["email"] for s in book["students"]] == [f"gb-s{i}@example.com" for i in range(3)]
+    assert [a["id"] for a in book["assignments"]] == [hw1, hw2]
+    assert book["grades"] == [[90, None], [70, None], [None, None]]
+    assert [[sub is not None for sub in row] for row in book["submission_ids"]] == [
+        [True, False], [True, True], [False, False]
+    ]
+    assert book["stats"] == [
+        {"assignment_id": hw1, "submitted": 2, "graded": 2, "mean": 80, "min": 70, "max": 90},
+        {"assignment_id": hw2, "submitted": 1, "graded": 0, "mean": None, "min": None, "max": None},
+    ]
+
+    res = client.get(url, params={"format": "csv"})
+    assert res.headers["content-disposition"].endswith('.csv"')
+    table = list(csv.reader(io.StringIO(res.text)))
+    assert table[0] == ["student_id", "email", f"HW1 (#{hw1})", f"'=HW2 (#{hw2})"]
+    assert table[1][1:] == ["gb-s0@example.com", "90.0", ""]
+
+
+def test_students_cannot_read_gradebook(client, make_user, login):
+    classroom_id, _ = _gradebook_classroom(make_user, "gb-acl")
+    login(client, "gb-acl-s0@example.com")
+    assert client.get(f"/classrooms/{classroom_id}/gradebook").status_code == 403
@@ -0,0 +1,73 @@
+from Backend.core.config import settings
+from Backend.core.login_guard import FailureTracker
+
+
+def test_backoff_grows_and_decays():
+    tracker = FailureTracker(
+        max_keys=10, threshold=3, base_delay=1.0, max_delay=60.0, half_life=100.0
+    )
+    for _ in range(3):
+        tracker.record_failure("k", now=0.0)
+    assert 0.9 < tracker.retry_after("k", now=0.0) <= 1.0
+    tracker.record_failure("k", now=0.0)
+    assert 1.9 < tracker.retry_after("k", now=0.0) <= 2.0
+    # After several half-lives the score drops below the threshold again
+    assert tracker.retry_after("k", now=500.0) == 0.0
+
+
+def test_threshold_failure_blocks_despite_decay():
+    tracker = FailureTracker(
+        max_keys=10, threshold=3, base_delay=1.0, max_delay=60.0, half_life=100.0
+    )
+    for now in (0.0, 1.0, 2.0):
+        tracker.record_failure("k", now=now)
+    assert tracker.retry_after("k", now=2.0) > 0.9
+
+
+def test_threshold_failure_blocks_at_typing_speed():
+    tracker = FailureTracker(
+        max_keys=10,
+        threshold=settings.LOGIN_GUARD_ACCOUNT_THRESHOLD,
+        base_delay=settings.LOGIN_GUARD_BASE_DELAY_SECONDS,
+        max_delay=settings.LOGIN_GUARD_MAX_DELAY_SECONDS,
+        half_life=settings.LOGIN_GUARD_HALF_LIFE_SECONDS,
+    )
+    now = 0.0
+    for _ in range(settings.LOGIN_GUARD_ACCOUNT_THRESHOLD - 1):
+        tracker.record_failure("k", now=now)
+        assert tracker.retry_after("k", now=now) == 0.0
+        now += 15.0
+    tracker.record_failure("k", now=now)
+    assert tracker.retry_after("k", now=now) == settings.LOGIN_GUARD_BASE_DELAY_SECONDS
+    # Failures long apart decay by whole failures and never block.
+    tracker.reset("k")
+    for i in range(settings.LOGIN_GUARD_ACCOUNT_THRESHOLD * 2):
+        now = i * settings.LOGIN_GUARD_HALF_LIFE_SECONDS * 2
+        tracker.record_failure("k", now=now)
+        assert tracker.retry_after("k", now=now) == 0.0
+
+
+def test_key_table_is_bounded():
+    tracker = FailureTracker(
+        max_keys=2, threshold=1, base_delay=1.0, max_delay=60.0, half_life=100.0
+    )
+    for key in ("a", "b", "c"):
+        tracker.record_failure(key)
+    assert len(tracker) == 2
+    assert tracker.retry_after("a") == 0.0
+
+
+def test_login_rejected_before_hashing(client, make_user, monkeypatch):
+    user = make_user("guarded@example.com")
+    # Real time passes between attempts, so the score decays slightly.
+    for _ in range(settings.LOGIN_GUARD_ACCOUNT_THRESHOLD):
+        res = client.post("/auth/login", json={"email": user.email, "password": "Wrong1!x"})
+        assert res.status_code == 401
+
+    def _no_hashing(*args, **kwargs):
+        raise AssertionError("argon2 should not run for a throttled account")
+
+    monkeypatch.setattr("Backend.routers.auth.verify_and_update_password", _no_hashing)
+    res = client.post("/auth/login", json={"email": user.email, "password": "Wrong1!x"})
+    assert res.status_code == 429
+    assert int(res.headers["retry-after"]) >= 1
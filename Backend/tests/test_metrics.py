@@ -0,0 +1,37 @@
+from Backend.core.metrics import Histogram, metrics
+from Backend.models import UserRole
+
+
+def test_histogram_bucket_assignment():
+    hist = Histogram()
+    for value in (0.001, 0.02, 0.02, 30.0):
+        hist.observe(value)
+    assert hist.count == 4 and hist.counts[0] == 1 and hist.counts[-1] == 1
+
+
+def test_metrics_endpoint_reports_routes_db_and_argon2(client, make_user, login):
+    metrics.reset()
+    make_user("metrics-admin@example.com", UserRole.admin)
+    assert client.get("/metrics").status_code == 401
+    login(client, "metrics-admin@example.com")
+    client.get("/me")
+    client.get("/assignments/999999")
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    body = res.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/me",status="200"} 1' in body
+    # Series use the route template, not the concrete path.
+    assert 'route="/assignments/{assignment_id}"' in body
+    assert "/assignments/999999" not in body
+    assert 'http_request_db_queries_total{method="POST",route="/auth/login",status="200"}' in body
+    assert "db_query_duration_seconds_count" in body
+    assert "password_hash_operations_total" in body
+    assert "http_requests_in_flight 1" in body  # the /metrics request itself
+
+
+def test_non_admin_cannot_read_metrics(client, make_user, login):
+    make_user("metrics-student@example.com")
+    login(client, "metrics-student@example.com")
+    assert client.get("/metrics").status_code == 403
@@ -0,0 +1,115 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+
+from Backend.database import Base
+from Backend.migrations import current_version, discover, ensure_current, head, upgrade
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def blank_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _columns(engine, table: str) -> set[str]:
+    return {col["name"] for col in inspect(engine).get_columns(table)}
+
+
+def test_versions_are_contiguous():
+    assert [m.version for m in discover()] == list(range(1, head() + 1))
+
+
+def test_fresh_database_matches_models(blank_engine):
+    applied = upgrade(blank_engine)
+
+    assert [m.version for m in applied] == list(range(1, head() + 1))
+    for table in Base.metadata.sorted_tables:
+        assert _columns(blank_engine, table.name) == {c.name for c in table.columns}
+        indexes = {ix["name"] for ix in inspect(blank_engine).get_indexes(table.name)}
+        assert indexes >= {ix.name for ix in table.indexes}
+    with blank_engine.connect() as conn:
+        assert current_version(conn) == head()
+    assert upgrade(blank_engine) == []
+
+
+def test_legacy_database_is_brought_forward(blank_engine):
+    # Schema as created by create_all before attachments and hashed tokens.
+    upgrade(blank_engine, target=1)
+    with blank_engine.begin() as conn:
+        conn.execute(text("DROP TABLE schema_version"))
+        conn.execute(
+            text(
+                "INSERT INTO users (email, password_hash, role, totp_enabled) "
+                "VALUES ('old@example.com', 'x', 'student', 0)"
+            )
+        )
+    assert "attachment_url" not in _columns(blank_engine, "assignments")
+    assert "token" in _columns(blank_engine, "tokens")
+
+    upgrade(blank_engine)
+
+    assert "attachment_url" in _columns(blank_engine, "assignments")
+    assert _columns(blank_engine, "tokens") == {"id", "user_id", "token_hash", "purpose", "expires_at"}
+    with blank_engine.connect() as conn:
+        assert conn.execute(text("SELECT email FROM users")).scalar() == "old@example.com"
+
+
+def test_startup_check_is_one_query_when_current(blank_engine):
+    upgrade(blank_engine)
+    statements = []
+    event.listen(blank_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    ensure_current(blank_engine, migrate=False)
+
+    assert len(statements) == 1 and "schema_version" in statements[0]
+
+
+def test_startup_refuses_stale_schema_without_migrate(blank_engine):
+    with pytest.raises(RuntimeError, match="expected"):
+        ensure_current(blank_engine, migrate=False)
+
+    ensure_current(blank_engine, migrate=True)
+    with blank_engine.connect() as conn:
+        assert current_version(conn) == head()
+
+
+def test_concurrent_workers_migrate_once(tmp_path):
+    db_path = tmp_path / "race.db"
+    gate = tmp_path / "go"
+    # Each process waits for the gate so they all reach upgrade() together,
+    # like uvicorn workers booting against a fresh database.
+    script = textwrap.dedent(f"""
+        import time
+        from pathlib import Path
+        from sqlalchemy import create_engine
+        from Backend.migrations import upgrade
+        while not Path({str(gate)!r}).exists():
+            time.sleep(0.005)
+        engine = create_engine({f"sqlite:///{db_path}"!r}, connect_args={{"timeout": 30}})
+        print(len(upgrade(engine)))
+    """)
+    workers = [
+        subprocess.Popen([sys.executable, "-c", script], cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True)
+        for _ in range(4)
+    ]
+    gate.touch()
+    applied = [int(worker.communicate(timeout=60)[0]) for worker in workers]
+
+    assert all(worker.returncode == 0 for worker in workers)
+    assert sum(applied) == head()
+    engine = create_engine(f"sqlite:///{db_path}")
+    try:
+        with engine.connect() as conn:
+            versions = conn.execute(text("SELECT version FROM schema_version")).scalars().all()
+        assert sorted(versions) == list(range(1, head() + 1))
+    finally:
+        engine.dispose()
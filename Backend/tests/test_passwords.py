@@ -0,0 +1,63 @@
+import pytest
+from fastapi import HTTPException
+from passlib.hash import argon2
+
+from Backend.core.passwords import PasswordService, pwd_context
+from Backend.database import SessionLocal
+from Backend.models import User
+
+from conftest import PASSWORD
+
+
+def test_process_pool_hash_and_verify():
+    service = PasswordService(workers=1, queue_depth=1)
+    try:
+        hashed = service.hash("GoodPass1!")
+        assert service.verify("GoodPass1!", hashed)
+        assert not service.verify("WrongPass1!", hashed)
+        stats = service.stats()
+        assert stats["completed"] == 3 and stats["in_flight"] == 0
+    finally:
+        service.shutdown()
+
+
+def test_full_queue_fails_fast():
+    service = PasswordService(workers=0, queue_depth=0)
+    service._slots.acquire()
+    with pytest.raises(HTTPException) as exc:
+        service.hash("GoodPass1!")
+    assert exc.value.status_code == 503
+    assert exc.value.headers == {"Retry-After": "1"}
+    assert service.stats()["rejected"] == 1
+
+
+def test_dead_worker_returns_503_and_recovers():
+    service = PasswordService(workers=1, queue_depth=1)
+    try:
+        hashed = service.hash("GoodPass1!")
+        for process in list(service._pool()._processes.values()):
+            process.kill()
+            process.join()
+        with pytest.raises(HTTPException) as exc:
+            service.verify("GoodPass1!", hashed)
+        assert exc.value.status_code == 503
+        assert exc.value.headers == {"Retry-After": "1"}
+        assert service.verify("GoodPass1!", hashed)
+    finally:
+        service.shutdown()
+
+
+def test_login_rehashes_outdated_parameters(client, make_user, login):
+    user = make_user("rehash@example.com")
+    old_hash = argon2.using(time_cost=1, memory_cost=8192, parallelism=1).hash(PASSWORD)
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.id == user.id).update({"password_hash": old_hash})
+        db.commit()
+        login(client, user.email)
+        db.expire_all()
+        new_hash = db.get(User, user.id).password_hash
+    finally:
+        db.close()
+    assert new_hash != old_hash
+    assert not pwd_context.needs_update(new_hash)
@@ -0,0 +1,108 @@
+from Backend.database import SessionLocal
+from Backend.models import (
+    Assignment,
+    Classroom,
+    ClassroomMember,
+    InstructorRequest,
+    Submission,
+    UserRole,
+)
+
+STUDENTS = 6
+
+
+def _classroom_with_submissions(make_user, prefix: str) -> tuple[int, int]:
+    instructor = make_user(f"{prefix}-teacher@example.com", UserRole.instructor)
+    students = [make_user(f"{prefix}-s{i}@example.com") for i in range(STUDENTS)]
+    db = SessionLocal()
+    try:
+        classroom = Classroom(name="Algebra", code=f"{prefix[:6].upper()}Q", instructor_id=instructor.id)
+        db.add(classroom)
+        db.flush()
+        assignment = Assignment(title="HW", classroom_id=classroom.id)
+        db.add(assignment)
+        db.flush()
+        for student in students:
+            db.add(ClassroomMember(classroom_id=classroom.id, user_id=student.id))
+            db.add(Submission(user_id=student.id, assignment_id=assignment.id, content="x"))
+        db.commit()
+        return classroom.id, assignment.id
+    finally:
+        db.close()
+
+
+def test_submission_lists_do_not_lazy_load_per_row(client, make_user, login, assert_max_queries):
+    classroom_id, assignment_id = _classroom_with_submissions(make_user, "qc-sub")
+    login(client, "qc-sub-teacher@example.com")
+    client.get(f"/submissions/assignment/{assignment_id}")  # warm the ACL cache
+
+    with assert_max_queries(3):
+        res = client.get(f"/submissions/assignment/{assignment_id}")
+    assert res.status_code == 200 and len(res.json()) == STUDENTS
+    assert res.json()[0]["user_email"].startswith("qc-sub-s")
+
+    with assert_max_queries(3):
+        res = client.get(f"/submissions/classroom/{classroom_id}")
+    assert res.status_code == 200 and len(res.json()) == STUDENTS
+
+
+def test_student_membership_check_is_one_query(client, make_user, login, assert_max_queries):
+    _, assignment_id = _classroom_with_submissions(make_user, "qc-mem")
+    login(client, "qc-mem-s0@example.com")
+    with assert_max_queries(4) as executed:
+        res = client.get(f"/submissions/assignment/{assignment_id}")
+    assert res.status_code == 200 and len(res.json()) == 1
+    assert sum("classroom_members" in sql for sql in executed) == 1
+
+
+def test_instructor_requests_list_joins_users(client, make_user, login, assert_max_queries):
+    make_user("qc-admin@example.com", UserRole.admin)
+    users = [make_user(f"qc-req{i}@example.com") for i in range(STUDENTS)]
+    db = SessionLocal()
+    try:
+        for user in users:
+            db.add(InstructorRequest(user_id=user.id, file_path="/uploads/proofs/x.pdf"))
+        db.commit()
+    finally:
+        db.close()
+    login(client, "qc-admin@example.com")
+    with assert_max_queries(3):
+        res = client.get("/admin/roles/requests")
+    assert res.status_code == 200 and len(res.json()) >= STUDENTS
+
+
+def test_server_timing_header_in_debug(client):
+    res = client.get("/health")
+    assert res.headers["server-timing"].startswith("db;dur=")
+
+
+def test_student_submissions_filtered_in_sql(client, make_user, login, assert_max_queries):
+    _, assignment_id = _classroom_with_submissions(make_user, "qc-own")
+    login(client, "qc-own-s1@example.com")
+    with assert_max_queries(4) as executed:
+        res = client.get(f"/submissions/assignment/{assignment_id}")
+    assert [row["user_email"] for row in res.json()] == ["qc-own-s1@example.com"]
+    listing = next(sql for sql in executed if "FROM submissions" in sql)
+    assert "submissions.user_id = " in listing
+
+    with assert_max_queries(2):
+        res = client.get("/submissions/mine")
+    assert res.status_code == 200
+    assert [row["assignment_id"] for row in res.json()] == [assignment_id]
+
+
+def test_warm_classroom_page_skips_membership_queries(client, make_user, login, assert_max_queries):
+    classroom_id, assignment_id = _classroom_with_submissions(make_user, "qc-acl")
+    login(client, "qc-acl-s2@example.com")
+    page = (
+        f"/assignments/classroom/{classroom_id}",
+        f"/materials/classroom/{classroom_id}",
+        f"/submissions/assignment/{assignment_id}",
+    )
+    for url in page:
+        assert client.get(url).status_code == 200
+
+    with assert_max_queries(6) as executed:
+        for url in page:
+            assert client.get(url).status_code == 200
+    assert not [sql for sql in executed if "classroom_members" in sql or "FROM classrooms" in sql]
@@ -0,0 +1,79 @@
+import asyncio
+
+import anyio
+from Backend.core.ratelimit import GcraLimiter, SqliteGcraLimiter, request_cost
+
+
+def test_gcra_allows_limit_per_window_then_refills():
+    limiter = GcraLimiter(limit=10, window=60, max_keys=100)
+    assert all(limiter.hit("ip", now=0.0) == 0 for _ in range(10))
+    assert limiter.hit("ip", now=0.0) > 0
+    # One unit refills every window / limit seconds
+    assert limiter.hit("ip", now=6.0) == 0
+    assert limiter.hit("ip", now=6.0) > 0
+
+
+def test_weighted_cost_and_bounded_keys():
+    limiter = GcraLimiter(limit=10, window=60, max_keys=2)
+    assert limiter.hit("a", cost=5, now=0.0) == 0
+    assert limiter.hit("a", cost=5, now=0.0) == 0
+    assert limiter.hit("a", cost=1, now=0.0) > 0
+    limiter.hit("b", now=0.0)
+    limiter.hit("c", now=0.0)
+    assert len(limiter) == 2
+
+
+def test_request_cost_table():
+    assert request_cost("GET", "/assets/index.js") == 0
+    assert request_cost("GET", "/classrooms") == 1
+    assert request_cost("POST", "/auth/login") == 5
+    assert request_cost("POST", "/submissions/3/upload") == 5
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "ratelimit.db")
+    first = SqliteGcraLimiter(path, limit=4, window=60)
+    second = SqliteGcraLimiter(path, limit=4, window=60)
+    now = 1_000_000.0
+    assert first.hit("ip", now=now) == 0
+    assert second.hit("ip", cost=3, now=now) == 0
+    assert first.hit("ip", now=now) > 0
+    assert second.hit("ip", now=now + 15) == 0
+
+
+def test_middleware_runs_shared_store_off_the_event_loop(client, tmp_path, monkeypatch):
+    store = SqliteGcraLimiter(str(tmp_path / "ratelimit.db"), limit=1000, window=60)
+    on_loop = []
+    hit = store.hit
+
+    def _hit(key, cost=1, now=None):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return hit(key, cost, now)
+
+    monkeypatch.setattr(store, "hit", _hit)
+    monkeypatch.setattr("Backend.middleware.security.limiter", store)
+    assert client.get("/classrooms").status_code == 401
+    assert on_loop == [False]
+    assert len(store) == 1
+
+
+def test_shared_store_does_not_wait_for_the_default_threadpool(tmp_path):
+    store = SqliteGcraLimiter(str(tmp_path / "ratelimit.db"), limit=1000, window=60)
+
+    async def _hit_with_pool_exhausted():
+        default = anyio.to_thread.current_default_thread_limiter()
+        borrowers = [object() for _ in range(int(default.total_tokens))]
+        for borrower in borrowers:
+            await default.acquire_on_behalf_of(borrower)
+        try:
+            with anyio.fail_after(5):
+                return await store.hit_async("ip")
+        finally:
+            for borrower in borrowers:
+                default.release_on_behalf_of(borrower)
+
+    assert anyio.run(_hit_with_pool_exhausted) == 0
@@ -0,0 +1,31 @@
+from Backend.core import ratelimit
+from Backend.core.ratelimit import GcraLimiter
+
+
+def test_security_headers_on_every_response(client):
+    res = client.get("/health")
+    assert res.headers["x-frame-options"] == "DENY"
+    assert "frame-ancestors 'none'" in res.headers["content-security-policy"]
+
+
+def test_csrf_required_for_unsafe_methods(client):
+    client.cookies.set("csrf_token", "abc")
+    res = client.post("/classrooms/join", json={"code": "X"})
+    assert res.status_code == 403 and res.json() == {"detail": "CSRF check failed"}
+    assert res.headers["x-content-type-options"] == "nosniff"
+    res = client.post("/classrooms/join", json={"code": "X"}, headers={"x-csrf-token": "abc"})
+    assert res.status_code == 401
+    # Exempt prefixes skip the check entirely
+    assert client.post("/auth/logout").status_code == 200
+
+
+def test_rate_limit_rejection_and_static_exemption(client, monkeypatch):
+    monkeypatch.setattr(
+        "Backend.middleware.security.limiter", GcraLimiter(limit=2, window=60, max_keys=10)
+    )
+    assert client.get("/assignments/templates").status_code == 200
+    assert client.get("/assignments/templates").status_code == 200
+    res = client.get("/assignments/templates")
+    assert res.status_code == 429 and int(res.headers["retry-after"]) >= 1
+    assert res.headers["x-frame-options"] == "DENY"
+    assert ratelimit.request_cost("GET", "/assets/app.js") == 0
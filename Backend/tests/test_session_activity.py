@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
+
+from Backend.core.background import PeriodicTask
+from Backend.core.config import Settings, settings
+from Backend.core.session_activity import SessionActivity, session_activity
+from Backend.core.session_cache import session_cache
+from Backend.database import SessionLocal
+from Backend.models import Session as DBSession
+
+
+def test_activity_extends_session_in_one_flush(client, make_user, login):
+    user = make_user("sliding@example.com")
+    login(client, user.email)
+    sid = client.cookies.get(settings.SESSION_COOKIE_NAME)
+    soon = datetime.utcnow() + timedelta(seconds=5)
+    db = SessionLocal()
+    try:
+        db.query(DBSession).filter(DBSession.id == sid).update({"expires_at": soon})
+        db.commit()
+        session_cache.invalidate_session(sid)
+
+        first = client.get("/me")
+        assert first.status_code == 200
+        assert settings.SESSION_COOKIE_NAME in first.headers.get("set-cookie", "")
+        second = client.get("/me")
+        assert "set-cookie" not in second.headers
+
+        assert session_activity.run_once() >= 1
+        db.expire_all()
+        assert db.get(DBSession, sid).expires_at > soon + timedelta(minutes=1)
+    finally:
+        db.close()
+
+
+def test_unflushed_activity_keeps_session_alive(client, make_user, login):
+    user = make_user("sliding-pending@example.com")
+    login(client, user.email)
+    sid = client.cookies.get(settings.SESSION_COOKIE_NAME)
+    assert client.get("/me").status_code == 200
+    db = SessionLocal()
+    try:
+        past = datetime.utcnow() - timedelta(seconds=1)
+        db.query(DBSession).filter(DBSession.id == sid).update({"expires_at": past})
+        db.commit()
+    finally:
+        db.close()
+    session_cache.invalidate_session(sid)
+    assert client.get("/me").status_code == 200
+    session_activity.forget(sid)
+    session_cache.invalidate_session(sid)
+    assert client.get("/me").status_code == 401
+
+
+def test_cookie_refresh_reaches_handlers_returning_their_own_response(client, make_user, login):
+    user = make_user("sliding-listing@example.com")
+    login(client, user.email)
+    session_activity.run_once()
+
+    # /submissions/mine returns a prebuilt Response, which the dependency's
+    # injected Response never reaches.
+    listing = client.get("/submissions/mine")
+    assert listing.status_code == 200
+    assert settings.SESSION_COOKIE_NAME in listing.headers.get("set-cookie", "")
+    assert "set-cookie" not in client.get("/me").headers
+
+    session_activity.run_once()
+    export = client.get("/submissions/mine", params={"format": "csv"})
+    assert settings.SESSION_COOKIE_NAME in export.headers.get("set-cookie", "")
+
+
+def test_sliding_expiry_requires_a_flush_interval():
+    with pytest.raises(ValidationError, match="SESSION_FLUSH_INTERVAL_SECONDS"):
+        Settings(SESSION_SLIDING=True, SESSION_FLUSH_INTERVAL_SECONDS=0)
+    Settings(SESSION_SLIDING=False, SESSION_FLUSH_INTERVAL_SECONDS=0)
+
+
+def test_final_flush_runs_off_the_event_loop(monkeypatch):
+    with pytest.raises(TypeError):
+        PeriodicTask(1)  # run_once is abstract
+    activity = SessionActivity(interval_seconds=0)
+    threads = []
+    monkeypatch.setattr(activity, "run_once", lambda: threads.append(threading.current_thread()))
+
+    async def _stop():
+        await activity.stop()
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(_stop())
+    assert threads and threads[0] is not loop_thread
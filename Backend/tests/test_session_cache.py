@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from Backend.core.session_cache import CachedUser, SessionCache, session_cache
+from Backend.main import app
+from Backend.models import UserRole
+
+
+def _snapshot(user_id: int) -> CachedUser:
+    return CachedUser(
+        id=user_id,
+        email=f"u{user_id}@example.com",
+        role=UserRole.student,
+        email_verified=True,
+        totp_enabled=False,
+        session_expires_at=datetime.utcnow() + timedelta(hours=1),
+    )
+
+
+def test_lru_eviction_and_user_invalidation():
+    cache = SessionCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", _snapshot(1))
+    cache.put("b", _snapshot(1))
+    cache.put("c", _snapshot(2))
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    cache.invalidate_user(1)
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2 and stats["misses"] == 2
+
+
+def test_ttl_expiry():
+    cache = SessionCache(max_entries=10, ttl_seconds=0)
+    cache.put("a", _snapshot(1))
+    assert cache.get("a") is None
+
+
+def test_require_user_served_from_cache(client, make_user, login):
+    make_user("cache-admin@example.com", UserRole.admin)
+    user = make_user("cache-student@example.com")
+    login(client, user.email)
+    hits = session_cache.hits
+    assert client.get("/me").json()["role"] == "student"
+    assert client.get("/me").json()["email"] == user.email
+    assert session_cache.hits == hits + 1
+
+    admin = TestClient(app)
+    login(admin, "cache-admin@example.com")
+    res = admin.post(f"/admin/users/{user.id}/role", params={"role": "instructor"})
+    assert res.status_code == 200
+    assert client.get("/me").json()["role"] == "instructor"
+
+    client.post("/auth/logout")
+    assert client.get("/me").status_code == 401
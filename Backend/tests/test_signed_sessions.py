@@ -0,0 +1,86 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from Backend.core.config import Settings, settings
+from Backend.core.signed_sessions import RevocationStore, decode_token, issue_token, revocations
+from Backend.database import SessionLocal
+from Backend.models import UserRole
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_token_roundtrip_and_tampering():
+    token = issue_token(7, UserRole.instructor)
+    claims = decode_token(token)
+    assert claims.user_id == 7 and claims.role == UserRole.instructor
+    payload, _, signature = token.partition(".")
+    assert decode_token(payload + "x." + signature) is None
+    assert decode_token("garbage") is None
+
+
+def test_revocation():
+    # User ids far above any fixture user, so no real session is revoked.
+    with SessionLocal() as db:
+        claims = decode_token(issue_token(900008, UserRole.student))
+        assert not revocations.is_revoked(db, claims)
+        revocations.revoke_token(db, claims.sid, claims.expires_at)
+        assert revocations.is_revoked(db, claims)
+        other = decode_token(issue_token(900009, UserRole.student))
+        revocations.revoke_user(db, 900009)
+        assert revocations.is_revoked(db, other)
+
+
+def test_revocation_reaches_other_processes(monkeypatch):
+    token = issue_token(900010, UserRole.student)
+    user_token = issue_token(900011, UserRole.student)
+    claims, user_claims = decode_token(token), decode_token(user_token)
+    with SessionLocal() as db:
+        assert not revocations.is_revoked(db, claims)
+        assert not revocations.is_revoked(db, user_claims)
+
+    # Another worker logs the first token out and revokes the second user.
+    script = (
+        "from Backend.core.signed_sessions import decode_token, revocations\n"
+        "from Backend.database import SessionLocal\n"
+        "claims = decode_token(%r)\n"
+        "with SessionLocal() as db:\n"
+        "    revocations.revoke_token(db, claims.sid, claims.expires_at)\n"
+        "    revocations.revoke_user(db, 900011)\n"
+    ) % token
+    subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT, check=True)
+
+    with SessionLocal() as db:
+        # Until the cached "not revoked" answer ages out ...
+        assert not revocations.is_revoked(db, claims)
+        monkeypatch.setattr(revocations, "ttl_seconds", 0)
+        assert revocations.is_revoked(db, claims)
+        assert revocations.is_revoked(db, user_claims)
+        # ... and a restarted worker starts from the shared table.
+        restarted = RevocationStore(ttl_seconds=60, max_entries=100)
+        assert restarted.is_revoked(db, claims) and restarted.is_revoked(db, user_claims)
+
+
+def test_signed_mode_requires_a_real_secret_key():
+    for weak in ("change-me", "x" * 31):
+        with pytest.raises(ValidationError, match="SECRET_KEY"):
+            Settings(SESSION_MODE="signed", SECRET_KEY=weak)
+    Settings(SESSION_MODE="signed", SECRET_KEY="k" * 32)
+    Settings(SESSION_MODE="db", SECRET_KEY="change-me")
+
+
+def test_signed_mode_login_and_logout(client, make_user, login, monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_MODE", "signed")
+    user = make_user("signed@example.com")
+    login(client, user.email)
+    token = client.cookies.get(settings.SESSION_COOKIE_NAME)
+    assert decode_token(token)
+    res = client.get("/me")
+    assert res.status_code == 200 and res.json()["email"] == user.email
+    client.post("/auth/logout")
+    client.cookies.set(settings.SESSION_COOKIE_NAME, token)
+    res = client.get("/me")
+    assert res.status_code == 401 and res.json()["detail"] == "Session expired"
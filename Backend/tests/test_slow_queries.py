@@ -0,0 +1,34 @@
+import json
+from pathlib import Path
+
+from Backend.core.slow_queries import parameter_shape, slow_query_log
+from Backend.models import UserRole
+
+
+def test_parameter_shape_hides_values():
+    assert parameter_shape(("secret", 3)) == ["str", "int"]
+    assert parameter_shape({"email": "a@b.c"}) == {"email": "str"}
+    assert parameter_shape([(1,), (2,)], executemany=True) == {"rows": 2, "row": ["int"]}
+
+
+def test_slow_queries_logged_with_plan_and_listed(client, make_user, login, monkeypatch):
+    make_user("slow-admin@example.com", UserRole.admin)
+    login(client, "slow-admin@example.com")
+    slow_query_log.clear()
+    monkeypatch.setattr(slow_query_log, "threshold_seconds", 1e-9)
+
+    assert client.get("/admin/users").status_code == 200
+    monkeypatch.setattr(slow_query_log, "threshold_seconds", 0.0)
+
+    lines = Path(slow_query_log.path).read_text().splitlines()
+    entry = json.loads(lines[-1])
+    assert entry["route"] == "/admin/users"
+    assert "FROM users" in entry["statement"]
+    assert entry["plan"] and "slow-admin" not in lines[-1]
+
+    res = client.get("/admin/slow-queries", params={"limit": 5})
+    assert res.status_code == 200
+    offenders = res.json()["offenders"]
+    users_query = next(o for o in offenders if "FROM users ORDER BY" in o["statement"])
+    assert users_query["count"] == 1 and users_query["last_route"] == "/admin/users"
+    assert any("SCAN" in step or "SEARCH" in step for step in users_query["plan"])
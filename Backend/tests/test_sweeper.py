@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+from Backend.core.config import settings
+from Backend.core.session_cache import session_cache
+from Backend.core.sweeper import ExpirySweeper
+from Backend.database import SessionLocal
+from Backend.models import Session as DBSession
+from Backend.models import Token
+
+
+def test_sweep_deletes_only_expired_rows_in_batches(make_user):
+    user = make_user("sweep@example.com")
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        for i in range(5):
+            db.add(DBSession(id=f"old-{i}", user_id=user.id, created_at=now, expires_at=now - timedelta(minutes=1)))
+            db.add(Token(user_id=user.id, token_hash=f"old-{i}", purpose="verify", expires_at=now - timedelta(minutes=1)))
+        db.add(DBSession(id="live", user_id=user.id, created_at=now, expires_at=now + timedelta(hours=1)))
+        db.commit()
+
+        counts = ExpirySweeper(interval_seconds=0, batch_size=2).run_once()
+
+        assert counts["sessions"] >= 5 and counts["tokens"] >= 5
+        assert db.query(DBSession).filter(DBSession.id.like("old-%")).count() == 0
+        assert db.query(Token).filter(Token.token_hash.like("old-%")).count() == 0
+        assert db.get(DBSession, "live") is not None
+    finally:
+        db.close()
+
+
+def test_sweep_keeps_sessions_with_unflushed_activity(client, make_user, login):
+    user = make_user("sweep-active@example.com")
+    login(client, user.email)
+    sid = client.cookies.get(settings.SESSION_COOKIE_NAME)
+    assert client.get("/me").status_code == 200
+    db = SessionLocal()
+    try:
+        past = datetime.utcnow() - timedelta(seconds=1)
+        db.query(DBSession).filter(DBSession.id == sid).update({"expires_at": past})
+        db.commit()
+        session_cache.invalidate_session(sid)
+        # Unflushed activity keeps the session alive past its stored expiry...
+        assert client.get("/me").status_code == 200
+
+        ExpirySweeper(interval_seconds=0, batch_size=10).run_once()
+
+        # ... and the sweep flushes it instead of deleting the row.
+        db.expire_all()
+        assert db.get(DBSession, sid).expires_at > datetime.utcnow()
+        session_cache.invalidate_session(sid)
+        assert client.get("/me").status_code == 200
+    finally:
+        db.close()
@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from Backend.database import SessionLocal
+from Backend.models import Token, User
+from Backend.utils.tokens import consume_token, hash_token, make_token
+
+
+def _consume(token: str):
+    db = SessionLocal()
+    try:
+        user = consume_token(db, token, "verify")
+        return user.id if user else None
+    finally:
+        db.close()
+
+
+def test_tokens_are_stored_hashed_and_single_use(make_user):
+    user = make_user("token@example.com")
+    db = SessionLocal()
+    try:
+        value = make_token(db, db.get(User, user.id), "verify", minutes=5)
+        row = db.query(Token).filter(Token.user_id == user.id).one()
+        assert row.token_hash == hash_token(value) and row.token_hash != value
+        assert consume_token(db, value, "reset") is None
+    finally:
+        db.close()
+    assert _consume(value) == user.id
+    assert _consume(value) is None
+
+
+def test_concurrent_clicks_consume_once(make_user):
+    user = make_user("token-race@example.com")
+    db = SessionLocal()
+    try:
+        value = make_token(db, db.get(User, user.id), "verify", minutes=5)
+    finally:
+        db.close()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(_consume, [value] * 8))
+    assert results.count(user.id) == 1
@@ -0,0 +1,33 @@
+"""Recompute the assignment_stats table from the submissions table.
+
+Usage (from repo root):
+    python -m Backend.tools.rebuild_assignment_stats             # every assignment
+    python -m Backend.tools.rebuild_assignment_stats --assignment 12 --assignment 15
+
+The rows are normally kept current by the submission and grading endpoints;
+run this after editing submissions by hand or restoring a backup. The
+rebuild is one transaction, so readers see either the old or the new rows.
+"""
+
+import argparse
+
+from ..database import SessionLocal
+from ..utils.assignment_stats import rebuild_assignment_stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--assignment", type=int, action="append", dest="assignments",
+        help="only this assignment id (repeatable)",
+    )
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        rows = rebuild_assignment_stats(db, args.assignments)
+        db.commit()
+    print(f"Rebuilt stats for {rows} assignment(s).")
+
+
+if __name__ == "__main__":
+    main()
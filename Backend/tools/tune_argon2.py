@@ -0,0 +1,117 @@
+"""Benchmark argon2 on this host and recommend CryptContext parameters.
+
+Usage (from repo root):
+    python -m Backend.tools.tune_argon2 --target-ms 250 --max-memory-mib 64
+    python -m Backend.tools.tune_argon2 --env-file .env   # also write ARGON2_* keys
+
+For each memory cost (halving from --max-memory-mib) the time cost is raised
+until a single hash takes about --target-ms; the first memory cost that fits
+the budget with time_cost >= 1 wins. Memory per concurrent hash equals the
+memory cost, so peak hashing memory is roughly memory_cost * PASSWORD_HASH_WORKERS.
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from passlib.hash import argon2
+
+from ..core.config import settings
+
+SAMPLE_PASSWORD = "Benchmark-Passw0rd!"
+MIN_MEMORY_MIB = 8
+MAX_TIME_COST = 16
+
+
+def measure_ms(time_cost: int, memory_kib: int, parallelism: int, rounds: int) -> float:
+    handler = argon2.using(
+        time_cost=time_cost, memory_cost=memory_kib, parallelism=parallelism
+    )
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        handler.hash(SAMPLE_PASSWORD)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def recommend(target_ms: float, max_memory_mib: int, parallelism: int, rounds: int) -> dict:
+    memory_mib = max_memory_mib
+    while True:
+        memory_kib = memory_mib * 1024
+        best = None
+        for time_cost in range(1, MAX_TIME_COST + 1):
+            elapsed = measure_ms(time_cost, memory_kib, parallelism, rounds)
+            print(
+                f"  memory={memory_mib:>4} MiB  time_cost={time_cost:>2}  "
+                f"parallelism={parallelism}  -> {elapsed:7.1f} ms"
+            )
+            if elapsed > target_ms:
+                break
+            best = {
+                "time_cost": time_cost,
+                "memory_cost": memory_kib,
+                "parallelism": parallelism,
+                "hash_ms": round(elapsed, 1),
+            }
+        if best or memory_mib // 2 < MIN_MEMORY_MIB:
+            return best or {
+                "time_cost": 1,
+                "memory_cost": memory_kib,
+                "parallelism": parallelism,
+                "hash_ms": round(elapsed, 1),
+            }
+        memory_mib //= 2
+
+
+def write_env(path: Path, values: dict[str, int]) -> None:
+    lines = path.read_text().splitlines() if path.exists() else []
+    remaining = dict(values)
+    for i, line in enumerate(lines):
+        key = line.split("=", 1)[0].strip()
+        if key in remaining:
+            lines[i] = f"{key}={remaining.pop(key)}"
+    lines.extend(f"{key}={value}" for key, value in remaining.items())
+    path.write_text("\n".join(lines) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--max-memory-mib", type=int, default=64)
+    parser.add_argument("--parallelism", type=int, default=1)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--env-file", type=Path, default=None)
+    args = parser.parse_args()
+
+    current = argon2.using()
+    print(
+        "Current defaults: "
+        f"time_cost={settings.ARGON2_TIME_COST or current.default_rounds} "
+        f"memory_cost={settings.ARGON2_MEMORY_COST or current.memory_cost} KiB "
+        f"parallelism={settings.ARGON2_PARALLELISM or current.parallelism}"
+    )
+    print(f"Tuning for ~{args.target_ms:.0f} ms per hash:")
+    best = recommend(args.target_ms, args.max_memory_mib, args.parallelism, args.rounds)
+    workers = max(settings.PASSWORD_HASH_WORKERS, 1)
+    values = {
+        "ARGON2_TIME_COST": best["time_cost"],
+        "ARGON2_MEMORY_COST": best["memory_cost"],
+        "ARGON2_PARALLELISM": best["parallelism"],
+    }
+    print()
+    print(f"Recommended ({best['hash_ms']} ms per hash):")
+    for key, value in values.items():
+        print(f"{key}={value}")
+    print(
+        f"Peak hashing memory with {workers} worker(s): "
+        f"~{best['memory_cost'] * workers // 1024} MiB"
+    )
+    if args.env_file:
+        write_env(args.env_file, values)
+        print(f"Wrote {args.env_file}; existing hashes are upgraded on next login.")
+
+
+if __name__ == "__main__":
+    main()
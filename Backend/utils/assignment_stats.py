@@ -0,0 +1,183 @@
+from sqlalchemy import case, delete, distinct, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..models import Assignment, AssignmentStats, Submission
+
+# Grade statistics follow the gradebook: only each student's latest attempt
+# (newest submitted_at, then id) counts, so a resubmission replaces the
+# grade of the attempt it supersedes. submission_count counts every attempt.
+LATEST_FIRST = (Submission.submitted_at.desc(), Submission.id.desc())
+
+STATS_COLUMNS = (
+    "assignment_id",
+    "submission_count",
+    "submitter_count",
+    "graded_count",
+    "grade_sum",
+    "min_grade",
+    "max_grade",
+    "last_submitted_at",
+)
+
+
+def _aggregate(assignment_ids: list[int] | None):
+    ranked = select(
+        Submission.id,
+        Submission.assignment_id,
+        Submission.user_id,
+        Submission.grade,
+        Submission.submitted_at,
+        func.row_number()
+        .over(partition_by=(Submission.assignment_id, Submission.user_id), order_by=LATEST_FIRST)
+        .label("rank"),
+    )
+    if assignment_ids is not None:
+        ranked = ranked.where(Submission.assignment_id.in_(assignment_ids))
+    ranked = ranked.subquery()
+    latest_grade = case((ranked.c.rank == 1, ranked.c.grade))
+    query = (
+        select(
+            Assignment.id,
+            func.count(ranked.c.id),
+            func.count(distinct(ranked.c.user_id)),
+            func.count(latest_grade),
+            func.coalesce(func.sum(latest_grade), 0),
+            func.min(latest_grade),
+            func.max(latest_grade),
+            func.max(ranked.c.submitted_at),
+        )
+        .select_from(Assignment)
+        .outerjoin(ranked, ranked.c.assignment_id == Assignment.id)
+        .group_by(Assignment.id)
+    )
+    if assignment_ids is not None:
+        query = query.where(Assignment.id.in_(assignment_ids))
+    return query
+
+
+def _latest_grade_bounds(assignment_id: int):
+    ranked = (
+        select(
+            Submission.grade,
+            func.row_number()
+            .over(partition_by=Submission.user_id, order_by=LATEST_FIRST)
+            .label("rank"),
+        )
+        .where(Submission.assignment_id == assignment_id)
+        .subquery()
+    )
+    latest = select(ranked.c.grade).where(ranked.c.rank == 1)
+    return (
+        latest.with_only_columns(func.min(ranked.c.grade)).scalar_subquery(),
+        latest.with_only_columns(func.max(ranked.c.grade)).scalar_subquery(),
+    )
+
+
+def rebuild_assignment_stats(db: Session, assignment_ids: list[int] | None = None) -> int:
+    """Recompute stats rows from the submissions table; all assignments by default.
+
+    Runs in the caller's transaction and returns the number of rows written.
+    """
+    stale = delete(AssignmentStats)
+    if assignment_ids is not None:
+        stale = stale.where(AssignmentStats.assignment_id.in_(assignment_ids))
+    db.execute(stale)
+    result = db.execute(
+        insert(AssignmentStats).from_select(STATS_COLUMNS, _aggregate(assignment_ids))
+    )
+    return result.rowcount
+
+
+def _apply(db: Session, assignment_id: int, values: dict) -> None:
+    result = db.execute(
+        update(AssignmentStats)
+        .where(AssignmentStats.assignment_id == assignment_id)
+        .values(values)
+    )
+    if result.rowcount == 0:
+        # No row yet (assignment predates the table or has never been
+        # counted): build it from the submissions, including the new one.
+        rebuild_assignment_stats(db, [assignment_id])
+
+
+def _grade_values(assignment_id: int, old: float | None, new: float | None) -> dict:
+    """SET clauses replacing one student's counted grade ``old`` with ``new``."""
+    stats = AssignmentStats
+    if old is None and new is None:
+        return {}
+    values = {
+        stats.graded_count: stats.graded_count + (new is not None) - (old is not None),
+        stats.grade_sum: stats.grade_sum + (new or 0) - (old or 0),
+    }
+    if old is None:
+        # Pure addition: the bounds can only widen.
+        values[stats.min_grade] = case(
+            (or_(stats.min_grade.is_(None), stats.min_grade > new), new),
+            else_=stats.min_grade,
+        )
+        values[stats.max_grade] = case(
+            (or_(stats.max_grade.is_(None), stats.max_grade < new), new),
+            else_=stats.max_grade,
+        )
+    else:
+        # A grade left the set, which may have held the minimum or maximum;
+        # running totals cannot tell, so re-read both from latest attempts.
+        values[stats.min_grade], values[stats.max_grade] = _latest_grade_bounds(assignment_id)
+    return values
+
+
+def _latest_attempts(db: Session, submission: Submission):
+    return db.execute(
+        select(Submission.id, Submission.grade)
+        .where(
+            Submission.assignment_id == submission.assignment_id,
+            Submission.user_id == submission.user_id,
+        )
+        .order_by(*LATEST_FIRST)
+        .limit(2)
+    ).all()
+
+
+def record_submission(db: Session, submission: Submission) -> None:
+    """Count a new, flushed submission in its assignment's stats row.
+
+    If it supersedes the student's previous latest attempt, that attempt's
+    grade leaves the grade statistics. Increments happen in SQL, so
+    concurrent submissions do not lose updates.
+    """
+    latest = _latest_attempts(db, submission)
+    earlier = [row for row in latest if row.id != submission.id]
+    values = {}
+    if latest[0].id == submission.id:
+        previous = earlier[0].grade if earlier else None
+        values = _grade_values(submission.assignment_id, previous, submission.grade)
+    stats = AssignmentStats
+    values[stats.submission_count] = stats.submission_count + 1
+    values[stats.submitter_count] = stats.submitter_count + (0 if earlier else 1)
+    values[stats.last_submitted_at] = case(
+        (
+            or_(
+                stats.last_submitted_at.is_(None),
+                stats.last_submitted_at < submission.submitted_at,
+            ),
+            submission.submitted_at,
+        ),
+        else_=stats.last_submitted_at,
+    )
+    _apply(db, submission.assignment_id, values)
+
+
+def record_grade(db: Session, submission: Submission, previous: float | None) -> None:
+    """Fold a flushed grade change (``previous`` -> ``submission.grade``) into the stats row.
+
+    Regrading a superseded attempt changes nothing: only latest attempts count.
+    """
+    if submission.grade == previous:
+        return
+    if _latest_attempts(db, submission)[0].id != submission.id:
+        return
+    _apply(
+        db,
+        submission.assignment_id,
+        _grade_values(submission.assignment_id, previous, submission.grade),
+    )
@@ -1,17 +1,24 @@
+import hashlib
 import secrets
 from datetime import datetime, timedelta
 
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
 from ..models import Token, User
 
 
+def hash_token(value: str) -> str:
+    # Only the digest is stored, so a leaked tokens table cannot be replayed.
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
 def make_token(db: Session, user: User, purpose: str, minutes: int) -> str:
     value = secrets.token_urlsafe(32)
     db.add(
         Token(
             user_id=user.id,
-            token=value,
+            token_hash=hash_token(value),
             purpose=purpose,
             expires_at=datetime.utcnow() + timedelta(minutes=minutes),
         )
@@ -21,15 +28,26 @@ def make_token(db: Session, user: User, purpose: str, minutes: int) -> str:
 
 
 def consume_token(db: Session, token: str, purpose: str) -> User | None:
-    row = (
-        db.query(Token)
-        .filter(Token.token == token, Token.purpose == purpose)
-        .first()
+    """Atomically delete a live token and return its user.
+
+    The DELETE ... RETURNING is the only statement that can claim a token, so
+    a link clicked twice concurrently succeeds exactly once.
+    """
+    live = (
+        Token.purpose == purpose,
+        Token.token_hash == hash_token(token),
+        Token.expires_at >= datetime.utcnow(),
     )
-    if not row or row.expires_at < datetime.utcnow():
-        return None
-    user = db.query(User).filter(User.id == row.user_id).first()
-    db.delete(row)
+    if db.get_bind().dialect.delete_returning:
+        user_id = db.execute(
+            delete(Token).where(*live).returning(Token.user_id)
+        ).scalar_one_or_none()
+    else:
+        row = db.execute(select(Token.id, Token.user_id).where(*live)).first()
+        user_id = None
+        if row and db.execute(delete(Token).where(Token.id == row.id)).rowcount == 1:
+            user_id = row.user_id
     db.commit()
-    return user
-
+    if user_id is None:
+        return None
+    return db.get(User, user_id)
@@ -6,6 +6,8 @@ const envBase = import.meta.env.VITE_API_BASE_URL_AUTH?.trim();
 export const AUTH_BASE_URL: string = envBase || "";
 const CSRF_COOKIE_NAME = "csrf_token";
 const SAFE_METHODS = new Set(["GET", "HEAD", "OPTIONS"]);
+// Rows per request for paged list endpoints (backend PAGE_SIZE_DEFAULT)
+const LIST_PAGE_SIZE = 100;
 
 function buildUrl(path: string): string {
   if (!AUTH_BASE_URL) return path;
@@ -81,9 +83,11 @@ type RequestOptions = Omit<RequestInit, "body" | "headers"> & {
   headers?: HeadersInit;
   json?: unknown;
   skipCsrf?: boolean;
+  onResponse?: (res: Response) => void;
 };
 
-async function request<T>(path: string, init: RequestOptions = {}): Promise<T> {
+async function request<T>(path: string, options: RequestOptions = {}): Promise<T> {
+  const { onResponse, ...init } = options;
   const method = (init.method ?? "GET").toUpperCase();
   const headers = new Headers(init.headers ?? {});
 
@@ -131,9 +135,30 @@ async function request<T>(path: string, init: RequestOptions = {}): Promise<T> {
     throw new ApiError(res.status, data ?? text ?? res.statusText);
   }
 
+  onResponse?.(res);
   return (data as T) ?? (undefined as T);
 }
 
+// List endpoints page only when asked: send `limit` on every request and
+// follow X-Next-Cursor until the last page.
+async function requestAllPages<T>(path: string): Promise<T[]> {
+  const items: T[] = [];
+  const page: { cursor: string | null } = { cursor: null };
+  do {
+    const sep = path.includes("?") ? "&" : "?";
+    const cursor = page.cursor ? `&cursor=${encodeURIComponent(page.cursor)}` : "";
+    const url = `${path}${sep}limit=${LIST_PAGE_SIZE}${cursor}`;
+    const batch = await request<T[]>(url, {
+      method: "GET",
+      onResponse: (res) => {
+        page.cursor = res.headers.get("X-Next-Cursor");
+      },
+    });
+    items.push(...batch);
+  } while (page.cursor);
+  return items;
+}
+
 const csrfCache: { value: string | null; fetchedAt: number | null } = {
   value: null,
   fetchedAt: null,
@@ -261,6 +286,34 @@ export type Submission = {
   submitted_at: string;
 };
 
+export type AssignmentStats = {
+  assignment_id: number;
+  submission_count: number;
+  submitter_count: number;
+  graded_count: number;
+  mean_grade: number | null;
+  min_grade: number | null;
+  max_grade: number | null;
+  last_submitted_at: string | null;
+};
+
+export type Gradebook = {
+  classroom_id: number;
+  students: { id: number; email: string }[];
+  assignments: { id: number; title: string; due_date?: string | null }[];
+  // grades[i][j] / submission_ids[i][j]: students[i]'s latest submission for assignments[j]
+  grades: (number | null)[][];
+  submission_ids: (number | null)[][];
+  stats: {
+    assignment_id: number;
+    submitted: number;
+    graded: number;
+    mean: number | null;
+    min: number | null;
+    max: number | null;
+  }[];
+};
+
 export type InstructorRequest = {
   id: number;
   user_id: number;
@@ -358,7 +411,7 @@ type AssignmentCreatePayload = {
 };
 
 export async function listAssignments(classroomId: number | string): Promise<Assignment[]> {
-  return request(`/assignments/classroom/${classroomId}`, { method: "GET" });
+  return requestAllPages(`/assignments/classroom/${classroomId}`);
 }
 
 export async function getAssignment(assignmentId: number | string): Promise<Assignment> {
@@ -413,17 +466,25 @@ export async function uploadAssignmentFile(
 export async function listSubmissionsForAssignment(
   assignmentId: number,
 ): Promise<Submission[]> {
-  return request(`/submissions/assignment/${assignmentId}`, { method: "GET" });
+  return requestAllPages(`/submissions/assignment/${assignmentId}`);
 }
 
 export async function listSubmissionsForClassroom(
   classroomId: number | string,
 ): Promise<Submission[]> {
-  return request(`/submissions/classroom/${classroomId}`, { method: "GET" });
+  return requestAllPages(`/submissions/classroom/${classroomId}`);
+}
+
+export async function getAssignmentStats(assignmentId: number | string): Promise<AssignmentStats> {
+  return request(`/assignments/${assignmentId}/stats`, { method: "GET" });
+}
+
+export async function getGradebook(classroomId: number | string): Promise<Gradebook> {
+  return request(`/classrooms/${classroomId}/gradebook`, { method: "GET" });
 }
 
 export async function listMaterials(classroomId: number | string): Promise<Material[]> {
-  return request(`/materials/classroom/${classroomId}`, { method: "GET" });
+  return requestAllPages(`/materials/classroom/${classroomId}`);
 }
 
 export async function createMaterial(payload: {
@@ -471,7 +532,7 @@ export async function listInstructorRequests(
   status?: "pending" | "approved" | "rejected",
 ): Promise<InstructorRequest[]> {
   const qs = status ? `?status=${encodeURIComponent(status)}` : "";
-  return request(`/admin/roles/requests${qs}`, { method: "GET" });
+  return requestAllPages(`/admin/roles/requests${qs}`);
 }
 
 export async function decideInstructorRequest(id: number, action: "approve" | "reject"): Promise<BasicOk> {
@@ -522,6 +583,8 @@ export const api = {
   uploadAssignmentFile,
   listSubmissionsForAssignment,
   listSubmissionsForClassroom,
+  getAssignmentStats,
+  getGradebook,
   listMaterials,
   createMaterial,
   uploadMaterialFile,